@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""
+Çözücü Mikro-Benchmark'ı
+========================
+Eski yol (msg.to_dict() + if/elif zinciri + sözlük durum) ile tablo
+tabanlı çözücünün (telemetry_decoder.decode_into) saniyedeki mesaj
+sayısını karşılaştırır. Bağımlılık gerektirmez.
+
+Kullanım:
+    python benchmarks/bench_decoder.py [mesaj_sayısı]
+"""
+
+import math
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from telemetry_state import TelemetryState
+from telemetry_decoder import decode_into
+
+
+class _FakeMsg:
+    """
+    pymavlink mesajının bu benchmark için gereken kısmı. to_dict(),
+    pymavlink'teki gibi her alan için format_attr() çağırır.
+    """
+    def __init__(self, mtype, **fields):
+        self._type = mtype
+        self._fieldnames = list(fields)
+        self.__dict__.update(fields)
+
+    def get_type(self):
+        return self._type
+
+    def format_attr(self, field):
+        v = getattr(self, field)
+        if isinstance(v, bytes):
+            v = v.decode("utf-8", "replace")
+        if isinstance(v, str):
+            v = v.rstrip("\x00")
+        return v
+
+    def to_dict(self):
+        d = dict({"mavpackettype": self._type})
+        for a in self._fieldnames:
+            d[a] = self.format_attr(a)
+        return d
+
+
+def _sample_stream():
+    return [
+        _FakeMsg("ATTITUDE", time_boot_ms=1000, roll=0.05, pitch=-0.02, yaw=1.57, rollspeed=0.0, pitchspeed=0.0, yawspeed=0.0),
+        _FakeMsg("GLOBAL_POSITION_INT", time_boot_ms=1000, lat=399207700, lon=328541100, alt=950000,
+                 relative_alt=100000, vx=1200, vy=-300, vz=0, hdg=9000),
+        _FakeMsg("ATTITUDE", time_boot_ms=1020, roll=0.06, pitch=-0.01, yaw=1.58, rollspeed=0.0, pitchspeed=0.0, yawspeed=0.0),
+        _FakeMsg("VFR_HUD", airspeed=12.0, groundspeed=12.4, heading=90, throttle=55, alt=100.0, climb=0.1),
+        _FakeMsg("SYS_STATUS", battery_remaining=87, voltage_battery=12400, current_battery=1200),
+        _FakeMsg("HEARTBEAT", type=1, autopilot=3, base_mode=217, custom_mode=10, system_status=4),
+        _FakeMsg("GPS_RAW_INT", time_usec=1700000000000000, fix_type=3, lat=399207700, lon=328541100,
+                 alt=950000, vel=1240, cog=9000, satellites_visible=12),
+        _FakeMsg("SYSTEM_TIME", time_unix_usec=1700000000000000, time_boot_ms=1000),
+    ]
+
+
+def _legacy_update(state, msg_dict):
+    """Baz çizgi: main.py'deki eski _on_msg if/elif zinciri."""
+    t = msg_dict.get("_type")
+    if t == "GLOBAL_POSITION_INT":
+        if msg_dict.get("lat") is not None: state["lat"] = float(msg_dict.get("lat")) / 1e7
+        if msg_dict.get("lon") is not None: state["lon"] = float(msg_dict.get("lon")) / 1e7
+        if msg_dict.get("relative_alt") is not None: state["alt"] = float(msg_dict.get("relative_alt")) / 1000.0
+        vx = msg_dict.get("vx"); vy = msg_dict.get("vy")
+        if vx is not None and vy is not None: state["speed"] = max(0.0, math.sqrt(float(vx)**2 + float(vy)**2) / 100.0)
+    elif t == "ATTITUDE":
+        if msg_dict.get("roll") is not None: state["roll"] = math.degrees(float(msg_dict.get("roll")))
+        if msg_dict.get("pitch") is not None: state["pitch"] = math.degrees(float(msg_dict.get("pitch")))
+        if msg_dict.get("yaw") is not None: state["yaw"] = (math.degrees(float(msg_dict.get("yaw"))) + 360.0) % 360.0
+    elif t == "SYS_STATUS":
+        if msg_dict.get("battery_remaining") is not None: state["battery"] = int(msg_dict.get("battery_remaining"))
+    elif t == "HEARTBEAT":
+        if msg_dict.get("base_mode") is not None: state["autonomous"] = 1 if (int(msg_dict.get("base_mode")) & (1 << 4)) else 0
+    elif t == "SYSTEM_TIME":
+        if msg_dict.get("time_unix_usec") is not None: state["gps_time_ms"] = int(int(msg_dict.get("time_unix_usec")) / 1000)
+    elif t == "GPS_RAW_INT":
+        if msg_dict.get("time_usec") is not None: state["gps_time_ms"] = int(int(msg_dict.get("time_usec")) / 1000)
+        if msg_dict.get("vel") is not None: state["speed"] = max(0.0, float(msg_dict.get("vel")) / 100.0)
+        if msg_dict.get("cog") is not None: state["yaw"] = (float(msg_dict.get("cog")) / 100.0) % 360.0
+    elif t == "VFR_HUD":
+        if msg_dict.get("groundspeed") is not None: state["speed"] = max(0.0, float(msg_dict.get("groundspeed")))
+        if msg_dict.get("alt") is not None: state["alt"] = float(msg_dict.get("alt"))
+        if msg_dict.get("heading") is not None: state["yaw"] = float(msg_dict.get("heading")) % 360.0
+
+
+def bench_legacy(msgs, n):
+    state = {}
+    start = time.perf_counter()
+    for i in range(n):
+        msg = msgs[i % len(msgs)]
+        d = msg.to_dict()
+        d["_type"] = msg.get_type()
+        _legacy_update(state, d)
+    return n / (time.perf_counter() - start)
+
+
+def bench_table(msgs, n):
+    state = TelemetryState()
+    start = time.perf_counter()
+    for i in range(n):
+        decode_into(msgs[i % len(msgs)], state)
+    return n / (time.perf_counter() - start)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    msgs = _sample_stream()
+    legacy = bench_legacy(msgs, n)
+    table = bench_table(msgs, n)
+    print(f"Mesaj sayısı       : {n}")
+    print(f"Eski (dict+if/elif): {legacy:,.0f} msg/s")
+    print(f"Tablo çözücü       : {table:,.0f} msg/s")
+    print(f"Hızlanma           : {table / legacy:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
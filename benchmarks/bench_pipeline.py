@@ -0,0 +1,246 @@
+# -*- coding: utf-8 -*-
+"""
+Uçtan Uca İşlem Hattı Benchmark'ı
+=================================
+mavlink_loadgen'i ayrı bir süreçte çalıştırır ve main.py'nin işlem hattını
+(hub → çözücü/durum → GUI → WS) bu yük altında ölçer:
+
+- sürdürülen mesaj/sn (ve gönderilen/alınan farkı)
+- paketin alınmasından itibaren p50/p99 gecikme:
+    * _TELEM_STATE güncellemesi
+    * GUI: mesajın RenderScheduler karesinde ekrana çizilmesi (aradaki
+      mesajlar birleştirilse de her mesaj kendisini gösteren çizime kadar
+      sayılır); gizli sekmelerdeki widget'lar ertelendiği için harita
+      sekmesi açık tutulur. Ayrıca yalnızca handle_backend_message dağıtımı
+      (latency_gui_dispatch)
+    * WS gönderimi (yerel bir istemci bağlıyken; alış zamanı yayıncıya
+      verilir, istemci başına gecikme alış → gönderim olarak ölçülür)
+- CPU kullanımı (bu süreç; yük üreteci ayrı raporlanır)
+
+Başsız çalışır (QT_QPA_PLATFORM=offscreen varsayılan), CI sınıfı Linux
+makinelerinde kullanılabilir.
+
+Kullanım:
+    python benchmarks/bench_pipeline.py --duration 10
+    python benchmarks/bench_pipeline.py --scale 4 --no-gui --json sonuc.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import resource
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+# Benchmark sırasında uçuş kaydı gerekmez
+os.environ.setdefault("IHA_RECORD", "0")
+
+
+def percentile(values, p: float):
+    """Sıralı olmayan listeden yüzdelik (en yakın sıra yöntemi)."""
+    if not values:
+        return None
+    s = sorted(values)
+    k = max(0, min(len(s) - 1, int(round(p / 100.0 * len(s) + 0.5)) - 1))
+    return s[k]
+
+
+def _summary(values):
+    ms = [v * 1000.0 for v in values]
+    return {
+        "count": len(ms),
+        "p50_ms": round(percentile(ms, 50), 3) if ms else None,
+        "p99_ms": round(percentile(ms, 99), 3) if ms else None,
+        "max_ms": round(max(ms), 3) if ms else None,
+    }
+
+
+def _ws_summary(ws_stats):
+    """Yayıncının istemci gecikme histogramından alış → gönderim özeti (ilk istemci)."""
+    if not ws_stats["per_client"]:
+        return {"count": 0, "p50_ms": None, "p99_ms": None, "max_ms": None}
+    c = ws_stats["per_client"][0]
+    return {"count": c["sent"], "p50_ms": c["lag_p50_ms"], "p99_ms": c["lag_p99_ms"], "max_ms": c["lag_max_ms"]}
+
+
+async def _run(args, window_factory=None):
+    import main as app
+    from mavlink_filter import IngestFilter
+    from telemetry_decoder import DECODERS
+
+    loop = asyncio.get_running_loop()
+    hub = app.mavlink_hub
+    window = window_factory(loop) if window_factory else None
+    lat = {"state": [], "gui": [], "gui_dispatch": []}
+    ctx = {"arrival": None}
+    ws_frames = {"count": 0}
+
+    # 1) Ön sonda: hub dağıtımı süresince mesajın alış zamanını tutar (tipli
+    #    aboneler, ör. MavlinkPositionFeed, wildcard'lardan önce çağrılır)
+    dispatch = hub.dispatch
+
+    def probed_dispatch(msg):
+        ctx["arrival"] = getattr(msg, "_timestamp", None) or time.time()
+        try:
+            dispatch(msg)
+        finally:
+            ctx["arrival"] = None
+    hub.dispatch = probed_dispatch
+
+    # 2) GUI çizim sondası: dağıtım sırasında işaretlenen her mesajın alış
+    #    zamanı, anahtarı _tick içinde çizilene kadar bekletilir
+    if window is not None:
+        pending = {}    # {anahtar: [alış zamanı, ...]}
+        mark = window.render.mark
+
+        def probed_mark(key, render, widget=None):
+            if ctx["arrival"] is not None:
+                pending.setdefault(key, []).append(ctx["arrival"])
+
+            def probed_render():
+                render()
+                now = time.time()
+                lat["gui"].extend(now - t for t in pending.pop(key, ()))
+            mark(key, probed_render, widget)
+        window.render.mark = probed_mark
+
+    # 3) GUI + WS yolu (main.py'deki message_bus abonelik sırası)
+    def on_msg(d):
+        arrival = ctx["arrival"]
+        if window is not None:
+            window.handle_backend_message(d)
+            lat["gui_dispatch"].append(time.time() - arrival)
+        app.broadcast_ws(d, arrival)
+
+    ws_client = None
+    if not args.no_ws and app.websockets is not None:
+        await app.start_ws_server("127.0.0.1", args.ws_port)
+
+        async def client():
+            async with app.websockets.connect(f"ws://127.0.0.1:{args.ws_port}/") as ws:
+                async for _ in ws:
+                    ws_frames["count"] += 1
+        ws_client = loop.create_task(client())
+        await asyncio.sleep(0.3)
+
+    listener = loop.create_task(app.mavlink_listener(
+        f"udpin:127.0.0.1:{args.port}", on_message=on_msg,
+        ingest_filter=None if args.no_filter else IngestFilter.from_env()))
+    await asyncio.sleep(0.5)
+
+    # 4) Durum sondası: aynı tip için telem_state abonesinden sonra çalışır
+    def state_probe(msg):
+        lat["state"].append(time.time() - (getattr(msg, "_timestamp", None) or time.time()))
+    hub.subscribe(state_probe, types=tuple(DECODERS), name="bench_state")
+
+    ru0 = resource.getrusage(resource.RUSAGE_SELF)
+    t0 = time.perf_counter()
+    proc = await asyncio.create_subprocess_exec(
+        sys.executable, os.path.join(ROOT, "benchmarks", "mavlink_loadgen.py"),
+        "--port", str(args.port), "--duration", str(args.duration),
+        "--rates", args.rates, "--scale", str(args.scale),
+        stdout=asyncio.subprocess.PIPE)
+    out, _ = await proc.communicate()
+    await asyncio.sleep(0.5)  # kuyrukta kalanları boşalt
+    wall = time.perf_counter() - t0
+    ru1 = resource.getrusage(resource.RUSAGE_SELF)
+    ru_child = resource.getrusage(resource.RUSAGE_CHILDREN)
+
+    sent = 0
+    for line in out.decode().splitlines():
+        if line.startswith("SENT "):
+            sent = int(line.split()[1])
+    stats = hub.stats()
+    ws_stats = app.ws_broadcaster.stats()
+    received = stats.get("received", 0)
+    cpu = (ru1.ru_utime - ru0.ru_utime) + (ru1.ru_stime - ru0.ru_stime)
+
+    listener.cancel()
+    if ws_client is not None:
+        ws_client.cancel()
+    for t in (listener, ws_client):
+        if t is not None:
+            try: await t
+            except (asyncio.CancelledError, Exception): pass
+    await app.shutdown_ws_server()
+    del hub.dispatch    # sondayı kaldır (sınıf metoduna döner)
+
+    return {
+        "duration_s": round(wall, 2),
+        "sent": sent,
+        "received": received,
+        "lost": max(0, sent - received),
+        "ring_dropped": stats.get("dropped", 0),
+        "msgs_per_s": round(received / wall, 1) if wall else 0.0,
+        "latency_state": _summary(lat["state"]),
+        "latency_gui": _summary(lat["gui"]) if window is not None else "atlandı",
+        "latency_gui_dispatch": _summary(lat["gui_dispatch"]) if window is not None else "atlandı",
+        "gui_render": window.render.stats() if window is not None else "atlandı",
+        "latency_ws": _ws_summary(ws_stats) if ws_client is not None else "atlandı",
+        "ws_dropped": sum(c["dropped"] for c in ws_stats["per_client"]),
+        "ws_frames_received": ws_frames["count"],
+        "cpu_percent": round(100.0 * cpu / wall, 1) if wall else 0.0,
+        "loadgen_cpu_s": round(ru_child.ru_utime + ru_child.ru_stime, 2),
+        "filters": stats.get("filters"),
+    }
+
+
+def _print(result: dict):
+    print("=== İşlem Hattı Benchmark ===")
+    for key in ("duration_s", "sent", "received", "lost", "ring_dropped", "msgs_per_s",
+                "cpu_percent", "loadgen_cpu_s", "ws_frames_received", "ws_dropped"):
+        print(f"{key:20}: {result[key]}")
+    for key in ("latency_state", "latency_gui", "latency_gui_dispatch", "latency_ws"):
+        v = result[key]
+        if isinstance(v, dict):
+            print(f"{key:20}: n={v['count']} p50={v['p50_ms']} ms p99={v['p99_ms']} ms max={v['max_ms']} ms")
+        else:
+            print(f"{key:20}: {v}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="MAVLink → durum → GUI → WS uçtan uca benchmark")
+    ap.add_argument("--duration", type=float, default=10.0)
+    ap.add_argument("--port", type=int, default=14570, help="Yük üretecinin göndereceği UDP portu")
+    ap.add_argument("--ws-port", type=int, default=18766)
+    ap.add_argument("--rates", default="", help="TİP=Hz,... (mavlink_loadgen ile aynı)")
+    ap.add_argument("--scale", type=float, default=1.0)
+    ap.add_argument("--no-gui", action="store_true", help="MainWindow aşamasını atla")
+    ap.add_argument("--no-ws", action="store_true", help="WS aşamasını atla")
+    ap.add_argument("--no-filter", action="store_true", help="GUI/WS alım filtresini kapat")
+    ap.add_argument("--json", help="Sonucu bu dosyaya JSON olarak yaz")
+    args = ap.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    if args.no_gui:
+        result = asyncio.run(_run(args))
+    else:
+        import qasync
+        from PyQt5.QtWidgets import QApplication
+        qt_app = QApplication.instance() or QApplication(sys.argv)
+        loop = qasync.QEventLoop(qt_app)
+        asyncio.set_event_loop(loop)
+
+        def make_window(lp):
+            from gui import MainWindow
+            window = MainWindow(lp)
+            # Gizli widget'lar çizilmez; çizim gecikmesi harita sekmesinde ölçülür
+            window.tabs.setCurrentIndex(window.tabs.indexOf(window.map_widget))
+            window.show()
+            return window
+        with loop:
+            result = loop.run_until_complete(_run(args, make_window))
+
+    _print(result)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""
+WS Kodek Benchmark'ı
+====================
+Sentetik bir uçuştan üretilen SELF_POSE ve ATTITUDE akışlarını JSON
+(ws_broadcast'in gönderdiği biçim) ve ikili/delta protokolüyle (ws_codec)
+kodlar; çerçeve başına bayt, sıkıştırma oranı, kodlama süresi ve gidiş-dönüş
+(çözücü) hatasını raporlar. Bağımlılık gerektirmez.
+
+Kullanım:
+    python benchmarks/bench_ws_codec.py [--frames 5000] [--keyframe-every 50]
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from constants import MsgType
+from ws_broadcast import WsBroadcaster
+from ws_codec import LAYOUTS, Decoder, Encoder, msgpack
+
+TARGET_RATIO = 5.0
+
+
+def pose_stream(n: int, hz: float = 10.0):
+    """Çember çizen, yavaş tırmanan uçak; self_pose_publisher'ın ürettiği sözlükler."""
+    lat0, lon0, r = 39.9207700, 32.8541100, 0.0015
+    for i in range(n):
+        t = i / hz
+        a = t * 0.2
+        yield {"_type": MsgType.SELF_POSE, "payload": {
+            "lat": lat0 + r * math.cos(a), "lon": lon0 + r * math.sin(a),
+            "alt": 100.0 + 0.05 * t + 0.3 * math.sin(t),
+            "yaw": (math.degrees(a) + 90.0) % 360.0,
+            "pitch": 2.0 * math.sin(t * 0.7), "roll": 15.0 + 3.0 * math.sin(t * 1.3),
+            "speed": 18.0 + 0.5 * math.sin(t * 0.5),
+            "battery": max(0, 100 - int(t / 30)),
+            "autonomous": 1, "lock": 1 if (i // 200) % 2 else 0,
+            "gps_time_ms": 1700000000000 + int(t * 1000),
+        }}
+
+
+def attitude_stream(n: int, hz: float = 50.0):
+    """pymavlink ATTITUDE.to_dict() + _type biçiminde sözlükler."""
+    for i in range(n):
+        t = i / hz
+        yield {"mavpackettype": "ATTITUDE", "time_boot_ms": 60000 + int(t * 1000),
+               "roll": 0.26 + 0.05 * math.sin(t * 1.3), "pitch": 0.03 * math.sin(t * 0.7),
+               "yaw": math.atan2(math.sin(t * 0.2), math.cos(t * 0.2)),
+               "rollspeed": 0.065 * math.cos(t * 1.3), "pitchspeed": 0.021 * math.cos(t * 0.7),
+               "yawspeed": 0.2, "_type": "ATTITUDE"}
+
+
+def _max_errors(layout, originals, decoded):
+    """Alan başına en büyük mutlak gidiş-dönüş hatası."""
+    err = {}
+    for o, d in zip(originals, decoded):
+        src = o["payload"] if layout.payload else o
+        dst = d["payload"] if layout.payload else d
+        for name, _, _ in layout.fields:
+            a, b = src.get(name), dst.get(name)
+            e = 0.0 if a is None and b is None else abs(float(a) - float(b))
+            err[name] = max(err.get(name, 0.0), e)
+    return err
+
+
+def run(name, msgs, keyframe_every, seq_stride):
+    # ws_broadcast her mesaja _seq ekler; araya başka tipler girdiği için artış > 1
+    for i, m in enumerate(msgs):
+        m["_seq"] = 1000 + i * seq_stride
+    layout = LAYOUTS[msgs[0]["_type"]]
+    t0 = time.perf_counter()
+    json_frames = [WsBroadcaster.encode(m) for m in msgs]
+    t_json = time.perf_counter() - t0
+
+    enc = Encoder(keyframe_every=keyframe_every)
+    t0 = time.perf_counter()
+    bin_frames = [enc.encode(m) for m in msgs]
+    t_bin = time.perf_counter() - t0
+
+    dec = Decoder()
+    decoded = [dec.decode(f) for f in bin_frames]
+    err = _max_errors(layout, msgs, decoded)
+
+    json_bytes = sum(len(f.encode("utf-8")) for f in json_frames)
+    bin_bytes = sum(len(f) for f in bin_frames)
+    out = {
+        "frames": len(msgs),
+        "json_b_per_frame": round(json_bytes / len(msgs), 1),
+        "bin_b_per_frame": round(bin_bytes / len(msgs), 1),
+        "keyframe_b": len(bin_frames[0]),
+        "keyframes": enc.keyframes,
+        "ratio": round(json_bytes / bin_bytes, 2),
+        "json_us": round(t_json / len(msgs) * 1e6, 2),
+        "bin_us": round(t_bin / len(msgs) * 1e6, 2),
+        "max_error": {k: float(f"{v:.3g}") for k, v in err.items() if v},
+        "seq_ok": all(o["_seq"] == d.get("_seq") for o, d in zip(msgs, decoded)),
+    }
+    if msgpack is not None:
+        out["msgpack_b_per_frame"] = round(sum(len(msgpack.packb(m)) for m in msgs) / len(msgs), 1)
+    print(f"--- {name} ---")
+    for k, v in out.items():
+        print(f"{k:<20}: {v}")
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser(description="WS JSON ↔ ikili/delta kodek karşılaştırması")
+    ap.add_argument("--frames", type=int, default=5000)
+    ap.add_argument("--keyframe-every", type=int, default=50)
+    ap.add_argument("--json", help="Sonuçları bu dosyaya JSON olarak yaz")
+    args = ap.parse_args()
+
+    results = {
+        "pose": run("SELF_POSE (10 Hz)", list(pose_stream(args.frames)), args.keyframe_every, 10),
+        "attitude": run("ATTITUDE (50 Hz)", list(attitude_stream(args.frames)), args.keyframe_every, 2),
+    }
+    ok = results["pose"]["ratio"] >= TARGET_RATIO
+    print(f"Pose hedefi ≥{TARGET_RATIO:.0f}x: {'OK' if ok else 'BAŞARISIZ'} ({results['pose']['ratio']}x)")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+"""
+WS Tık Birleştirme Benchmark'ı
+==============================
+Aynı sentetik telemetri akışını (50 Hz ATTITUDE, 25 Hz GLOBAL_POSITION_INT,
+olay mesajları...) gerçek bir websockets sunucusu üzerinden istemcilere
+yayınlar ve dört çıkış yolunu karşılaştırır:
+
+    legacy   mesaj başına create_task + json.dumps + istemci başına send (eski yol)
+    queue    ws_broadcaster, tık kapalı (istemci başına kuyruk, mesaj başına çerçeve)
+    tick     20 ms tık: durum mesajları tip+sistem başına birleştirilir
+    batch    20 ms tık + tık başına tek WS_BATCH çerçevesi
+
+Raporlanan: açılan görev sayısı, json.dumps çağrısı, soket yazımı
+(transport.write ≈ send sistem çağrısı), gönderilen bayt, CPU süresi ve
+istemcinin aldığı mesajlar (olayların eksiksiz ve sıralı geldiği doğrulanır).
+
+Kullanım:
+    python benchmarks/bench_ws_tick.py [--duration 4] [--clients 2] [--tick-ms 20]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import websockets
+
+from constants import MsgType
+from ws_broadcast import WsBroadcaster
+
+# (tip, Hz, olay mı)
+STREAM = (
+    ("ATTITUDE", 50, False),
+    ("GLOBAL_POSITION_INT", 25, False),
+    ("VFR_HUD", 10, False),
+    (MsgType.SELF_POSE, 10, False),
+    ("SYS_STATUS", 2, False),
+    ("STATUSTEXT", 2, True),
+    (MsgType.TELEMETRY_ACK, 5, True),
+)
+
+
+def _message(mtype: str, i: int, t: float) -> dict:
+    if mtype == MsgType.SELF_POSE:
+        return {"_type": mtype, "payload": {"lat": 39.92 + t * 1e-5, "lon": 32.85, "alt": 100.0 + t, "yaw": 90.0,
+                                            "pitch": 1.5, "roll": 12.0, "speed": 18.0, "battery": 90,
+                                            "autonomous": 1, "lock": 0, "gps_time_ms": 1700000000000 + int(t * 1000)}}
+    if mtype == MsgType.TELEMETRY_ACK:
+        return {"_type": mtype, "status": 200, "seq": i, "latency_ms": 12.5}
+    d = {"mavpackettype": mtype, "time_boot_ms": int(t * 1000), "value": t, "seq": i,
+         "roll": 0.1, "pitch": 0.02, "yaw": 1.57, "rollspeed": 0.0, "pitchspeed": 0.0, "yawspeed": 0.0}
+    if mtype == "STATUSTEXT":
+        d = {"mavpackettype": mtype, "severity": 6, "text": f"olay {i}", "seq": i}
+    d["_type"] = mtype
+    d["_sysid"] = 1
+    return d
+
+
+async def _legacy_broadcast(conns, msg):
+    """Eski main.broadcast_ws: mesaj başına görev içinde serileştir ve sırayla gönder."""
+    payload = json.dumps(msg, default=str)
+    for ws in list(conns):
+        try:
+            await ws.send(payload)
+        except Exception:
+            conns.discard(ws)
+
+
+async def run_mode(mode: str, args) -> dict:
+    loop = asyncio.get_running_loop()
+    counters = {"tasks": 0, "dumps": 0, "writes": 0, "write_bytes": 0}
+    tick = args.tick_ms / 1000.0 if mode in ("tick", "batch") else 0.0
+    broadcaster = WsBroadcaster(maxlen=1024, tick=tick)
+    conns = set()
+
+    async def handler(ws, path=None):
+        write = ws.transport.write
+
+        def counting_write(data):
+            counters["writes"] += 1
+            counters["write_bytes"] += len(data)
+            return write(data)
+        ws.transport.write = counting_write
+        conns.add(ws)
+        if mode != "legacy":
+            broadcaster.add(ws, batch=(mode == "batch"))
+        try:
+            await ws.wait_closed()
+        finally:
+            conns.discard(ws)
+            broadcaster.remove(ws)
+
+    received = [{"frames": 0, "messages": 0, "events": [], "types": {}} for _ in range(args.clients)]
+
+    async def client(rx):
+        async with websockets.connect(f"ws://127.0.0.1:{args.port}/") as ws:
+            async for frame in ws:
+                rx["frames"] += 1
+                msg = json.loads(frame)
+                msgs = msg["messages"] if msg.get("_type") == MsgType.WS_BATCH else [msg]
+                for m in msgs:
+                    rx["messages"] += 1
+                    t = m.get("_type")
+                    rx["types"][t] = rx["types"].get(t, 0) + 1
+                    if t in ("STATUSTEXT", MsgType.TELEMETRY_ACK):
+                        rx["events"].append((t, m.get("seq")))
+
+    server = await websockets.serve(handler, "127.0.0.1", args.port)
+    client_tasks = [loop.create_task(client(rx)) for rx in received]
+    while len(conns) < args.clients:
+        await asyncio.sleep(0.01)
+    await asyncio.sleep(0.1)
+
+    # Sayaçlar: görev fabrikası ve json.dumps sarmalayıcısı yalnızca ölçüm süresince
+    orig_factory = loop.get_task_factory()
+
+    def factory(lp, coro, **kw):
+        counters["tasks"] += 1
+        return asyncio.Task(coro, loop=lp, **kw)
+    orig_dumps = json.dumps
+
+    def dumps(*a, **kw):
+        counters["dumps"] += 1
+        return orig_dumps(*a, **kw)
+    loop.set_task_factory(factory)
+    json.dumps = dumps
+    counters["writes"] = counters["write_bytes"] = 0
+
+    published = {t: 0 for t, _, _ in STREAM}
+    sent_events = []
+    next_due = {t: 0.0 for t, _, _ in STREAM}
+    cpu0 = time.process_time()
+    t0 = time.monotonic()
+    while True:
+        now = time.monotonic() - t0
+        if now >= args.duration:
+            break
+        for mtype, hz, is_event in STREAM:
+            while next_due[mtype] <= now:
+                i = published[mtype]
+                msg = _message(mtype, i, now)
+                if mode == "legacy":
+                    loop.create_task(_legacy_broadcast(conns, msg))
+                else:
+                    broadcaster.publish(msg)
+                published[mtype] += 1
+                if is_event:
+                    sent_events.append((mtype, i))
+                next_due[mtype] += 1.0 / hz
+        await asyncio.sleep(0.002)
+    broadcaster.flush()
+    await asyncio.sleep(0.5)
+    cpu = time.process_time() - cpu0
+    json.dumps = orig_dumps
+    loop.set_task_factory(orig_factory)
+
+    for t in client_tasks:
+        t.cancel()
+    server.close()
+    await server.wait_closed()
+    await asyncio.gather(*client_tasks, return_exceptions=True)
+
+    total = sum(published.values())
+    rx = received[0]
+    ok_events = all(r["events"] == sent_events for r in received)
+    return {
+        "published": total,
+        "tasks": counters["tasks"],
+        "json_dumps": counters["dumps"],
+        "socket_writes": counters["writes"],
+        "bytes": counters["write_bytes"],
+        "cpu_ms": round(cpu * 1000.0, 1),
+        "frames_per_client": rx["frames"],
+        "msgs_per_client": rx["messages"],
+        "events_in_order": ok_events,
+        "attitude_per_client": rx["types"].get("ATTITUDE", 0),
+    }
+
+
+async def amain(args):
+    results = {}
+    for mode in args.modes.split(","):
+        results[mode] = await run_mode(mode, args)
+        args.port += 1
+    keys = list(next(iter(results.values())))
+    print(f"{'':<20}" + "".join(f"{m:>12}" for m in results))
+    for k in keys:
+        print(f"{k:<20}" + "".join(f"{str(results[m][k]):>12}" for m in results))
+    if "legacy" in results and "batch" in results:
+        base, new = results["legacy"], results["batch"]
+        print(f"Görev azalması      : {base['tasks']} → {new['tasks']}")
+        print(f"Soket yazımı azalması: {base['socket_writes'] / max(1, new['socket_writes']):.1f}x")
+    return results
+
+
+def main():
+    ap = argparse.ArgumentParser(description="WS çıkış tık birleştirmesi benchmark'ı")
+    ap.add_argument("--duration", type=float, default=4.0)
+    ap.add_argument("--clients", type=int, default=2)
+    ap.add_argument("--tick-ms", type=float, default=20.0)
+    ap.add_argument("--port", type=int, default=18780)
+    ap.add_argument("--modes", default="legacy,queue,tick,batch")
+    ap.add_argument("--json", help="Sonuçları bu dosyaya JSON olarak yaz")
+    args = ap.parse_args()
+    results = asyncio.run(amain(args))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+Sentetik MAVLink Yük Üreteci
+============================
+Yerel bir UDP portuna gerçekçi HEARTBEAT, GLOBAL_POSITION_INT, ATTITUDE,
+VFR_HUD ve SYS_STATUS akışları gönderir (dairesel uçuş, azalan batarya).
+Her akışın hızı ayrı ayarlanır; zamanlama monotonik saate göre kaymasızdır.
+
+Kullanım:
+    python benchmarks/mavlink_loadgen.py --port 14555 --duration 30
+    python benchmarks/mavlink_loadgen.py --rates ATTITUDE=100,GLOBAL_POSITION_INT=50 --scale 2
+"""
+
+import argparse
+import heapq
+import math
+import sys
+import time
+
+try:
+    from pymavlink import mavutil
+except Exception:
+    mavutil = None
+
+DEFAULT_RATES = {
+    "HEARTBEAT": 1.0,
+    "GLOBAL_POSITION_INT": 50.0,
+    "ATTITUDE": 50.0,
+    "VFR_HUD": 10.0,
+    "SYS_STATUS": 2.0,
+}
+
+_HOME_LAT = 39.92077
+_HOME_LON = 32.85411
+_RADIUS_M = 300.0
+_SPEED_MS = 18.0
+
+
+class FlightModel:
+    """Sabit hızla daire çizen basit İHA modeli."""
+    def __init__(self):
+        self.t0 = time.monotonic()
+
+    def at(self, now: float):
+        t = now - self.t0
+        omega = _SPEED_MS / _RADIUS_M
+        ang = omega * t
+        north = _RADIUS_M * math.cos(ang)
+        east = _RADIUS_M * math.sin(ang)
+        lat = _HOME_LAT + north / 111_320.0
+        lon = _HOME_LON + east / (111_320.0 * math.cos(math.radians(_HOME_LAT)))
+        heading = (math.degrees(ang) + 90.0) % 360.0
+        vn = -_SPEED_MS * math.sin(ang)
+        ve = _SPEED_MS * math.cos(ang)
+        roll = math.atan2(_SPEED_MS * omega, 9.81)
+        pitch = 0.03 * math.sin(t / 7.0)
+        alt = 100.0 + 5.0 * math.sin(t / 11.0)
+        battery = max(0, 100 - int(t / 20.0))
+        return {
+            "t": t, "lat": lat, "lon": lon, "alt": alt, "heading": heading,
+            "vn": vn, "ve": ve, "roll": roll, "pitch": pitch, "yaw": math.radians(heading),
+            "battery": battery,
+        }
+
+
+def _send(mav, name: str, s: dict):
+    boot_ms = int(s["t"] * 1000) & 0xFFFFFFFF
+    if name == "HEARTBEAT":
+        mav.heartbeat_send(1, 3, 0x80 | 0x10 | 0x01, 10, 4)
+    elif name == "GLOBAL_POSITION_INT":
+        mav.global_position_int_send(boot_ms, int(s["lat"] * 1e7), int(s["lon"] * 1e7),
+                                     int((s["alt"] + 900.0) * 1000), int(s["alt"] * 1000),
+                                     int(s["vn"] * 100), int(s["ve"] * 100), 0, int(s["heading"] * 100))
+    elif name == "ATTITUDE":
+        mav.attitude_send(boot_ms, s["roll"], s["pitch"], s["yaw"], 0.0, 0.0, 0.06)
+    elif name == "VFR_HUD":
+        mav.vfr_hud_send(_SPEED_MS, _SPEED_MS, int(s["heading"]), 55, s["alt"], 0.0)
+    elif name == "SYS_STATUS":
+        mav.sys_status_send(0, 0, 0, 500, 12400, 1500, s["battery"], 0, 0, 0, 0, 0, 0)
+    else:
+        raise ValueError(f"Desteklenmeyen mesaj tipi: {name}")
+
+
+def parse_rates(spec: str, scale: float = 1.0) -> dict:
+    rates = dict(DEFAULT_RATES)
+    for item in (spec or "").split(","):
+        if "=" in item:
+            name, hz = item.split("=", 1)
+            rates[name.strip().upper()] = float(hz)
+    return {k: v * scale for k, v in rates.items() if v > 0}
+
+
+def run(host: str, port: int, rates: dict, duration: float) -> dict:
+    """Akışları gönderir; tip başına gönderilen mesaj sayısını döndürür."""
+    conn = mavutil.mavlink_connection(f"udpout:{host}:{port}", source_system=1, source_component=1)
+    model = FlightModel()
+    sent = {name: 0 for name in rates}
+    start = time.monotonic()
+    end = start + duration
+    # (sonraki_zaman, tip, periyot, sıra) yığını
+    heap = [(start, name, 1.0 / hz, 0) for name, hz in rates.items()]
+    heapq.heapify(heap)
+    try:
+        while heap:
+            due, name, period, n = heapq.heappop(heap)
+            if due >= end:
+                break
+            delay = due - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            _send(conn.mav, name, model.at(time.monotonic()))
+            sent[name] += 1
+            # Kaymasız: bir sonraki zaman başlangıçtan periyot katları olarak hesaplanır
+            heapq.heappush(heap, (start + (n + 1) * period, name, period, n + 1))
+    finally:
+        conn.close()
+    return sent
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Sentetik MAVLink yük üreteci")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=14555)
+    ap.add_argument("--duration", type=float, default=30.0, help="Süre (sn)")
+    ap.add_argument("--rates", default="", help="TİP=Hz,... (varsayılanların üzerine yazar)")
+    ap.add_argument("--scale", type=float, default=1.0, help="Tüm hızları bu katsayıyla çarp")
+    args = ap.parse_args()
+    if mavutil is None:
+        print("pymavlink gerekli (pip install pymavlink)", file=sys.stderr)
+        return 1
+    rates = parse_rates(args.rates, args.scale)
+    sent = run(args.host, args.port, rates, args.duration)
+    total = sum(sent.values())
+    # Son satır makine tarafından okunur (bench_pipeline)
+    print(" ".join(f"{k}={v}" for k, v in sent.items()))
+    print(f"SENT {total}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,307 @@
+# -*- coding: utf-8 -*-
+"""
+Yerel Yarışma Sunucusu Taklidi
+==============================
+Gerçek yarışma sunucusu olmadan yük ve hata testleri için aiohttp tabanlı
+sahte sunucu. Uygulanan uç noktalar:
+
+    POST /api/giris                  {kadi, sifre} → {takim_numarasi} + oturum çerezi
+    POST /api/telemetri_gonder       → {sunucusaati, konumBilgileri}
+    GET  /api/sunucusaati            → {gun, saat, dakika, saniye, milisaniye}
+    GET  /api/hss_koordinatlari      → {sunucusaati, hss_koordinat_bilgileri}
+    GET  /api/qr_koordinati          → {qrEnlem, qrBoylam}
+    POST /admin/hss_aktif            (X-ADMIN-KEY)
+    POST /admin/qr_koordinat_guncelle
+    GET  /admin/stats
+    POST /admin/clear_data
+
+Simülasyon: `--teams` kadar rakip İHA daire çizer ve konumBilgileri'nde
+döner; her isteğe `--latency` ± `--jitter` ms gecikme eklenir, `--error-rate`
+oranında 500 döner, oturumlar `--auth-ttl` sn sonra düşer (401).
+`--etag` ile HSS/QR yanıtları ETag taşır ve If-None-Match'e 304 döner.
+
+Kullanım:
+    python benchmarks/mock_server.py --port 5000 --teams 20 --latency 40 --jitter 20
+    IHA_SERVER_URL=http://127.0.0.1:5000/ IHA_SERVER_USER=takim IHA_SERVER_PASS=x python main.py
+
+Benchmark'lardan:
+    runner, cfg = await start_mock_server(port=0, teams=10)
+"""
+
+import argparse
+import asyncio
+import collections
+import hashlib
+import json
+import math
+import random
+import secrets
+import time
+
+try:
+    from aiohttp import web
+except Exception:
+    web = None
+
+_HOME_LAT = 39.92077
+_HOME_LON = 32.85411
+_COOKIE = "iha_oturum"
+
+
+class MockConfig:
+    def __init__(self, teams: int = 10, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+                 auth_ttl: float = 0.0, admin_key: str = "admin", username: str = None, password: str = None,
+                 etag: bool = False, require_auth: bool = True, seed: int = None):
+        self.teams = teams
+        self.latency = latency / 1000.0
+        self.jitter = jitter / 1000.0
+        self.error_rate = error_rate
+        self.auth_ttl = auth_ttl
+        self.admin_key = admin_key
+        self.username = username
+        self.password = password
+        self.etag = etag
+        self.require_auth = require_auth
+        self.rng = random.Random(seed)
+
+
+class MockState:
+    """Sunucu tarafı durum: oturumlar, takım konumları, HSS/QR ve sayaçlar."""
+    def __init__(self, cfg: MockConfig):
+        self.cfg = cfg
+        self.t0 = time.time()
+        self.sessions = {}           # {token: (takim_numarasi, bitiş)}
+        self.team_numbers = {}       # {kullanıcı: takim_numarasi}
+        self.reported = {}           # {takim_numarasi: son telemetri}
+        self.hss_active = False
+        self.hss = []
+        self.qr = {"qrEnlem": round(_HOME_LAT + 0.002, 6), "qrBoylam": round(_HOME_LON + 0.003, 6)}
+        self.counters = collections.Counter()
+
+    # --- Saat ---
+    @staticmethod
+    def server_time(now: float = None) -> dict:
+        now = time.time() if now is None else now
+        tm = time.localtime(now)
+        return {"gun": tm.tm_mday, "saat": tm.tm_hour, "dakika": tm.tm_min, "saniye": tm.tm_sec,
+                "milisaniye": int((now % 1) * 1000)}
+
+    # --- Oturum ---
+    def login(self, user: str) -> tuple:
+        tno = self.team_numbers.setdefault(user, len(self.team_numbers) + 1)
+        token = secrets.token_hex(16)
+        expires = time.time() + self.cfg.auth_ttl if self.cfg.auth_ttl > 0 else float("inf")
+        self.sessions[token] = (tno, expires)
+        return tno, token
+
+    def team_for(self, request):
+        entry = self.sessions.get(request.cookies.get(_COOKIE, ""))
+        if entry is None or entry[1] < time.time():
+            return None
+        return entry[0]
+
+    # --- Rakip takımlar ---
+    def simulated_teams(self, exclude=None, now: float = None) -> list:
+        now = time.time() if now is None else now
+        t = now - self.t0
+        out = []
+        base_no = 100
+        for i in range(self.cfg.teams):
+            radius = 150.0 + 25.0 * i
+            omega = 18.0 / radius
+            ang = omega * t + i * 2.0 * math.pi / max(1, self.cfg.teams)
+            north, east = radius * math.cos(ang), radius * math.sin(ang)
+            out.append({
+                "takim_numarasi": base_no + i,
+                "iha_enlem": round(_HOME_LAT + north / 111_320.0, 7),
+                "iha_boylam": round(_HOME_LON + east / (111_320.0 * math.cos(math.radians(_HOME_LAT))), 7),
+                "iha_irtifa": round(80.0 + (5.0 * i) % 60, 1),
+                "iha_dikilme": round(2.0 * math.sin(t / 5.0 + i), 2),
+                "iha_yonelme": round((math.degrees(ang) + 90.0) % 360.0, 1),
+                "iha_yatis": round(20.0 * math.sin(t / 7.0 + i), 2),
+                "iha_hizi": 18.0,
+                "zaman_farki": self.cfg.rng.randint(50, 400),
+            })
+        for tno, rec in self.reported.items():
+            if tno == exclude:
+                continue
+            item = {k: rec.get(k) for k in ("iha_enlem", "iha_boylam", "iha_irtifa", "iha_dikilme",
+                                            "iha_yonelme", "iha_yatis")}
+            item.update({"takim_numarasi": tno, "iha_hizi": rec.get("iha_hiz"),
+                         "zaman_farki": int((now - rec["_t"]) * 1000)})
+            out.append(item)
+        return out
+
+
+_TELEMETRY_FIELDS = ("takim_numarasi", "iha_enlem", "iha_boylam", "iha_irtifa", "iha_dikilme", "iha_yonelme",
+                     "iha_yatis", "iha_hiz", "iha_batarya", "iha_otonom", "iha_kilitlenme", "gps_saati")
+
+
+def _json_with_etag(request, state: MockState, data, volatile: dict = None):
+    """`volatile` (ör. sunucusaati) gövdeye eklenir ama ETag'i değiştirmez (zayıf ETag)."""
+    stable = json.dumps(data, separators=(",", ":"))
+    body = json.dumps({**volatile, **data}, separators=(",", ":")) if volatile else stable
+    if not state.cfg.etag:
+        return web.Response(text=body, content_type="application/json")
+    tag = ('W/' if volatile else '') + '"' + hashlib.md5(stable.encode()).hexdigest() + '"'
+    if request.headers.get("If-None-Match") == tag:
+        state.counters["not_modified"] += 1
+        return web.Response(status=304, headers={"ETag": tag})
+    return web.Response(text=body, content_type="application/json", headers={"ETag": tag})
+
+
+def create_app(cfg: MockConfig = None):
+    if web is None:
+        raise RuntimeError("aiohttp gerekli (pip install aiohttp)")
+    cfg = cfg or MockConfig()
+    state = MockState(cfg)
+
+    @web.middleware
+    async def faults(request, handler):
+        state.counters[request.path] += 1
+        delay = cfg.latency + (cfg.rng.uniform(-cfg.jitter, cfg.jitter) if cfg.jitter else 0.0)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if cfg.error_rate and cfg.rng.random() < cfg.error_rate:
+            state.counters["injected_errors"] += 1
+            return web.json_response({"hata": "simüle sunucu hatası"}, status=500)
+        return await handler(request)
+
+    def require_team(request):
+        if not cfg.require_auth:
+            return state.team_for(request) or 1
+        tno = state.team_for(request)
+        if tno is None:
+            state.counters["unauthorized"] += 1
+            raise web.HTTPUnauthorized(text=json.dumps({"hata": "oturum yok veya süresi doldu"}),
+                                       content_type="application/json")
+        return tno
+
+    def require_admin(request):
+        if request.headers.get("X-ADMIN-KEY") != cfg.admin_key:
+            raise web.HTTPForbidden(text=json.dumps({"hata": "yetkisiz"}), content_type="application/json")
+
+    async def giris(request):
+        try:
+            data = await request.json()
+        except Exception:
+            return web.json_response({"hata": "geçersiz JSON"}, status=400)
+        user, pw = data.get("kadi"), data.get("sifre")
+        if not user or not pw or (cfg.username and user != cfg.username) or (cfg.password and pw != cfg.password):
+            return web.json_response({"hata": "kullanıcı adı veya şifre hatalı"}, status=400)
+        tno, token = state.login(user)
+        resp = web.json_response({"takim_numarasi": tno})
+        resp.set_cookie(_COOKIE, token)
+        return resp
+
+    async def telemetri_gonder(request):
+        tno = require_team(request)
+        try:
+            data = await request.json()
+        except Exception:
+            return web.json_response({"hata": "geçersiz JSON"}, status=400)
+        missing = [k for k in _TELEMETRY_FIELDS if k not in data]
+        if missing:
+            state.counters["bad_telemetry"] += 1
+            return web.json_response({"hata": "eksik alan", "alanlar": missing}, status=400)
+        data["_t"] = time.time()
+        state.reported[tno] = data
+        state.counters["telemetry_ok"] += 1
+        return web.json_response({"sunucusaati": state.server_time(),
+                                  "konumBilgileri": state.simulated_teams(exclude=tno)})
+
+    async def sunucusaati(request):
+        return web.json_response(state.server_time())
+
+    async def hss_koordinatlari(request):
+        require_team(request)
+        return _json_with_etag(request, state, {"hss_koordinat_bilgileri": state.hss if state.hss_active else []},
+                               volatile={"sunucusaati": state.server_time()})
+
+    async def qr_koordinati(request):
+        require_team(request)
+        return _json_with_etag(request, state, state.qr)
+
+    async def admin_hss_aktif(request):
+        require_admin(request)
+        data = await request.json()
+        state.hss_active = bool(data.get("aktif"))
+        if state.hss_active:
+            state.hss = data.get("koordinatlar") or [
+                {"id": i, "hssEnlem": round(_HOME_LAT + 0.003 * (i - 1), 6),
+                 "hssBoylam": round(_HOME_LON - 0.002 * i, 6), "hssYaricapi": 50 + 25 * i}
+                for i in range(3)]
+        return web.json_response({"aktif": state.hss_active, "adet": len(state.hss)})
+
+    async def admin_qr(request):
+        require_admin(request)
+        data = await request.json()
+        state.qr = {"qrEnlem": float(data["qrEnlem"]), "qrBoylam": float(data["qrBoylam"])}
+        return web.json_response(state.qr)
+
+    async def admin_stats(request):
+        require_admin(request)
+        return web.json_response({"sayaclar": dict(state.counters), "oturumlar": len(state.sessions),
+                                  "takimlar": len(state.reported), "calisma_suresi": round(time.time() - state.t0, 1)})
+
+    async def admin_clear(request):
+        require_admin(request)
+        state.reported.clear()
+        state.counters.clear()
+        return web.json_response({"temizlendi": True})
+
+    app = web.Application(middlewares=[faults])
+    app["state"] = state
+    app.router.add_post("/api/giris", giris)
+    app.router.add_post("/api/telemetri_gonder", telemetri_gonder)
+    app.router.add_get("/api/sunucusaati", sunucusaati)
+    app.router.add_get("/api/hss_koordinatlari", hss_koordinatlari)
+    app.router.add_get("/api/qr_koordinati", qr_koordinati)
+    app.router.add_post("/admin/hss_aktif", admin_hss_aktif)
+    app.router.add_post("/admin/qr_koordinat_guncelle", admin_qr)
+    app.router.add_get("/admin/stats", admin_stats)
+    app.router.add_post("/admin/clear_data", admin_clear)
+    return app
+
+
+async def start_mock_server(host: str = "127.0.0.1", port: int = 0, **kwargs):
+    """Sunucuyu çalışan döngüde başlatır; (runner, base_url) döndürür. port=0: boş port."""
+    app = create_app(MockConfig(**kwargs))
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+    bound = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://{host}:{bound}"
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Yerel yarışma sunucusu taklidi")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=5000)
+    ap.add_argument("--teams", type=int, default=10, help="Simüle rakip takım sayısı")
+    ap.add_argument("--latency", type=float, default=0.0, help="Ek gecikme (ms)")
+    ap.add_argument("--jitter", type=float, default=0.0, help="Gecikme sapması ± (ms)")
+    ap.add_argument("--error-rate", type=float, default=0.0, help="500 dönen istek oranı (0-1)")
+    ap.add_argument("--auth-ttl", type=float, default=0.0, help="Oturum ömrü (sn), 0 = süresiz")
+    ap.add_argument("--admin-key", default="admin")
+    ap.add_argument("--user", default=None, help="Yalnızca bu kullanıcı adını kabul et")
+    ap.add_argument("--password", default=None)
+    ap.add_argument("--etag", action="store_true", help="HSS/QR yanıtlarında ETag/304 kullan")
+    ap.add_argument("--no-auth", action="store_true", help="Oturum çerezi istemeden yanıt ver")
+    ap.add_argument("--seed", type=int, default=None)
+    args = ap.parse_args()
+    if web is None:
+        print("aiohttp gerekli (pip install aiohttp)")
+        return 1
+    cfg = MockConfig(teams=args.teams, latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                     auth_ttl=args.auth_ttl, admin_key=args.admin_key, username=args.user, password=args.password,
+                     etag=args.etag, require_auth=not args.no_auth, seed=args.seed)
+    print(f"Sahte sunucu: http://{args.host}:{args.port}/ (takım={args.teams}, gecikme={args.latency}±{args.jitter} ms, "
+          f"hata={args.error_rate}, oturum ömrü={args.auth_ttl or '∞'} sn)")
+    web.run_app(create_app(cfg), host=args.host, port=args.port, print=None)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -32,5 +32,11 @@ class MsgType:
     # Görsel/katman ve durum
     SELF_POSE = "SELF_POSE"
     WS_CLIENTS = "WS_CLIENTS"
+    WS_SUBSCRIBED = "WS_SUBSCRIBED"
+    WS_ERROR = "WS_ERROR"
+    WS_CODEC = "WS_CODEC"
+    WS_BATCH = "WS_BATCH"
+    WS_SNAPSHOT = "WS_SNAPSHOT"
+    WS_RESUME = "WS_RESUME"
     STATUS_UPDATE = "STATUS_UPDATE"
     TEAMS_UPDATE = "TEAMS_UPDATE"
\ No newline at end of file
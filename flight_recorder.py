@@ -0,0 +1,328 @@
+# -*- coding: utf-8 -*-
+"""
+Uçuş Kaydedici
+==============
+Sürekli açık, sadece-ekleme (append-only) oturum kaydı:
+
+    recordings/20261017_141500/
+        mavlink.tlog   Ham MAVLink baytları, tlog formatında
+                       (her kayıt: 8 bayt big-endian µs zaman damgası + paket)
+        server.jsonl   Sunucu yanıtları (konumBilgileri, HSS, QR, saat),
+                       satır başına {"t": µs, "type": ..., "payload": ...}
+        index.bin      Saniye başına bir giriş: <QQQ (µs, tlog ofseti, server ofseti)
+
+Alım yolu yalnızca kuyruğa ekler (put_nowait); disk yazımı ayrı bir
+thread'de yapılır. FlightRecording, dosyaları mmap ile açar ve zaman
+indeksi üzerinden ikili aramayla anında konumlanır.
+
+Kullanım (özet):
+    python flight_recorder.py recordings/20261017_141500
+"""
+
+import json
+import logging
+import mmap
+import os
+import queue
+import struct
+import sys
+import threading
+import time
+
+TLOG_NAME = "mavlink.tlog"
+SERVER_NAME = "server.jsonl"
+INDEX_NAME = "index.bin"
+
+_TLOG_HDR = struct.Struct(">Q")
+_INDEX_ENTRY = struct.Struct("<QQQ")
+_USEC = 1_000_000
+
+
+class FlightRecorder:
+    """
+    Arka plan yazıcı thread'li kaydedici.
+    - record_mavlink(raw): ham MAVLink paketi (okuyucu thread'inden çağrılabilir)
+    - record_server(msg_dict): sunucu mesajı (event loop'tan)
+    """
+    def __init__(self, root: str = "recordings", max_pending: int = 100_000):
+        self.root = root
+        self.path = None
+        self._q = queue.Queue(maxsize=max_pending)
+        self._thread = None
+        self._dropped = 0
+        self._records = 0
+        self._bytes = 0
+
+    def start(self):
+        name = time.strftime("%Y%m%d_%H%M%S")
+        self.path = os.path.join(self.root, name)
+        os.makedirs(self.path, exist_ok=True)
+        self._thread = threading.Thread(target=self._run, name="FlightRecorder", daemon=True)
+        self._thread.start()
+        logging.getLogger("REC").info(f"Uçuş kaydı başladı: {self.path}")
+        return self.path
+
+    def close(self, timeout: float = 2.0):
+        if self._thread is None:
+            return
+        try:
+            self._q.put(None, timeout=timeout)
+        except queue.Full:
+            pass
+        self._thread.join(timeout)
+        self._thread = None
+        logging.getLogger("REC").info(f"Uçuş kaydı kapatıldı: {self._records} kayıt, {self._bytes} bayt")
+
+    # --- Alım yolu (bloklamaz) ---
+    def record_mavlink(self, raw: bytes, ts: float = None):
+        if self._thread is None or not raw:
+            return
+        try:
+            self._q.put_nowait((0, int((ts if ts is not None else time.time()) * _USEC), bytes(raw)))
+        except queue.Full:
+            self._dropped += 1
+
+    def record_mavlink_msg(self, msg, ts: float = None):
+        """pymavlink mesaj nesnesinin ham tamponunu kaydeder."""
+        try:
+            if msg.get_type() == 'BAD_DATA':
+                return
+            raw = msg.get_msgbuf()
+        except Exception:
+            return
+        self.record_mavlink(raw, ts)
+
+    def record_server(self, msg_dict: dict, ts: float = None):
+        if self._thread is None:
+            return
+        try:
+            self._q.put_nowait((1, int((ts if ts is not None else time.time()) * _USEC), msg_dict))
+        except queue.Full:
+            self._dropped += 1
+
+    # --- Yazıcı thread ---
+    def _run(self):
+        logger = logging.getLogger("REC")
+        tlog = open(os.path.join(self.path, TLOG_NAME), "ab")
+        srv = open(os.path.join(self.path, SERVER_NAME), "ab")
+        idx = open(os.path.join(self.path, INDEX_NAME), "ab")
+        tlog_off = tlog.tell()
+        srv_off = srv.tell()
+        last_sec = None
+        running = True
+        try:
+            while running:
+                items = [self._q.get()]
+                while True:
+                    try:
+                        items.append(self._q.get_nowait())
+                    except queue.Empty:
+                        break
+                for item in items:
+                    if item is None:
+                        running = False
+                        continue
+                    kind, ts_us, data = item
+                    sec = ts_us // _USEC
+                    # MAVLink (okuyucu thread zamanı) ve sunucu kayıtları (döngü zamanı)
+                    # kuyruğa sırasız girebilir; indeks seek() ikili araması için
+                    # artan kalmalı. Geç gelen kayıt mevcut girişin ofsetinden sonra durur.
+                    if last_sec is None or sec > last_sec:
+                        idx.write(_INDEX_ENTRY.pack(ts_us, tlog_off, srv_off))
+                        last_sec = sec
+                    if kind == 0:
+                        tlog.write(_TLOG_HDR.pack(ts_us))
+                        tlog.write(data)
+                        n = _TLOG_HDR.size + len(data)
+                        tlog_off += n
+                    else:
+                        line = json.dumps({"t": ts_us, "type": data.get("_type"), "payload": data.get("payload")},
+                                          default=str, ensure_ascii=False).encode("utf-8") + b"\n"
+                        srv.write(line)
+                        n = len(line)
+                        srv_off += n
+                    self._records += 1
+                    self._bytes += n
+                tlog.flush(); srv.flush(); idx.flush()
+        except Exception as e:
+            logger.error(f"Uçuş kaydı yazma hatası: {e}")
+        finally:
+            for f in (tlog, srv, idx):
+                try: f.close()
+                except Exception: pass
+
+    def stats(self) -> dict:
+        return {
+            "path": self.path,
+            "records": self._records,
+            "bytes": self._bytes,
+            "pending": self._q.qsize(),
+            "dropped": self._dropped,
+        }
+
+
+def mavlink_packet_len(buf, off: int) -> int:
+    """buf[off]'taki MAVLink v1/v2 paketinin toplam uzunluğu (tanınmazsa 0)."""
+    if off + 3 > len(buf):
+        return 0
+    magic = buf[off]
+    if magic == 0xFE:
+        return buf[off + 1] + 8
+    if magic == 0xFD:
+        n = buf[off + 1] + 12
+        if buf[off + 2] & 0x01:  # MAVLINK_IFLAG_SIGNED
+            n += 13
+        return n
+    return 0
+
+
+class FlightRecording:
+    """
+    Kayıtlı oturumu (veya tek bir .tlog dosyasını) mmap ile okur.
+    İndeks yoksa (ör. MAVProxy tlog'u) açılışta bellekte oluşturulur.
+    """
+    def __init__(self, path: str):
+        if os.path.isdir(path):
+            self.path = path
+            tlog_path = os.path.join(path, TLOG_NAME)
+            srv_path = os.path.join(path, SERVER_NAME)
+            idx_path = os.path.join(path, INDEX_NAME)
+        else:
+            self.path = os.path.dirname(path)
+            tlog_path, srv_path, idx_path = path, None, None
+        self._files = []
+        self.tlog = self._map(tlog_path)
+        self.server = self._map(srv_path)
+        index = self._map(idx_path)
+        if index is not None and len(index) >= _INDEX_ENTRY.size:
+            self._index = index
+            self._index_len = len(index) // _INDEX_ENTRY.size
+        else:
+            self._index = self._build_index()
+            self._index_len = len(self._index) // _INDEX_ENTRY.size
+
+    def _map(self, path):
+        if not path or not os.path.exists(path) or os.path.getsize(path) == 0:
+            return None
+        f = open(path, "rb")
+        self._files.append(f)
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def close(self):
+        for m in (self.tlog, self.server, self._index):
+            if isinstance(m, mmap.mmap):
+                m.close()
+        for f in self._files:
+            f.close()
+        self._files.clear()
+
+    def _build_index(self) -> bytes:
+        out = bytearray()
+        last_sec = None
+        for off, ts_us, _ in self._scan_tlog(0):
+            sec = ts_us // _USEC
+            if sec != last_sec:
+                out += _INDEX_ENTRY.pack(ts_us, off, 0)
+                last_sec = sec
+        return bytes(out)
+
+    def _entry(self, i: int):
+        return _INDEX_ENTRY.unpack_from(self._index, i * _INDEX_ENTRY.size)
+
+    # --- Zaman ---
+    @property
+    def start_usec(self):
+        return self._entry(0)[0] if self._index_len else 0
+
+    @property
+    def end_usec(self):
+        if not self._index_len:
+            return 0
+        ts_end = self._entry(self._index_len - 1)[0]
+        _, tlog_off, _ = self._entry(self._index_len - 1)
+        for _, ts_us, _ in self._scan_tlog(tlog_off):
+            ts_end = max(ts_end, ts_us)
+        return ts_end
+
+    @property
+    def duration(self) -> float:
+        return (self.end_usec - self.start_usec) / _USEC
+
+    def seek(self, t: float):
+        """Başlangıçtan t saniye sonrası için (µs, tlog ofseti, server ofseti)."""
+        if not self._index_len:
+            return (0, 0, 0)
+        target = self.start_usec + int(t * _USEC)
+        lo, hi = 0, self._index_len
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._entry(mid)[0] <= target:
+                lo = mid + 1
+            else:
+                hi = mid
+        return self._entry(max(0, lo - 1))
+
+    # --- Okuma ---
+    def _scan_tlog(self, off: int):
+        buf = self.tlog
+        if buf is None:
+            return
+        end = len(buf)
+        while off + _TLOG_HDR.size < end:
+            (ts_us,) = _TLOG_HDR.unpack_from(buf, off)
+            n = mavlink_packet_len(buf, off + _TLOG_HDR.size)
+            if n == 0 or off + _TLOG_HDR.size + n > end:
+                break
+            yield off, ts_us, n
+            off += _TLOG_HDR.size + n
+
+    def iter_mavlink(self, start: float = 0.0):
+        """(µs, ham_paket) çiftlerini start saniyesinden itibaren üretir."""
+        _, off, _ = self.seek(start)
+        start_us = self.start_usec + int(start * _USEC)
+        for pos, ts_us, n in self._scan_tlog(off):
+            if ts_us < start_us:
+                continue
+            p = pos + _TLOG_HDR.size
+            yield ts_us, self.tlog[p:p + n]
+
+    def iter_server(self, start: float = 0.0):
+        """Sunucu kayıtlarını ({"t", "type", "payload"}) start saniyesinden itibaren üretir."""
+        if self.server is None:
+            return
+        _, _, off = self.seek(start)
+        start_us = self.start_usec + int(start * _USEC)
+        buf = self.server
+        end = len(buf)
+        while off < end:
+            nl = buf.find(b"\n", off)
+            if nl < 0:
+                break
+            line = buf[off:nl]
+            off = nl + 1
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                continue
+            if rec.get("t", 0) >= start_us:
+                yield rec
+
+    def summary(self) -> dict:
+        return {
+            "path": self.path,
+            "start": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.start_usec / _USEC)) if self._index_len else None,
+            "duration_s": round(self.duration, 1),
+            "tlog_bytes": len(self.tlog) if self.tlog is not None else 0,
+            "server_bytes": len(self.server) if self.server is not None else 0,
+            "index_entries": self._index_len,
+        }
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Kullanım: python flight_recorder.py <oturum_klasörü|dosya.tlog>")
+        sys.exit(1)
+    rec = FlightRecording(sys.argv[1])
+    for k, v in rec.summary().items():
+        print(f"{k:14}: {v}")
+    rec.close()
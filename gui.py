@@ -11,16 +11,22 @@ Hiçbir MAVLink/HTTP/Asyncio mantığı içermez.
 import sys
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QLabel, QGroupBox, QFrame, QTextEdit, QTabWidget
+    QLabel, QGroupBox, QFrame, QTabWidget
 )
 from PyQt5.QtCore import Qt, QTimer
+from functools import partial
 from constants import MsgType # Ortak sabitleri import et
 from gui_components.dashboard import DashboardWidget, ServerStatusComponent, PoseComponent, MiniTelemetryComponent, MiniRadarComponent
 from gui_components.flight_panel import FlightInfoWidget
 from gui_components.radar_widget import RadarWidget
 from gui_components.map_widget import MapWidget
-from gui_components.mavlink_thread import MavlinkPositionThread
+from gui_components.mavlink_thread import MavlinkPositionFeed
+from gui_components.diagnostics_widget import DiagnosticsWidget
+from gui_components.render_scheduler import RenderScheduler
+from gui_components.log_view import LogView
 from telemetry_store import telemetry_store
+from server_clock import server_clock
+from message_bus import message_bus
 
 class MainWindow(QMainWindow):
     """
@@ -37,25 +43,37 @@ class MainWindow(QMainWindow):
 
         self.qr_label_style_bekleniyor = "font-size: 24px; font-weight: bold; color: #9E9E9E; background-color: #424242; padding: 10px; border-radius: 5px;"
         self.qr_label_style_geldi = "font-size: 24px; font-weight: bold; color: #66BB6A; background-color: #333; padding: 10px; border-radius: 5px;"
-        
+
+        # Widget güncellemeleri sabit kare hızında ve yalnızca son durumla uygulanır
+        self.render = RenderScheduler(parent=self)
+
         self.initUI()
         
         self.mavlink_timer = QTimer(self)
         self.mavlink_timer.timeout.connect(self._on_mavlink_timeout)
         self.mavlink_timeout_ms = 3000 # 3 saniye
+
+        # Sunucu saati yerel tahminciden çizilir (HTTP trafiği gerekmez)
+        self._clock_styled = False
+        self.server_clock_timer = QTimer(self)
+        self.server_clock_timer.timeout.connect(self._render_server_clock)
+        self.server_clock_timer.start(50)
         
         # --- YENİ EKLENEN QR LABEL STİLLERİ ---
         self.qr_label_style_bekleniyor = "font-size: 24px; font-weight: bold; color: #9E9E9E; background-color: #424242; padding: 10px; border-radius: 5px;"
         self.qr_label_style_geldi = "font-size: 24px; font-weight: bold; color: #66BB6A; background-color: #333; padding: 10px; border-radius: 5px;"
         # --- BİTİŞ ---
 
-        self.dashboard = None  # Yeni ana modüler bileşen konteyneri
         self.suppress_unknown = {
             "SCALED_PRESSURE","SCALED_PRESSURE2","WIND","TERRAIN_REPORT","EKF_STATUS_REPORT","VIBRATION",
             "BATTERY_STATUS","RADIO_STATUS","AHRS","POWER_STATUS","MEMINFO","MISSION_CURRENT","SERVO_OUTPUT_RAW",
             "RC_CHANNELS","RC_CHANNELS_RAW","RAW_IMU","SCALED_IMU2","SCALED_IMU3"
         }
 
+        # Mesaj tipi başına işleyiciler veri yoluna kaydedilir (bkz. message_bus)
+        self._bus_tokens = []
+        self._subscribe_bus()
+
     def initUI(self):
         # Ana widget ve dikey layout
         central_widget = QWidget()
@@ -102,22 +120,18 @@ class MainWindow(QMainWindow):
         self.tabs.addTab(self.map_widget, "Görev Haritası")
         self.map_widget.load_dummy_mission()
         self.map_widget.start_mission_debug()
-        # MAVLink konum thread'i
-        self.mavlink_pos_thread = MavlinkPositionThread()
-        self.mavlink_pos_thread.position_update.connect(self._on_thread_position)
-        self.mavlink_pos_thread.start()
+        # MAVLink konum beslemesi (ortak hub aboneliği)
+        self.mavlink_pos_feed = MavlinkPositionFeed(self)
+        self.mavlink_pos_feed.position_update.connect(self._on_thread_position)
+        self.mavlink_pos_feed.start()
         
         # --- Tab 1: Ham Veri Logları ---
         log_widget = QWidget()
         log_layout = QHBoxLayout(log_widget)
         
-        self.mavlink_log_text = QTextEdit()
-        self.mavlink_log_text.setReadOnly(True)
-        self.mavlink_log_text.setPlaceholderText("Gelen MAVLink mesajları...")
-        
-        self.server_log_text = QTextEdit()
-        self.server_log_text.setReadOnly(True)
-        self.server_log_text.setPlaceholderText("Sunucu ve API mesajları...")
+        # Sınırlı halka tamponlu görünümler (IHA_LOG_LINES satır), tipe göre süzülebilir
+        self.mavlink_log_text = LogView("Gelen MAVLink mesajları...")
+        self.server_log_text = LogView("Sunucu ve API mesajları...")
         
         log_layout.addWidget(QGroupBox("MAVLink Log"), 1)
         log_layout.itemAt(0).widget().setLayout(QVBoxLayout())
@@ -128,6 +142,10 @@ class MainWindow(QMainWindow):
         log_layout.itemAt(1).widget().layout().addWidget(self.server_log_text)
 
         self.tabs.addTab(log_widget, "Veri Logları")
+
+        # Tanılama sekmesi (HTTP gecikme/boyut/durum histogramları)
+        self.diagnostics = DiagnosticsWidget()
+        self.tabs.addTab(self.diagnostics, "Tanılama")
         
         # --- YENİ EKLENEN TAB 2: QR HEDEF ---
         qr_widget = QWidget()
@@ -162,6 +180,8 @@ class MainWindow(QMainWindow):
         self.tabs.addTab(map_placeholder, "Harita")
 
         main_layout.addWidget(self.tabs, 1) # 1 = Esneme faktörü
+        # Gizli sekmede bekleyen çizimler sekme açılınca uygulanır
+        self.tabs.currentChanged.connect(self.render.wake)
         
         # 3. Bölüm: StatusBar
         self.statusBar().showMessage("Arayüz başlatıldı. Arka plan servisleri yükleniyor...")
@@ -174,192 +194,232 @@ class MainWindow(QMainWindow):
         return label
 
     def _set_status_label(self, label: QLabel, text: str, color: str, text_color: str = "white"):
-        label.setText(text)
-        label.setStyleSheet(f"background-color: {color}; color: {text_color}; font-weight: bold; padding: 6px;")
+        # Aynı değeri yeniden atamak stil/yerleşim hesabını boşuna tetikler
+        style = f"background-color: {color}; color: {text_color}; font-weight: bold; padding: 6px;"
+        if label.text() != text:
+            label.setText(text)
+        if label.styleSheet() != style:
+            label.setStyleSheet(style)
+
+    def _render_server_clock(self):
+        t = server_clock.server_time()
+        if t is None:
+            return
+        if not self._clock_styled:
+            self._set_status_label(self.server_time_label, self.server_time_label.text(), "#0288D1", "white")
+            self._clock_styled = True
+        u = server_clock.uncertainty or 0.0
+        self.server_time_label.setText(
+            f"Sunucu Saati: {t['saat']:02d}:{t['dakika']:02d}:{t['saniye']:02d}.{t['milisaniye']:03d} (±{u * 1000:.0f} ms)")
 
     def _on_mavlink_timeout(self):
         self._set_status_label(self.mavlink_status_label, "MAVLink: BAĞLANTI YOK", "#D32F2F")
         self.mavlink_timer.stop()
 
     def _on_thread_position(self, lat, lon, heading):
-        try:
-            if self.map_widget:
-                self.map_widget.update_drone_position(lat, lon, heading)
-            if self.radar_widget:
-                self.radar_widget.update_own_position(lat, lon)
-        except Exception:
-            pass
+        self._render_position(lat, lon, heading)
 
-    # --- main.py Tarafından Çağrılacak Ana İşleyici ---
+    def _render_position(self, lat, lon, heading=None):
+        """Harita ve radarda konumu günceller (kare başına bir kez, yalnızca görünürken)."""
+        if heading is not None:
+            self.render.mark("map.pos", partial(self.map_widget.update_drone_position, lat, lon, heading), self.map_widget)
+        self.render.mark("radar.pos", partial(self.radar_widget.update_own_position, lat, lon), self.radar_widget)
+
+    def _append_log(self, view, text: str, msg_type: str = None):
+        # Satır hemen tampona (ve açıksa dosyaya) girer; görünüm kare başına bir kez yazılır
+        view.append(text, msg_type)
+        self.render.mark(view, view.flush, view)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.render.wake()
+
+    # --- Mesaj Veri Yolu Abonelikleri (main.py yayınlar) ---
+
+    MAVLINK_TYPES = ("HEARTBEAT", "GLOBAL_POSITION_INT", "ATTITUDE", "SYS_STATUS", "VFR_HUD", "GPS_RAW_INT", "SYSTEM_TIME")
+    ADMIN_OK_TYPES = (MsgType.ADMIN_HSS_OK, MsgType.ADMIN_QR_OK, MsgType.ADMIN_STATS, MsgType.ADMIN_CLEAR_OK)
+
+    def _subscribe_bus(self):
+        """Her mesaj tipinin işleyicisini veri yoluna kaydeder."""
+        routes = (
+            (self._on_mavlink_link, self.MAVLINK_TYPES, "sync"),
+            # Log satırı yalnızca biriktirilir; metin kutusuna kare başına toplu yazılır
+            (self._on_mavlink_log, self.MAVLINK_TYPES, "sync"),
+            (self._on_status_update, (MsgType.STATUS_UPDATE,), "sync"),
+            (self._on_ws_clients, (MsgType.WS_CLIENTS,), "sync"),
+            (self._on_login_ok, (MsgType.SERVER_LOGIN_OK,), "sync"),
+            (self._on_login_error, (MsgType.SERVER_LOGIN_ERROR,), "sync"),
+            (self._on_auth_required, (MsgType.SERVER_AUTH_REQUIRED,), "sync"),
+            (self._on_server_time, (MsgType.SERVER_TIME,), "sync"),
+            (self._on_server_qr, (MsgType.SERVER_QR,), "sync"),
+            (self._on_server_hss, (MsgType.SERVER_HSS,), "sync"),
+            (self._on_telemetry_error, (MsgType.TELEMETRY_ERROR,), "sync"),
+            (self._on_admin_ok, self.ADMIN_OK_TYPES, "sync"),
+            (self._on_admin_error, (MsgType.ADMIN_ERROR,), "sync"),
+            (self._on_self_pose, (MsgType.SELF_POSE,), "sync"),
+            (self._on_teams_update, (MsgType.TEAMS_UPDATE,), "sync"),
+        )
+        self._handled_types = {MsgType.TELEMETRY_ACK}    # loglanmayanlar
+        for cb, types, mode in routes:
+            self._bus_tokens.append(message_bus.subscribe(cb, types=types, mode=mode, name=f"gui.{cb.__name__[4:]}"))
+            self._handled_types.update(types)
+        self._bus_tokens.append(message_bus.subscribe(self._on_unknown, priority=-10, name="gui.unknown"))
 
     def handle_backend_message(self, msg_dict: dict):
+        """Mesajı yalnızca bu pencerenin (ve dashboard'un) aboneliklerine iletir."""
+        message_bus.deliver(msg_dict, self._bus_tokens + self.dashboard.bus_tokens)
+
+    def _log_server(self, text: str, msg_type: str = None):
+        self._append_log(self.server_log_text, text, msg_type)
+
+    def _on_mavlink_link(self, msg_dict: dict):
+        if not self.mavlink_timer.isActive():
+            self._set_status_label(self.mavlink_status_label, "MAVLink: BAĞLANDI", "#4CAF50")
+        self.mavlink_timer.start(self.mavlink_timeout_ms)
+
+    def _on_mavlink_log(self, msg_dict: dict):
         msg_type = msg_dict.get("_type")
+        if msg_type == "GLOBAL_POSITION_INT":
+            lat = msg_dict.get('lat', 0) / 1e7
+            lon = msg_dict.get('lon', 0) / 1e7
+            alt = msg_dict.get('relative_alt', 0) / 1000.0
+            self._append_log(self.mavlink_log_text, f"[{msg_type}] Lat: {lat:.6f}, Lon: {lon:.6f}, Alt: {alt:.2f}m", msg_type)
+        elif msg_type == "ATTITUDE":
+            roll = msg_dict.get('roll', 0)
+            pitch = msg_dict.get('pitch', 0)
+            self._append_log(self.mavlink_log_text, f"[{msg_type}] Roll: {roll:.2f}, Pitch: {pitch:.2f}", msg_type)
+        elif msg_type != "HEARTBEAT":
+            self._append_log(self.mavlink_log_text, f"[{msg_type}] Alındı.", msg_type)
 
-        # Dashboard’a tüm mesajları ilet (önce)
-        if self.dashboard:
-            try:
-                self.dashboard.forward_message(msg_dict)
-            except Exception:
-                pass
-
-        mavlink_types = ["HEARTBEAT","GLOBAL_POSITION_INT","ATTITUDE","SYS_STATUS","VFR_HUD","GPS_RAW_INT","SYSTEM_TIME"]
-        if msg_type in mavlink_types:
-            if not self.mavlink_timer.isActive():
-                self._set_status_label(self.mavlink_status_label, "MAVLink: BAĞLANDI", "#4CAF50")
-            self.mavlink_timer.start(self.mavlink_timeout_ms)
-            
-            if msg_type == "GLOBAL_POSITION_INT":
-                lat = msg_dict.get('lat', 0) / 1e7
-                lon = msg_dict.get('lon', 0) / 1e7
-                alt = msg_dict.get('relative_alt', 0) / 1000.0
-                self.mavlink_log_text.append(f"[{msg_type}] Lat: {lat:.6f}, Lon: {lon:.6f}, Alt: {alt:.2f}m")
-            elif msg_type == "ATTITUDE":
-                roll = msg_dict.get('roll', 0)
-                pitch = msg_dict.get('pitch', 0)
-                self.mavlink_log_text.append(f"[{msg_type}] Roll: {roll:.2f}, Pitch: {pitch:.2f}")
-            elif msg_type != "HEARTBEAT":
-                 self.mavlink_log_text.append(f"[{msg_type}] Alındı.")
-            
-            self.mavlink_log_text.verticalScrollBar().setValue(self.mavlink_log_text.verticalScrollBar().maximum())
-            return
+    def _on_status_update(self, msg_dict: dict):
+        payload = msg_dict.get("payload", {})
+        if payload.get("connected"):
+            team = payload.get("team_number", "?")
+            self._set_status_label(self.server_status_label, f"Sunucu: BAĞLI (Takım #{team})", "#4CAF50")
+        else:
+            if "HATASI" not in self.server_status_label.text():
+                self._set_status_label(self.server_status_label, "Sunucu: BAĞLI DEĞİL", "#D32F2F")
+        hz = payload.get("telemetry_hz", 0)
+        color = "#4CAF50" if hz > 0.1 else "#FFA726"
+        self._set_status_label(self.telemetry_hz_label, f"Telemetri: {hz:.1f} Hz", color, "black")
+        self.render.mark("diagnostics", partial(self._render_diagnostics, payload), self.diagnostics)
+
+    def _render_diagnostics(self, payload: dict):
+        self.diagnostics.update_status(payload)
+        self.diagnostics.update_render(self.render.stats())
 
-        elif msg_type == MsgType.STATUS_UPDATE:
-            payload = msg_dict.get("payload", {})
-            if payload.get("connected"):
-                team = payload.get("team_number", "?")
-                self._set_status_label(self.server_status_label, f"Sunucu: BAĞLI (Takım #{team})", "#4CAF50")
-            else:
-                if "HATASI" not in self.server_status_label.text():
-                    self._set_status_label(self.server_status_label, "Sunucu: BAĞLI DEĞİL", "#D32F2F")
-            hz = payload.get("telemetry_hz", 0)
-            color = "#4CAF50" if hz > 0.1 else "#FFA726"
-            self._set_status_label(self.telemetry_hz_label, f"Telemetri: {hz:.1f} Hz", color, "black")
-            
-        elif msg_type == MsgType.WS_CLIENTS:
-            count = msg_dict.get("count", 0)
-            self._set_status_label(self.ws_status_label, f"WS: {count} İstemci", "#2196F3")
-
-        elif msg_type == MsgType.SERVER_LOGIN_OK:
-            team = msg_dict.get("takim_numarasi", "?")
-            self._set_status_label(self.server_status_label, f"Sunucu: GİRİŞ BAŞARILI (Takım #{team})", "#4CAF50")
-            self.server_log_text.append(f"GİRİŞ BAŞARILIDIR: {msg_dict.get('base_url')}")
-            
-        elif msg_type == MsgType.SERVER_LOGIN_ERROR:
-            self._set_status_label(self.server_status_label, "Sunucu: GİRİŞ HATASI", "#D32F2F")
-            self.server_log_text.append(f"SUNUCU GİRİŞ HATASI: {msg_dict.get('error')}")
-
-        elif msg_type == MsgType.SERVER_AUTH_REQUIRED:
-            self._set_status_label(self.server_status_label, "Sunucu: YETKİ GEREKLİ (Yeniden deneniyor...)", "#FFA726", "black")
-            self.server_log_text.append("Sunucu yetkisi kayboldu. Yeniden giriş denenecek.")
-            
-        elif msg_type == MsgType.SERVER_TIME:
-            payload = msg_dict.get('payload', {})
-            try:
-                saat = payload.get('saat', 0)
-                dakika = payload.get('dakika', 0)
-                saniye = payload.get('saniye', 0)
-                time_str = f"{saat:02d}:{dakika:02d}:{saniye:02d}"
+    def _on_ws_clients(self, msg_dict: dict):
+        count = msg_dict.get("count", 0)
+        self._set_status_label(self.ws_status_label, f"WS: {count} İstemci", "#2196F3")
+
+    def _on_login_ok(self, msg_dict: dict):
+        team = msg_dict.get("takim_numarasi", "?")
+        self._set_status_label(self.server_status_label, f"Sunucu: GİRİŞ BAŞARILI (Takım #{team})", "#4CAF50")
+        self._log_server(f"GİRİŞ BAŞARILIDIR: {msg_dict.get('base_url')}", MsgType.SERVER_LOGIN_OK)
+
+    def _on_login_error(self, msg_dict: dict):
+        self._set_status_label(self.server_status_label, "Sunucu: GİRİŞ HATASI", "#D32F2F")
+        self._log_server(f"SUNUCU GİRİŞ HATASI: {msg_dict.get('error')}", MsgType.SERVER_LOGIN_ERROR)
+
+    def _on_auth_required(self, msg_dict: dict):
+        self._set_status_label(self.server_status_label, "Sunucu: YETKİ GEREKLİ (Yeniden deneniyor...)", "#FFA726", "black")
+        self._log_server("Sunucu yetkisi kayboldu. Yeniden giriş denenecek.", MsgType.SERVER_AUTH_REQUIRED)
+
+    def _on_server_time(self, msg_dict: dict):
+        msg_type = msg_dict.get("_type")
+        payload = msg_dict.get('payload', {})
+        try:
+            saat = payload.get('saat', 0)
+            dakika = payload.get('dakika', 0)
+            saniye = payload.get('saniye', 0)
+            time_str = f"{saat:02d}:{dakika:02d}:{saniye:02d}"
+            # Tahminci varsa etiketi zamanlayıcı çizer (replay'de mesajdan güncellenir)
+            if server_clock.now() is None:
                 self._set_status_label(self.server_time_label, f"Sunucu Saati: {time_str}", "#0288D1", "white")
-                self.server_log_text.append(f"[{msg_type}] {time_str}")
-            except Exception as e:
-                self.server_log_text.append(f"[{msg_type}] Zaman formatı hatası: {e}")
-        
-        elif msg_type == MsgType.SERVER_QR:
-            payload = msg_dict.get('payload', {})
-            enlem = payload.get('qrEnlem')
-            boylam = payload.get('qrBoylam')
-
-            if enlem is not None and boylam is not None:
-                self.qr_enlem_label.setText(f"QR Enlem: {enlem}")
-                self.qr_boylam_label.setText(f"QR Boylam: {boylam}")
-                # Stilini "veri geldi" olarak güncelle
-                self.qr_enlem_label.setStyleSheet(self.qr_label_style_geldi)
-                self.qr_boylam_label.setStyleSheet(self.qr_label_style_geldi)
-            else:
-                self.qr_enlem_label.setText("QR Enlem: VERİ YOK")
-                self.qr_boylam_label.setText("QR Boylam: VERİ YOK")
-                # Stilini "bekleniyor" olarak ayarla
-                self.qr_enlem_label.setStyleSheet(self.qr_label_style_bekleniyor)
-                self.qr_boylam_label.setStyleSheet(self.qr_label_style_bekleniyor)
-            
-            # Veriyi ayrıca log sekmesine de yaz
-            self.server_log_text.append(f"[{msg_type}] Veri alındı: {payload}")
-
-        # HSS (artık QR'dan ayrı)
-        elif msg_type == MsgType.SERVER_HSS:
-            payload = msg_dict.get('payload', {})
-            hss_list = payload.get("hss_koordinat_bilgileri") if isinstance(payload, dict) else None
-            if hss_list is not None:
-                self.server_log_text.append(f"[{msg_type}] HSS adet: {len(hss_list)}")
-            else:
-                self.server_log_text.append(f"[{msg_type}] Veri alındı: {payload}")
-
-        elif msg_type == MsgType.TELEMETRY_ACK:
-            pass # Loglamıyoruz
-        
-        elif msg_type == MsgType.TELEMETRY_ERROR:
-            self.server_log_text.append(f"TELEMETRİ HATASI: {msg_dict.get('error')}")
-            
-        elif msg_type in (MsgType.ADMIN_HSS_OK, MsgType.ADMIN_QR_OK, MsgType.ADMIN_STATS, MsgType.ADMIN_CLEAR_OK):
-            self.server_log_text.append(f"ADMIN BAŞARILI: [{msg_type}] {msg_dict.get('payload')}")
-            
-        elif msg_type == MsgType.ADMIN_ERROR:
-            self.server_log_text.append(f"ADMIN HATASI: [{msg_type}] {msg_dict.get('error')}")
-
-        # SELF_POSE: Uçuş bilgileri panelini güncelle
-        elif msg_type == MsgType.SELF_POSE:
-            payload = msg_dict.get("payload", {})
-            telemetry_store.update(payload)
-            if getattr(self, "map_widget", None):
-                try:
-                    lat = payload.get("lat"); lon = payload.get("lon"); hdg = payload.get("yaw")
-                    if None not in (lat, lon, hdg):
-                        self.map_widget.update_drone_position(lat, lon, hdg)
-                except Exception: pass
-            if getattr(self, "radar_widget", None):
-                try:
-                    lat = payload.get("lat"); lon = payload.get("lon")
-                    if lat is not None and lon is not None:
-                        self.radar_widget.update_own_position(lat, lon)
-                except Exception: pass
-            self.server_log_text.append("[SELF_POSE] Güncellendi.")
-        
-        elif msg_type == MsgType.TEAMS_UPDATE:
-            raw_list = msg_dict.get("payload", [])
-            teams_dict = {}
-            for item in raw_list:
-                tno = item.get("takim_numarasi")
-                if tno is None:
-                    continue
-                teams_dict[f"takım_{tno}"] = {
-                    "lat": item.get("iha_enlem"),
-                    "lon": item.get("iha_boylam"),
-                    "alt": item.get("iha_irtifa"),
-                    "pitch": item.get("iha_dikilme"),
-                    "yaw": item.get("iha_yonelme"),
-                    "roll": item.get("iha_yatis"),
-                    "speed": item.get("iha_hizi"),
-                    "aktif": True
-                }
-            if getattr(self, "radar_widget", None):
-                try:
-                    self.radar_widget.update_teams_data(teams_dict)
-                except Exception:
-                    pass
-            self.server_log_text.append(f"[TEAMS_UPDATE] Takım sayısı: {len(teams_dict)}")
+            self._log_server(f"[{msg_type}] {time_str}", msg_type)
+        except Exception as e:
+            self._log_server(f"[{msg_type}] Zaman formatı hatası: {e}", msg_type)
+
+    def _on_server_qr(self, msg_dict: dict):
+        msg_type = msg_dict.get("_type")
+        payload = msg_dict.get('payload', {})
+        enlem = payload.get('qrEnlem')
+        boylam = payload.get('qrBoylam')
 
+        if enlem is not None and boylam is not None:
+            self.qr_enlem_label.setText(f"QR Enlem: {enlem}")
+            self.qr_boylam_label.setText(f"QR Boylam: {boylam}")
+            # Stilini "veri geldi" olarak güncelle
+            self.qr_enlem_label.setStyleSheet(self.qr_label_style_geldi)
+            self.qr_boylam_label.setStyleSheet(self.qr_label_style_geldi)
         else:
-            if msg_type in self.suppress_unknown:
-                pass
-            else:
-                self.server_log_text.append(f"Bilinmeyen sistem mesajı: {msg_type}")
+            self.qr_enlem_label.setText("QR Enlem: VERİ YOK")
+            self.qr_boylam_label.setText("QR Boylam: VERİ YOK")
+            # Stilini "bekleniyor" olarak ayarla
+            self.qr_enlem_label.setStyleSheet(self.qr_label_style_bekleniyor)
+            self.qr_boylam_label.setStyleSheet(self.qr_label_style_bekleniyor)
 
-        self.server_log_text.verticalScrollBar().setValue(self.server_log_text.verticalScrollBar().maximum())
+        # Veriyi ayrıca log sekmesine de yaz
+        self._log_server(f"[{msg_type}] Veri alındı: {payload}", msg_type)
+
+    # HSS (artık QR'dan ayrı)
+    def _on_server_hss(self, msg_dict: dict):
+        msg_type = msg_dict.get("_type")
+        payload = msg_dict.get('payload', {})
+        hss_list = payload.get("hss_koordinat_bilgileri") if isinstance(payload, dict) else None
+        if hss_list is not None:
+            self._log_server(f"[{msg_type}] HSS adet: {len(hss_list)}", msg_type)
+        else:
+            self._log_server(f"[{msg_type}] Veri alındı: {payload}", msg_type)
+
+    def _on_telemetry_error(self, msg_dict: dict):
+        self._log_server(f"TELEMETRİ HATASI: {msg_dict.get('error')}", MsgType.TELEMETRY_ERROR)
+
+    def _on_admin_ok(self, msg_dict: dict):
+        self._log_server(f"ADMIN BAŞARILI: [{msg_dict.get('_type')}] {msg_dict.get('payload')}", msg_dict.get("_type"))
+
+    def _on_admin_error(self, msg_dict: dict):
+        self._log_server(f"ADMIN HATASI: [{msg_dict.get('_type')}] {msg_dict.get('error')}", MsgType.ADMIN_ERROR)
+
+    # SELF_POSE: Uçuş bilgileri panelini güncelle
+    def _on_self_pose(self, msg_dict: dict):
+        payload = msg_dict.get("payload", {})
+        telemetry_store.update(payload)
+        lat = payload.get("lat"); lon = payload.get("lon"); hdg = payload.get("yaw")
+        if lat is not None and lon is not None:
+            self._render_position(lat, lon, hdg)
+        self._log_server("[SELF_POSE] Güncellendi.", MsgType.SELF_POSE)
+
+    def _on_teams_update(self, msg_dict: dict):
+        raw_list = msg_dict.get("payload", [])
+        teams_dict = {}
+        for item in raw_list:
+            tno = item.get("takim_numarasi")
+            if tno is None:
+                continue
+            teams_dict[f"takım_{tno}"] = {
+                "lat": item.get("iha_enlem"),
+                "lon": item.get("iha_boylam"),
+                "alt": item.get("iha_irtifa"),
+                "pitch": item.get("iha_dikilme"),
+                "yaw": item.get("iha_yonelme"),
+                "roll": item.get("iha_yatis"),
+                "speed": item.get("iha_hizi"),
+                "aktif": True
+            }
+        self.radar_widget.update_teams_data(teams_dict)
+        self._log_server(f"[TEAMS_UPDATE] Takım sayısı: {len(teams_dict)}", MsgType.TEAMS_UPDATE)
+
+    def _on_unknown(self, msg_dict: dict):
+        msg_type = msg_dict.get("_type")
+        if msg_type in self._handled_types or msg_type in self.suppress_unknown:
+            return
+        self._log_server(f"Bilinmeyen sistem mesajı: {msg_type}", msg_type)
 
     def closeEvent(self, event):
         try:
-            if hasattr(self, "mavlink_pos_thread") and self.mavlink_pos_thread.isRunning():
-                self.mavlink_pos_thread.stop()
+            if hasattr(self, "mavlink_pos_feed") and self.mavlink_pos_feed.isRunning():
+                self.mavlink_pos_feed.stop()
         except Exception:
             pass
         # Dashboard görevlerini sonlandır
@@ -368,4 +428,10 @@ class MainWindow(QMainWindow):
                 self.dashboard.shutdown()
         except Exception:
             pass
+        for token in self._bus_tokens:
+            message_bus.unsubscribe(token)
+        self._bus_tokens.clear()
+        self.render.stop()
+        self.mavlink_log_text.stop_export()
+        self.server_log_text.stop_export()
         super().closeEvent(event)
\ No newline at end of file
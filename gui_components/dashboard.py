@@ -2,8 +2,10 @@ from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QGroupBox
 from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtGui import QPainter, QPen, QBrush, QColor
 import asyncio
+import logging
 import time
 from telemetry_store import telemetry_store
+from message_bus import message_bus
 import math
 
 class BaseAsyncComponent:
@@ -41,6 +43,7 @@ class DashboardWidget(QWidget):
         self.loop = loop
         self._components = []
         self._tasks = []
+        self.bus_tokens = []     # bileşenlerin veri yolu abonelikleri
         self._layout = QVBoxLayout(self)
         self._layout.setSpacing(12)
 
@@ -50,6 +53,11 @@ class DashboardWidget(QWidget):
         box_layout.addWidget(component.widget)
         self._layout.addWidget(box)
         self._components.append(component)
+        # Mesaj işleyen bileşenler yalnızca ilgilendikleri tiplere abone olur
+        if type(component).handle_message is not BaseAsyncComponent.handle_message:
+            self.bus_tokens.append(message_bus.subscribe(
+                component.handle_message, types=component.interested_types or None,
+                priority=1, name=f"dashboard.{component.name}"))
         if component.async_update_interval and component.async_update_interval > 0:
             self._tasks.append(self.loop.create_task(self._run_periodic(component)))
 
@@ -59,24 +67,18 @@ class DashboardWidget(QWidget):
                 start = time.time()
                 try:
                     await component.async_update()
-                except Exception:
-                    pass
+                except Exception as e:
+                    logging.getLogger("DASHBOARD").error(f"{component.name} güncelleme hatası: {e}")
                 elapsed = time.time() - start
                 wait = max(0.01, component.async_update_interval - elapsed)
                 await asyncio.sleep(wait)
         except asyncio.CancelledError:
             pass
 
-    def forward_message(self, msg: dict):
-        t = msg.get("_type")
-        for c in self._components:
-            if (not c.interested_types) or (t in c.interested_types):
-                try:
-                    c.handle_message(msg)
-                except Exception:
-                    pass
-
     def shutdown(self):
+        for token in self.bus_tokens:
+            message_bus.unsubscribe(token)
+        self.bus_tokens.clear()
         for c in self._components:
             c.shutdown()
         for t in self._tasks:
@@ -128,7 +130,6 @@ class MiniTelemetryComponent(BaseAsyncComponent):
         self.label.setStyleSheet("font-size:14px; padding:4px; background:#1e1e1e; color:#e0e0e0;")
         layout = QVBoxLayout(self.widget)
         layout.addWidget(self.label)
-        self.interested_types = ["SELF_POSE"]
         telemetry_store.register(self._on_store_update)  # Yeni abonelik
 
     def _on_store_update(self, payload: dict):
@@ -150,10 +151,6 @@ class MiniTelemetryComponent(BaseAsyncComponent):
         yaw_str = fmt(y, "", True)
         self.label.setText(f"Batarya: {bat_str} | Hız: {hiz_str} | Roll: {roll_str} | Pitch: {pitch_str} | Yaw: {yaw_str}")
 
-    def handle_message(self, msg: dict):
-        # Artık kullanılmıyor; store üzerinden geliyor
-        pass
-
 class MiniRadarComponent(BaseAsyncComponent):
     def __init__(self):
         super().__init__("Mini Radar")
@@ -0,0 +1,149 @@
+from PyQt5.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QGroupBox, QTableWidget, QTableWidgetItem, QHeaderView
+)
+from PyQt5.QtCore import Qt
+
+
+def _fmt(v, suffix=""):
+    return "-" if v is None else f"{v:.1f}{suffix}" if isinstance(v, float) else f"{v}{suffix}"
+
+
+class DiagnosticsWidget(QWidget):
+    """
+    Tanılama sekmesi: STATUS_UPDATE içindeki HTTP istatistiklerini gösterir.
+    - Uç nokta başına gecikme (p50/p90/p99/max), yanıt boyutu, durum kodları
+    - Bağlantı yeniden kullanımı / kurma süresi (ağ), olay döngüsü gecikmesi (yerel)
+    - Telemetri uplink gecikmesi ve sunucu saati belirsizliği
+    - WS istemci başına abonelik, kuyruk derinliği, gecikme ve düşürülen/seyreltilen çerçeveler
+    - Mesaj veri yolu aboneleri: çağrı sayısı, süre ve hata sayaçları
+    - Arayüz çizim zamanlayıcısı: kare süresi, birleştirilen ve gizli sekmede ertelenen çizimler
+    """
+    COLUMNS = ("Uç nokta", "İstek", "p50 ms", "p90 ms", "p99 ms", "max ms", "Yanıt p50", "Durum kodları", "Hata/ZA")
+    WS_COLUMNS = ("İstemci", "Kodek", "Abonelik", "Kuyruk", "En yüksek", "Gönderilen", "kB", "Düşürülen", "Birleştirilen",
+                  "Seyreltilen", "Süzülen", "Gecikme p50", "p99", "max")
+    BUS_COLUMNS = ("Abone", "Mod", "Öncelik", "Çağrı", "Hata", "Toplam ms", "p50 ms", "p99 ms", "max ms", "Son hata")
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        layout = QVBoxLayout(self)
+
+        summary = QGroupBox("Özet")
+        row = QHBoxLayout(summary)
+        self.conn_label = QLabel("Bağlantı: -")
+        self.loop_label = QLabel("Döngü gecikmesi: -")
+        self.uplink_label = QLabel("Telemetri: -")
+        self.clock_label = QLabel("Sunucu saati: -")
+        self.render_label = QLabel("Çizim: -")
+        for lbl in (self.conn_label, self.loop_label, self.uplink_label, self.clock_label, self.render_label):
+            lbl.setTextInteractionFlags(Qt.TextSelectableByMouse)
+            row.addWidget(lbl)
+        layout.addWidget(summary)
+
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        box = QGroupBox("HTTP Uç Noktaları (son 60 sn)")
+        QVBoxLayout(box).addWidget(self.table)
+        layout.addWidget(box, 1)
+        self._rows = {}
+
+        self.ws_table = QTableWidget(0, len(self.WS_COLUMNS))
+        self.ws_table.setHorizontalHeaderLabels(self.WS_COLUMNS)
+        self.ws_table.verticalHeader().setVisible(False)
+        self.ws_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.ws_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.ws_table.horizontalHeader().setStretchLastSection(True)
+        self.ws_box = QGroupBox("WebSocket İstemcileri")
+        QVBoxLayout(self.ws_box).addWidget(self.ws_table)
+        layout.addWidget(self.ws_box, 1)
+
+        self.bus_table = QTableWidget(0, len(self.BUS_COLUMNS))
+        self.bus_table.setHorizontalHeaderLabels(self.BUS_COLUMNS)
+        self.bus_table.verticalHeader().setVisible(False)
+        self.bus_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.bus_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.bus_table.horizontalHeader().setStretchLastSection(True)
+        self.bus_box = QGroupBox("Mesaj Veri Yolu")
+        QVBoxLayout(self.bus_box).addWidget(self.bus_table)
+        layout.addWidget(self.bus_box, 1)
+
+    def update_status(self, payload: dict):
+        http = payload.get("http") or {}
+        conn = http.get("connect") or {}
+        self.conn_label.setText(
+            f"Bağlantı: {http.get('connections_created', 0)} yeni / {http.get('connections_reused', 0)} yeniden "
+            f"(oran {http.get('reuse_ratio', 0.0):.2f}), kurma p50 {_fmt(conn.get('p50_ms'), ' ms')}")
+        lag = payload.get("loop_lag") or {}
+        self.loop_label.setText(f"Döngü gecikmesi: p50 {_fmt(lag.get('p50_ms'), ' ms')} p99 {_fmt(lag.get('p99_ms'), ' ms')}")
+        up = (payload.get("telemetry_uplink") or {})
+        lat = up.get("latency") or {}
+        self.uplink_label.setText(
+            f"Telemetri: {_fmt(up.get('send_hz'), ' Hz')} p50 {_fmt(lat.get('p50_ms'), ' ms')} "
+            f"p99 {_fmt(lat.get('p99_ms'), ' ms')} yolda {up.get('inflight', 0)}")
+        clock = payload.get("server_clock") or {}
+        self.clock_label.setText(
+            f"Sunucu saati: ofset {_fmt(clock.get('offset_ms'), ' ms')} ±{_fmt(clock.get('uncertainty_ms'), ' ms')}")
+
+        for path, ep in sorted((http.get("endpoints") or {}).items()):
+            row = self._rows.get(path)
+            if row is None:
+                row = self._rows[path] = self.table.rowCount()
+                self.table.insertRow(row)
+            lat = ep.get("latency") or {}
+            size = ep.get("resp_size") or {}
+            status = ", ".join(f"{k}:{v}" for k, v in sorted((ep.get("status") or {}).items()))
+            values = (
+                path, ep.get("requests", 0),
+                _fmt(lat.get("p50_ms")), _fmt(lat.get("p90_ms")), _fmt(lat.get("p99_ms")), _fmt(lat.get("max_ms")),
+                _fmt(size.get("p50_b"), " B"), status, f"{ep.get('errors', 0)}/{ep.get('timeouts', 0)}",
+            )
+            self._set_row(self.table, row, values)
+
+        ws = payload.get("ws") or {}
+        clients = ws.get("per_client") or []
+        self.ws_box.setTitle(f"WebSocket İstemcileri (politika: {ws.get('policy', '-')}, "
+                             f"kuyruk {ws.get('queue_max', '-')}, kopan {ws.get('disconnected', 0)}, "
+                             f"tık {ws.get('tick_ms', '-')} ms, tıkta birleştirilen {ws.get('tick_coalesced', 0)}, "
+                             f"seq {ws.get('seq', '-')}, tekrar tamponu {ws.get('replay_depth', 0)}/{ws.get('replay_max', '-')}, "
+                             f"devam {ws.get('resumes', 0)} / yeniden eşitleme {ws.get('resyncs', 0)})")
+        self.ws_table.setRowCount(len(clients))
+        for row, c in enumerate(clients):
+            topics = c.get("topics")
+            subs = "tümü" if topics is None else ", ".join(
+                f"{k}@{hz}Hz" if hz else k for k, hz in sorted(topics.items())) or "-"
+            self._set_row(self.ws_table, row, (
+                c.get("address"), c.get("codec", "-") + (" +toplu" if c.get("batching") else ""), subs, c.get("depth"), c.get("high_water"), c.get("sent"),
+                f"{(c.get('bytes') or 0) / 1024.0:.1f}", c.get("dropped"),
+                c.get("coalesced"), c.get("downsampled"), c.get("filtered"), _fmt(c.get("lag_p50_ms"), " ms"), _fmt(c.get("lag_p99_ms"), " ms"),
+                _fmt(c.get("lag_max_ms"), " ms"),
+            ))
+
+        bus = payload.get("bus") or {}
+        subs = bus.get("subscribers") or []
+        self.bus_box.setTitle(f"Mesaj Veri Yolu (yayınlanan {bus.get('published', 0)}, abonesiz {bus.get('unrouted', 0)}, "
+                              f"ertelenen {bus.get('deferred_depth', 0)}, düşürülen {bus.get('deferred_dropped', 0)})")
+        self.bus_table.setRowCount(len(subs))
+        for row, b in enumerate(subs):
+            self._set_row(self.bus_table, row, (
+                b.get("name"), b.get("mode"), b.get("priority"), b.get("calls"), b.get("errors"),
+                _fmt(b.get("total_ms")), _fmt(b.get("p50_ms")), _fmt(b.get("p99_ms")), _fmt(b.get("max_ms")),
+                b.get("last_error") or "-",
+            ))
+
+    def update_render(self, stats: dict):
+        self.render_label.setText(
+            f"Çizim: {_fmt(stats.get('fps'), ' fps')} kare p99 {_fmt(stats.get('frame_p99_ms'), ' ms')}, "
+            f"birleştirilen {stats.get('coalesced', 0)}, gizli {stats.get('hidden_skips', 0)}")
+
+    @staticmethod
+    def _set_row(table, row: int, values):
+        for col, v in enumerate(values):
+            item = table.item(row, col)
+            text = str(v)
+            if item is None:
+                table.setItem(row, col, QTableWidgetItem(text))
+            elif item.text() != text:
+                item.setText(text)
@@ -0,0 +1,155 @@
+import collections
+import logging
+import os
+import time
+
+from PyQt5.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QPlainTextEdit, QComboBox, QCheckBox, QPushButton, QLabel, QFileDialog
+)
+
+ALL_TYPES = "Tümü"
+
+
+class LogView(QWidget):
+    """
+    Sınırlı log görünümü.
+    - Satırlar (tip, metin) halka tamponunda tutulur (en çok `max_lines`, IHA_LOG_LINES)
+    - Görünüm QPlainTextEdit + maximumBlockCount: yalnızca görünen satırlar çizilir,
+      bellek ve ekleme maliyeti uçuş boyunca sabit kalır
+    - append() yalnızca biriktirir; flush() bekleyenleri tek eklemeyle yazar
+      (çağrı sıklığını RenderScheduler belirler)
+    - Tipe göre süzme (görünüm tampondan yeniden kurulur), otomatik kaydırmayı duraklatma
+    - Dosyaya yazma: tampondaki satırlar ve sonrakiler gelir gelmez dosyaya akıtılır;
+      dışa aktarım için RAM'de ayrıca kopya tutulmaz
+    """
+    def __init__(self, placeholder: str = "", max_lines: int = None, parent=None):
+        super().__init__(parent)
+        if max_lines is None:
+            max_lines = int(os.getenv("IHA_LOG_LINES", "5000"))
+        self.max_lines = max(100, max_lines)
+        self._lines = collections.deque(maxlen=self.max_lines)      # (tip, metin)
+        self._pending = collections.deque(maxlen=self.max_lines)    # süzgeçten geçmiş, çizilmemiş metinler
+        self._types = set()
+        self._filter = None
+        self._export = None
+        self.total = 0
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        bar = QHBoxLayout()
+        self.filter_box = QComboBox()
+        self.filter_box.addItem(ALL_TYPES)
+        self.filter_box.currentTextChanged.connect(self._on_filter_changed)
+        self.autoscroll_box = QCheckBox("Otomatik kaydır")
+        self.autoscroll_box.setChecked(True)
+        self.autoscroll_box.toggled.connect(self._on_autoscroll_toggled)
+        self.export_button = QPushButton("Dosyaya yaz")
+        self.export_button.clicked.connect(self._on_export_clicked)
+        clear_button = QPushButton("Temizle")
+        clear_button.clicked.connect(self.clear)
+        self.count_label = QLabel("0 satır")
+        bar.addWidget(QLabel("Tip:"))
+        bar.addWidget(self.filter_box, 1)
+        bar.addWidget(self.autoscroll_box)
+        bar.addWidget(self.export_button)
+        bar.addWidget(clear_button)
+        bar.addWidget(self.count_label)
+        layout.addLayout(bar)
+
+        self.text = QPlainTextEdit()
+        self.text.setReadOnly(True)
+        self.text.setUndoRedoEnabled(False)
+        self.text.setMaximumBlockCount(self.max_lines)
+        self.text.setPlaceholderText(placeholder)
+        layout.addWidget(self.text, 1)
+
+    # --- Veri ---
+    def append(self, text: str, msg_type: str = None):
+        """Satırı tampona ekler; görünüme bir sonraki flush() ile yansır."""
+        self.total += 1
+        self._lines.append((msg_type, text))
+        if msg_type is not None and msg_type not in self._types:
+            self._types.add(msg_type)
+            self.filter_box.addItem(msg_type)
+        if self._filter is None or msg_type == self._filter:
+            self._pending.append(text)
+        if self._export is not None:
+            self._write_export(text)
+
+    def flush(self):
+        """Bekleyen satırları tek seferde görünüme yazar."""
+        if self._pending:
+            text = "\n".join(self._pending)
+            self._pending.clear()
+            self._insert(text)
+        self.count_label.setText(f"{len(self._lines)}/{self.max_lines} satır")
+
+    def _insert(self, text: str):
+        bar = self.text.verticalScrollBar()
+        keep = None if self.autoscroll_box.isChecked() else bar.value()
+        self.text.appendPlainText(text)
+        if keep is None:
+            bar.setValue(bar.maximum())
+        else:
+            bar.setValue(min(keep, bar.maximum()))
+
+    def lines(self, msg_type: str = None):
+        """Tampondaki satırlar (en eskiden yeniye)."""
+        return [t for k, t in self._lines if msg_type is None or k == msg_type]
+
+    def clear(self):
+        self._lines.clear()
+        self._pending.clear()
+        self.text.clear()
+        self.count_label.setText(f"0/{self.max_lines} satır")
+
+    # --- Süzme / kaydırma ---
+    def _on_filter_changed(self, name: str):
+        self._filter = None if name in ("", ALL_TYPES) else name
+        self._pending.clear()
+        self.text.clear()
+        text = "\n".join(self.lines(self._filter))
+        if text:
+            self._insert(text)
+
+    def _on_autoscroll_toggled(self, on: bool):
+        if on:
+            self.text.verticalScrollBar().setValue(self.text.verticalScrollBar().maximum())
+
+    # --- Dosyaya yazma ---
+    def start_export(self, path: str):
+        """Tampondaki satırları yazar ve sonraki satırları dosyaya akıtmaya başlar."""
+        self.stop_export()
+        self._export = open(path, "a", encoding="utf-8")
+        self._export.write(f"# {time.strftime('%Y-%m-%d %H:%M:%S')} log dışa aktarımı\n")
+        for _, text in self._lines:
+            self._export.write(text + "\n")
+        self.export_button.setText("Yazmayı durdur")
+
+    def stop_export(self):
+        if self._export is not None:
+            try:
+                self._export.close()
+            except OSError:
+                pass
+            self._export = None
+        self.export_button.setText("Dosyaya yaz")
+
+    def _write_export(self, text: str):
+        try:
+            self._export.write(text + "\n")
+        except OSError as e:
+            logging.getLogger("GUI").error(f"Log dosyasına yazılamadı: {e}")
+            self.stop_export()
+
+    def _on_export_clicked(self):
+        if self._export is not None:
+            self.stop_export()
+            return
+        path, _ = QFileDialog.getSaveFileName(self, "Logu dosyaya yaz", f"log_{time.strftime('%Y%m%d_%H%M%S')}.txt",
+                                              "Metin (*.txt);;Tümü (*)")
+        if path:
+            try:
+                self.start_export(path)
+            except OSError as e:
+                logging.getLogger("GUI").error(f"Log dosyası açılamadı: {e}")
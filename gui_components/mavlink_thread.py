@@ -1,54 +1,41 @@
 # -*- coding: utf-8 -*-
-from PyQt5.QtCore import QThread, pyqtSignal
-import math
+from PyQt5.QtCore import QObject, pyqtSignal
 
-try:
-    from pymavlink import mavutil
-except ImportError:
-    mavutil = None
+from mavlink_hub import mavlink_hub
 
-class MavlinkPositionThread(QThread):
+class MavlinkPositionFeed(QObject):
+    """
+    Harita/radar için konum beslemesi.
+    Kendi UDP bağlantısını açmaz; ortak MAVLink hub'ına GLOBAL_POSITION_INT
+    aboneliği ile bağlanır (paketler yalnızca bir kez çözülür).
+    """
     position_update = pyqtSignal(float, float, float)  # lat, lon, heading
-    def __init__(self, uri='udp:127.0.0.1:14555', parent=None):
+    def __init__(self, parent=None):
         super().__init__(parent)
-        self._uri = uri
-        self._running = True
-        self._conn = None
+        self._token = None
 
-    def run(self):
-        if mavutil is None:
-            return
+    def start(self):
+        if self._token is None:
+            self._token = mavlink_hub.subscribe(self._on_msg, types=("GLOBAL_POSITION_INT",))
+
+    def isRunning(self):
+        return self._token is not None
+
+    def _on_msg(self, msg):
         try:
-            self._conn = mavutil.mavlink_connection(self._uri, source_system=255)
-            while self._running:
-                msg = self._conn.recv_match(blocking=True, timeout=0.5)
-                if not msg:
-                    continue
-                mtype = msg.get_type()
-                if mtype == 'GLOBAL_POSITION_INT':
-                    try:
-                        lat = msg.lat / 1e7
-                        lon = msg.lon / 1e7
-                        rel_alt = msg.relative_alt / 1000.0
-                        # Heading türetme (cog yoksa yaw yok); burada vx,vy kullanılabilir.
-                        # Basit: heading = (msg.hdg / 100) if mevcut.
-                        heading = getattr(msg, 'hdg', None)
-                        if heading is not None:
-                            heading = (heading / 100.0) % 360.0
-                        else:
-                            heading = 0.0
-                        self.position_update.emit(lat, lon, heading)
-                    except Exception:
-                        pass
+            lat = msg.lat / 1e7
+            lon = msg.lon / 1e7
+            # Heading: hdg (cdeg) mevcutsa kullan, yoksa 0
+            heading = getattr(msg, 'hdg', None)
+            if heading is not None and heading != 65535:
+                heading = (heading / 100.0) % 360.0
+            else:
+                heading = 0.0
+            self.position_update.emit(lat, lon, heading)
         except Exception:
             pass
-        finally:
-            try:
-                if self._conn:
-                    self._conn.close()
-            except Exception:
-                pass
 
     def stop(self):
-        self._running = False
-        self.wait(1500)
+        if self._token is not None:
+            mavlink_hub.unsubscribe(self._token)
+            self._token = None
@@ -0,0 +1,103 @@
+import logging
+import os
+import time
+
+from PyQt5.QtCore import QObject, QTimer
+
+from metrics import LatencyHistogram
+
+_FRAME_BOUNDS_MS = (0.5, 1, 2, 5, 10, 16, 33, 50, 100)
+
+
+class RenderScheduler(QObject):
+    """
+    Kare hızı sınırlı arayüz güncelleyici.
+    Mesaj işleyiciler widget'lara doğrudan dokunmaz; anahtar başına son
+    çizim fonksiyonunu `mark()` ile bırakır. Sabit hızda (IHA_GUI_FPS,
+    varsayılan 20) çalışan tek zamanlayıcı, kirli anahtarların yalnızca
+    sonuncusunu uygular. Böylece 50 Hz gelen mesajlar saniyede en çok
+    `fps` çizime dönüşür ve qasync döngüsündeki ağ görevleri çizim
+    fırtınasıyla gecikmez.
+
+    `widget` verilen anahtarlar widget görünür değilken (gizli sekme)
+    çizilmez; kirli kalır ve sekme açılınca son durum uygulanır.
+    Yapacak iş kalmayınca zamanlayıcı durur.
+
+        scheduler.mark("map.pos", partial(map.update_drone_position, lat, lon, hdg), map)
+    """
+    def __init__(self, fps: float = None, parent=None):
+        super().__init__(parent)
+        if fps is None:
+            fps = float(os.getenv("IHA_GUI_FPS", "20"))
+        self.fps = min(60.0, max(1.0, fps))
+        self._dirty = {}        # {anahtar: (çizim, widget)}
+        self._timer = QTimer(self)
+        self._timer.setInterval(int(1000 / self.fps))
+        self._timer.timeout.connect(self._tick)
+        self.frame_hist = LatencyHistogram(window=60.0, bounds=_FRAME_BOUNDS_MS)
+        self.marks = 0
+        self.coalesced = 0          # çizilmeden üzerine yazılan güncellemeler
+        self.frames = 0
+        self.renders = 0
+        self.hidden_skips = 0       # gizli olduğu için ertelenen çizimler
+        self.errors = 0
+
+    def mark(self, key, render, widget=None):
+        """`key` için son çizimi kaydeder; bir sonraki karede uygulanır."""
+        self.marks += 1
+        if key in self._dirty:
+            self.coalesced += 1
+        self._dirty[key] = (render, widget)
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def wake(self):
+        """Gizli olduğu için bekleyen çizimleri yeniden dener (ör. sekme değişince)."""
+        if self._dirty and not self._timer.isActive():
+            self._timer.start()
+
+    def stop(self):
+        self._timer.stop()
+        self._dirty.clear()
+
+    def _tick(self):
+        pending, self._dirty = self._dirty, {}
+        held = {}
+        t0 = time.perf_counter()
+        for key, (render, widget) in pending.items():
+            if widget is not None and not widget.isVisible():
+                held[key] = (render, widget)
+                self.hidden_skips += 1
+                continue
+            try:
+                render()
+                self.renders += 1
+            except Exception as e:
+                self.errors += 1
+                logging.getLogger("GUI").error(f"Çizim hatası ({key}): {e}")
+        if len(held) < len(pending):
+            self.frames += 1
+            self.frame_hist.add((time.perf_counter() - t0) * 1000.0)
+        # Çizim sırasında işaretlenenler bekleyenlerden yenidir
+        fresh = self._dirty
+        held.update(fresh)
+        self._dirty = held
+        # Kalanlar yalnızca gizli widget'larsa boşuna uyanma; mark()/wake() yeniden başlatır
+        if not fresh:
+            self._timer.stop()
+
+    def stats(self) -> dict:
+        h = self.frame_hist.stats(buckets=False)
+        return {
+            "fps": self.fps,
+            "frames": self.frames,
+            "renders": self.renders,
+            "marks": self.marks,
+            "coalesced": self.coalesced,
+            "hidden_skips": self.hidden_skips,
+            "pending": len(self._dirty),
+            "errors": self.errors,
+            "frame_p50_ms": h["p50_ms"],
+            "frame_p99_ms": h["p99_ms"],
+            "frame_max_ms": h["max_ms"],
+        }
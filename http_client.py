@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+"""
+Ortak HTTP İstemcisi
+====================
+Giriş, telemetri, poller'lar ve admin çağrıları tek bir aiohttp oturumunu
+paylaşır:
+- ortak bağlantı havuzu (keep-alive) ve çerez kavanozu (giriş çerezi
+  telemetri isteklerine de gider)
+- uç nokta (path öneki) bazında eşzamanlılık sınırı ve zaman aşımı
+- TraceConfig ile bağlantı açma/yeniden kullanma istatistikleri ve
+  bağlantı kurma süresi
+- uç nokta başına kayan histogramlar: yanıt gecikmesi (başlıklar gelene
+  kadar; sunucu + ağ), istek/yanıt boyutu ve durum kodu sayıları
+
+    http_client.configure("/api/telemetri_gonder", concurrency=4, timeout=5)
+    async with http_client.request("POST", url, json=payload) as resp:
+        ...
+    http_client.stats()
+"""
+
+import asyncio
+import collections
+import contextlib
+import json
+import time
+from urllib.parse import urlsplit
+
+from metrics import LatencyHistogram, SIZE_BOUNDS_BYTES
+
+# HTTP İstemcisi (pip install aiohttp)
+try:
+    import aiohttp
+except Exception:
+    aiohttp = None
+
+
+class _EndpointPolicy:
+    __slots__ = ("concurrency", "timeout", "semaphore")
+
+    def __init__(self, concurrency=None, timeout=None):
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.semaphore = asyncio.Semaphore(concurrency) if concurrency else None
+
+
+class HttpClient:
+    def __init__(self, limit: int = 16, limit_per_host: int = 8, keepalive_timeout: float = 30.0,
+                 default_timeout: float = 10.0):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.default_timeout = default_timeout
+        self._session = None
+        self._policies = {}          # {path öneki: _EndpointPolicy}
+        self._prefixes = ()          # uzundan kısaya sıralı önekler
+        self._endpoints = {}         # {path: sayaçlar}
+        self.connections_created = 0
+        self.connections_reused = 0
+        self.requests = 0
+        self.in_flight = 0
+        self.connect_latency = LatencyHistogram()
+
+    # --- Yapılandırma ---
+    def configure(self, prefix: str, concurrency: int = None, timeout: float = None):
+        """`prefix` ile başlayan yollar için eşzamanlılık sınırı / zaman aşımı (sn)."""
+        self._policies[prefix] = _EndpointPolicy(concurrency, timeout)
+        self._prefixes = tuple(sorted(self._policies, key=len, reverse=True))
+
+    def _policy(self, path: str):
+        for prefix in self._prefixes:
+            if path.startswith(prefix):
+                return self._policies[prefix]
+        return None
+
+    def _endpoint(self, path: str) -> dict:
+        ep = self._endpoints.get(path)
+        if ep is None:
+            ep = self._endpoints[path] = {
+                "requests": 0, "in_flight": 0, "timeouts": 0, "errors": 0,
+                "latency": LatencyHistogram(),
+                "req_size": LatencyHistogram(bounds=SIZE_BOUNDS_BYTES, unit="b"),
+                "resp_size": LatencyHistogram(bounds=SIZE_BOUNDS_BYTES, unit="b"),
+                "status": collections.Counter(),
+            }
+        return ep
+
+    # --- Oturum ---
+    def _trace_config(self):
+        tc = aiohttp.TraceConfig()
+
+        async def on_create_start(session, ctx, params):
+            ctx.connect_t0 = time.monotonic()
+
+        async def on_create(session, ctx, params):
+            self.connections_created += 1
+            t0 = getattr(ctx, "connect_t0", None)
+            if t0 is not None:
+                self.connect_latency.add((time.monotonic() - t0) * 1000.0)
+
+        async def on_reuse(session, ctx, params):
+            self.connections_reused += 1
+        tc.on_connection_create_start.append(on_create_start)
+        tc.on_connection_create_end.append(on_create)
+        tc.on_connection_reuseconn.append(on_reuse)
+        return tc
+
+    def session(self):
+        """Paylaşılan oturumu döndürür (ilk çağrıda çalışan döngüde oluşturulur)."""
+        if aiohttp is None:
+            raise RuntimeError("aiohttp yüklü değil. (pip install aiohttp)")
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.limit, limit_per_host=self.limit_per_host,
+                                             keepalive_timeout=self.keepalive_timeout)
+            # unsafe=True: sunucu IP adresiyle erişildiğinde de çerezler saklanır
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                cookie_jar=aiohttp.CookieJar(unsafe=True),
+                timeout=aiohttp.ClientTimeout(total=self.default_timeout),
+                trace_configs=[self._trace_config()],
+            )
+        return self._session
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    # --- İstek ---
+    @contextlib.asynccontextmanager
+    async def request(self, method: str, url: str, **kwargs):
+        """Uç nokta politikasını uygulayarak istek yapar; yanıtı bağlam içinde verir."""
+        path = urlsplit(url).path or "/"
+        policy = self._policy(path)
+        ep = self._endpoint(path)
+        sem = policy.semaphore if policy is not None else None
+        acquired = counted = False
+        try:
+            if sem is not None:
+                await sem.acquire()
+                acquired = True
+            if policy is not None and policy.timeout and "timeout" not in kwargs:
+                kwargs["timeout"] = aiohttp.ClientTimeout(total=policy.timeout)
+            payload = kwargs.pop("json", None)
+            if payload is not None:
+                # Boyutu ölçmek için gövde burada serileştirilir (aiohttp de aynısını yapar);
+                # json=None aiohttp'deki gibi gövdesiz istektir
+                body = json.dumps(payload).encode("utf-8")
+                headers = dict(kwargs.get("headers") or {})
+                headers.setdefault("Content-Type", "application/json")
+                kwargs["headers"] = headers
+                kwargs["data"] = body
+                ep["req_size"].add(len(body))
+            self.requests += 1
+            self.in_flight += 1
+            ep["requests"] += 1
+            ep["in_flight"] += 1
+            counted = True
+            t0 = time.monotonic()
+            async with self.session().request(method, url, **kwargs) as resp:
+                ep["latency"].add((time.monotonic() - t0) * 1000.0)
+                ep["status"][resp.status] += 1
+                if resp.content_length is not None:
+                    ep["resp_size"].add(resp.content_length)
+                yield resp
+        except asyncio.TimeoutError:
+            ep["timeouts"] += 1
+            ep["status"]["timeout"] += 1
+            raise
+        except aiohttp.ClientError:
+            ep["errors"] += 1
+            ep["status"]["error"] += 1
+            raise
+        finally:
+            if counted:
+                self.in_flight -= 1
+                ep["in_flight"] -= 1
+            # Serileştirme hatası ya da iptal olsa da uç nokta kilidi bırakılır
+            if acquired:
+                sem.release()
+
+    def get(self, url: str, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def stats(self) -> dict:
+        total = self.connections_created + self.connections_reused
+        return {
+            "requests": self.requests,
+            "in_flight": self.in_flight,
+            "connections_created": self.connections_created,
+            "connections_reused": self.connections_reused,
+            "reuse_ratio": round(self.connections_reused / total, 3) if total else 0.0,
+            "connect": self.connect_latency.stats(buckets=False),
+            "endpoints": {p: self._endpoint_stats(ep) for p, ep in self._endpoints.items()},
+        }
+
+    @staticmethod
+    def _endpoint_stats(ep: dict) -> dict:
+        return {
+            "requests": ep["requests"],
+            "in_flight": ep["in_flight"],
+            "timeouts": ep["timeouts"],
+            "errors": ep["errors"],
+            "latency": ep["latency"].stats(),
+            "req_size": ep["req_size"].stats(buckets=False),
+            "resp_size": ep["resp_size"].stats(buckets=False),
+            "status": {str(k): v for k, v in ep["status"].items()},
+        }
+
+
+# Uygulama genelinde tek istemci
+http_client = HttpClient()
@@ -7,7 +7,7 @@ Bu dosya:
 - gui.py'den MainWindow'u yükler ve gösterir
 - .env dosyasındaki bilgilere göre sunucuya OTOMATİK giriş yapar
 - Tüm arka plan görevlerini (MAVLink, HTTP, WS) yönetir
-- Gelen tüm verileri işler ve gui.py'deki 'handle_backend_message'e iletir
+- Gelen tüm verileri message_bus'a yayınlar (kayıt, gui.py, dashboard ve WS abone olur)
 
 Kullanım:
     python main.py
@@ -22,14 +22,29 @@ import qasync
 from gui import MainWindow 
 from constants import MsgType
 from gui_components.login_window import LoginWindow
+from mavlink_hub import mavlink_hub
+from mavlink_filter import IngestFilter
+from telemetry_state import TelemetryState, POSITION_FIELDS, ATTITUDE_FIELDS
+from telemetry_decoder import DECODERS, decode_into
+from flight_recorder import FlightRecorder
+from replay import reader_from_env
+from telemetry_scheduler import UplinkScheduler
+from metrics import LatencyHistogram, LoopLagMonitor
+from http_client import http_client
+from telemetry_queue import TelemetryQueue
+from poll_scheduler import PollScheduler
+from server_clock import server_clock
+from ws_broadcast import ws_broadcaster
+from message_bus import message_bus
+from ws_codec import CODEC_NAME as WS_CODEC_NAME, SUBPROTOCOL as WS_SUBPROTOCOL
 
 # GEREKLİ KÜTÜPHANELER
-import functools
 import logging
 import os
 import time
 import json
-import math
+import hashlib
+from urllib.parse import parse_qs, urlsplit
 
 # --- Opsiyonel Kütüphaneler ---
 
@@ -69,59 +84,100 @@ _SERVER_STATE = {
 }
 
 # Telemetri derleme durumu (MAVLink → sunucu şeması)
-_TELEM_STATE = {
-    "lat": None, "lon": None, "alt": None,
-    "pitch": None, "roll": None, "yaw": None,
-    "speed": None, "battery": None, "autonomous": 0, "lock": 0,
-    "target": {"hedef_merkez_X": 0, "hedef_merkez_Y": 0, "hedef_genislik": 0, "hedef_yukseklik": 0},
-    "gps_time_ms": None
-}
+_TELEM_STATE = TelemetryState()
 _TELEM_METRICS = {
     "last_send": None,
     "window_start": time.time(),
-    "count": 0
+    "count": 0,
+    "seq": 0,           # son gönderilen isteğin sıra numarası
+    "applied_seq": 0,   # konum/saat bilgisi uygulanan en yeni yanıt
+    "stale_acks": 0,    # daha yeni bir yanıttan sonra gelen (uygulanmayan) yanıtlar
+    "inflight": 0,
+    "errors": 0,
+    "bad_bodies": 0,    # JSON olarak okunamayan yanıt gövdeleri (istek yine de sunucuya ulaşmıştır)
+    "link_up": False,   # son telemetri isteği başarılı mı (sakla-ilet kuyruğu için)
+    "gps_vs_server_ms": None,   # gönderilen gps_saati ile tahmini sunucu saati farkı
 }
-
-# WebSocket istemcileri
-_WS_CLIENTS = set()
+# İstek başına telemetri POST gecikmesi (ms)
+_TELEM_LATENCY = LatencyHistogram()
+# Olay döngüsü gecikmesi: HTTP yavaşlığı yerel mi, ağ/sunucu mu?
+_LOOP_LAG = LoopLagMonitor()
+
+# Ortak HTTP istemcisi: uç nokta bazında eşzamanlılık ve zaman aşımı (sn)
+http_client.configure("/api/giris", concurrency=1, timeout=10)
+http_client.configure("/api/telemetri_gonder", concurrency=4, timeout=5)
+http_client.configure("/api/sunucusaati", concurrency=1, timeout=3)
+http_client.configure("/api/hss_koordinatlari", concurrency=1, timeout=5)
+http_client.configure("/api/qr_koordinati", concurrency=1, timeout=5)
+http_client.configure("/admin/", concurrency=2, timeout=10)
+
+# Gönderilemeyen telemetri için sakla-ilet kuyruğu (IHA_TELEM_QUEUE, main() içinde açılır)
+_TELEM_QUEUE = None
+# Periyodik sunucu çekimleri (main() içinde oluşturulur)
+_POLL_SCHEDULER = None
+# Telemetri gönderim zamanlayıcısı (telemetry_sender içinde oluşturulur)
+_TELEM_SCHEDULER = None
+# Konum/duruş verisi bu süreden (sn) eskiyse sunucuya gönderilmez
+_TELEM_MAX_AGE = float(os.getenv("IHA_TELEM_MAX_AGE", "2.0"))
+
+# Uçuş kaydedici (main() içinde başlatılır)
+_RECORDER = None
+# Kayda alınan sunucu yanıtları
+_RECORDED_SERVER_TYPES = frozenset({MsgType.TEAMS_UPDATE, MsgType.SERVER_HSS, MsgType.SERVER_QR, MsgType.SERVER_TIME})
+
+# WebSocket istemcileri: ws_broadcaster (istemci başına kuyruk + yazıcı görev)
 _WS_SERVER = None
 
-# ANA MESAJ YÖNLENDİRİCİSİ (main() içinde tanımlanacak)
-_GLOBAL_ON_MESSAGE_HANDLER = None
-
 # --- WebSocket Sunucu Fonksiyonları ---
-async def _ws_handler(websocket, path):
-    _WS_CLIENTS.add(websocket)
+def _ws_options(websocket, path=None) -> dict:
+    """Bağlanırken istenenler: alt protokol ya da ?codec=bin1&batch=1&resume=<seq>&epoch=<e> sorgusu."""
+    if path is None:
+        path = getattr(getattr(websocket, "request", None), "path", "") or ""
+    query = parse_qs(urlsplit(path).query)
+    codec = query.get("codec", [None])[0]
+    if getattr(websocket, "subprotocol", None) == WS_SUBPROTOCOL:
+        codec = WS_CODEC_NAME
+    try: resume = int(query["resume"][0])
+    except (KeyError, ValueError): resume = None
+    return {
+        "codec": codec if codec in ("json", WS_CODEC_NAME) else None,
+        "batch": query.get("batch", ["0"])[0].lower() in ("1", "true", "on"),
+        "resume": resume,
+        "epoch": query.get("epoch", [None])[0],
+    }
+
+def _select_ws_subprotocol(connection, subprotocols):
+    # Alt protokol istemeyen istemciler de kabul edilir (JSON)
+    return WS_SUBPROTOCOL if WS_SUBPROTOCOL in subprotocols else None
+
+async def _ws_handler(websocket, path=None):
+    ws_broadcaster.add(websocket, **_ws_options(websocket, path))
     logger = logging.getLogger("WS")
     logger.info(f"Yeni WS istemci: {websocket.remote_address}")
+    message_bus.publish({"_type": MsgType.WS_CLIENTS, "count": len(ws_broadcaster)})
     try:
-        if callable(_GLOBAL_ON_MESSAGE_HANDLER):
-            _GLOBAL_ON_MESSAGE_HANDLER({"_type": MsgType.WS_CLIENTS, "count": len(_WS_CLIENTS)})
-    except Exception: pass
-    try:
-        async for _ in websocket: pass
+        # İstemciden gelen mesajlar abonelik istekleridir (bkz. ws_broadcast)
+        async for text in websocket:
+            reply = ws_broadcaster.handle_control(websocket, text)
+            if reply is not None:
+                ws_broadcaster.reply(websocket, reply)
     except Exception as e:
         logger.debug(f"WS istemci hatası: {e}")
     finally:
-        _WS_CLIENTS.discard(websocket)
+        ws_broadcaster.remove(websocket)
         logger.info("WS istemci ayrıldı")
-        try:
-            if callable(_GLOBAL_ON_MESSAGE_HANDLER):
-                _GLOBAL_ON_MESSAGE_HANDLER({"_type": MsgType.WS_CLIENTS, "count": len(_WS_CLIENTS)})
-        except Exception: pass
+        message_bus.publish({"_type": MsgType.WS_CLIENTS, "count": len(ws_broadcaster)})
 
-async def broadcast_ws(msg: dict):
-    if not _WS_CLIENTS: return
-    payload = json.dumps(msg, default=str)
-    dead = [ws for ws in list(_WS_CLIENTS) if not await ws.send(payload).exception()]
-    for ws in dead: _WS_CLIENTS.discard(ws)
+def broadcast_ws(msg: dict, arrival: float = None):
+    """Mesajı abone WS istemcilerinin kuyruklarına ekler (bloklamaz, görev açmaz)."""
+    ws_broadcaster.publish(msg, arrival)
 
 async def start_ws_server(host="localhost", port=8766):
     global _WS_SERVER
     if websockets is None:
         logging.getLogger("WS").info("websockets modülü yok. WS Sunucu pasif.")
         return
-    _WS_SERVER = await websockets.serve(_ws_handler, host, port)
+    _WS_SERVER = await websockets.serve(_ws_handler, host, port, select_subprotocol=_select_ws_subprotocol)
     logging.getLogger("WS").info(f"WS sunucu dinlemede: ws://{host}:{port}/")
 
 async def shutdown_ws_server():
@@ -196,30 +252,28 @@ async def server_login(base_url: str, username: str, password: str, on_message=N
         logger.error("aiohttp yüklü değil. (pip install aiohttp)")
         return None
 
-    timeout = aiohttp.ClientTimeout(total=10)
     try:
-        async with aiohttp.ClientSession(timeout=timeout) as session:
-            logger.info(f"Sunucuya giriş deneniyor: {base} kullanıcı={username}")
-            async with session.post(f"{base}/api/giris", json={"kadi": username, "sifre": password}) as resp:
-                if resp.status == 200:
-                    data = await resp.json(content_type=None)
-                    team_num = data.get("takim_numarasi")
-                    _SERVER_STATE["team_number"] = team_num
-                    _SERVER_STATE["base_url"] = base
-                    _SERVER_STATE["username"] = username
-                    msg = {"_type": MsgType.SERVER_LOGIN_OK, "base_url": base, "username": username, "takim_numarasi": team_num}
-                    if callable(on_message): on_message(msg)
-                    logger.info(f"Sunucu girişi başarılı. Takım #{team_num}")
-                    return team_num
-                else:
-                    text_body = await resp.text()
-                    try: err_json = await resp.json(content_type=None)
-                    except Exception: err_json = None
-                    err = err_json if err_json else {"status": resp.status, "text": text_body}
-                    msg = {"_type": MsgType.SERVER_LOGIN_ERROR, "base_url": base, "username": username, "error": err}
-                    if callable(on_message): on_message(msg)
-                    logger.warning(f"Giriş başarısız: {err}")
-                    return None
+        logger.info(f"Sunucuya giriş deneniyor: {base} kullanıcı={username}")
+        async with http_client.post(f"{base}/api/giris", json={"kadi": username, "sifre": password}) as resp:
+            if resp.status == 200:
+                data = await resp.json(content_type=None)
+                team_num = data.get("takim_numarasi")
+                _SERVER_STATE["team_number"] = team_num
+                _SERVER_STATE["base_url"] = base
+                _SERVER_STATE["username"] = username
+                msg = {"_type": MsgType.SERVER_LOGIN_OK, "base_url": base, "username": username, "takim_numarasi": team_num}
+                if callable(on_message): on_message(msg)
+                logger.info(f"Sunucu girişi başarılı. Takım #{team_num}")
+                return team_num
+            else:
+                text_body = await resp.text()
+                try: err_json = await resp.json(content_type=None)
+                except Exception: err_json = None
+                err = err_json if err_json else {"status": resp.status, "text": text_body}
+                msg = {"_type": MsgType.SERVER_LOGIN_ERROR, "base_url": base, "username": username, "error": err}
+                if callable(on_message): on_message(msg)
+                logger.warning(f"Giriş başarısız: {err}")
+                return None
     except aiohttp.ClientConnectorError as e:
         logger.error(f"Bağlantı Hatası: Sunucuya erişilemiyor. URL: {base} Hata: {e}")
         if callable(on_message): on_message({"_type": MsgType.SERVER_LOGIN_ERROR, "base_url": base, "username": username, "error": f"Bağlantı Hatası: {e}"})
@@ -231,139 +285,309 @@ async def server_login(base_url: str, username: str, password: str, on_message=N
         if callable(on_message): on_message({"_type": MsgType.SERVER_LOGIN_ERROR, "base_url": base, "username": username, "error": str(e)})
         return None
 
-async def telemetry_sender(on_message=None, interval: float = 0.5):
+async def telemetry_sender(on_message=None, interval: float = 0.5, max_inflight: int = None):
+    """
+    Telemetriyi kaymasız slotlarla (UplinkScheduler) gönderir: yalnızca yeni
+    sürümdeki ve taze (konum/duruş) anlık görüntüler gönderilir.
+    POST'lar boru hattı şeklinde gider: en fazla `max_inflight` istek aynı anda
+    yolda olabilir (IHA_TELEM_INFLIGHT, varsayılan 2); yavaş bir yanıt sonraki
+    slotu bekletmez. Her istek bir sıra numarası taşır; sıra dışı gelen
+    yanıtlarda konumBilgileri/sunucusaati yalnızca en yeni istekten uygulanır.
+    """
+    global _TELEM_SCHEDULER
     logger = logging.getLogger("TEL")
     if aiohttp is None:
         logger.info("aiohttp modülü yok. telemetri gönderimi pasif.")
         return
-    timeout = aiohttp.ClientTimeout(total=10)
+    if max_inflight is None:
+        max_inflight = max(1, int(os.getenv("IHA_TELEM_INFLIGHT", "2")))
     last_warn = 0
+    sched = UplinkScheduler(interval, max_silence=float(os.getenv("IHA_TELEM_KEEPALIVE", "1.0")))
+    _TELEM_SCHEDULER = sched
+    inflight = asyncio.Semaphore(max_inflight)
+    pending = set()
+
+    def to_gps_time(ms: int):
+        try:
+            sec, msec = divmod(int(ms), 1000)
+            tm = time.gmtime(sec)
+            return {"saat": tm.tm_hour, "dakika": tm.tm_min, "saniye": tm.tm_sec, "milisaniye": msec}
+        except Exception:
+            now = time.localtime()
+            return {"saat": now.tm_hour, "dakika": now.tm_min, "saniye": now.tm_sec, "milisaniye": int((time.time()*1000)%1000)}
+
+    async def read_body(resp, seq: int):
+        """
+        Yanıt gövdesini JSON olarak okur; okunamazsa None. Gövde hatası isteğin
+        akıbetini değiştirmez (kuyruğa alma kararı durum kodundan verilir).
+        """
+        try:
+            return await resp.json(content_type=None)
+        except (ValueError, aiohttp.ClientError) as e:
+            _TELEM_METRICS["bad_bodies"] += 1
+            logger.debug(f"Telemetri yanıt gövdesi okunamadı (#{seq}, HTTP {resp.status}): {e}")
+            return None
+
+    async def post_one(base: str, payload: dict, seq: int):
+        nonlocal last_warn
+        _TELEM_METRICS["inflight"] += 1
+        t0 = time.monotonic()
+        t_send = time.time()
+        try:
+            async with http_client.post(f"{base}/api/telemetri_gonder", json=payload, headers=build_headers()) as resp:
+                t_recv = time.time()
+                if resp.status == 200:
+                    # Sunucu örneği kabul etti: gövde bozuk olsa da yeniden gönderilmez
+                    ack = await read_body(resp, seq)
+                    if not isinstance(ack, dict):
+                        ack = {}
+                    latency_ms = (time.monotonic() - t0) * 1000.0
+                    # Sıra dışı yanıtlar da geçerli bir saat örneğidir
+                    if ack.get("sunucusaati"):
+                        server_clock.add_sample(t_send, t_recv, ack["sunucusaati"])
+                    # Yalnızca en yeni isteğin konum/saat bilgisi uygulanır
+                    if seq > _TELEM_METRICS["applied_seq"]:
+                        _TELEM_METRICS["applied_seq"] = seq
+                        konum_list = ack.get("konumBilgileri", [])
+                        if konum_list and callable(on_message):
+                            on_message({"_type": MsgType.TEAMS_UPDATE, "payload": konum_list})
+                        sunucusaati = ack.get("sunucusaati")
+                        if sunucusaati and callable(on_message):
+                            on_message({"_type": MsgType.SERVER_TIME, "payload": sunucusaati})
+                    else:
+                        _TELEM_METRICS["stale_acks"] += 1
+                    _TELEM_METRICS["link_up"] = True
+                    if callable(on_message):
+                        on_message({"_type": MsgType.TELEMETRY_ACK, "status": 200, "seq": seq, "latency_ms": round(latency_ms, 1)})
+                    now_ts = time.time()
+                    _TELEM_METRICS["last_send"] = now_ts
+                    _TELEM_METRICS["count"] += 1
+                    if (now_ts - _TELEM_METRICS["window_start"]) > 5.0:
+                        _TELEM_METRICS["window_start"] = now_ts
+                        _TELEM_METRICS["count"] = 0
+                elif resp.status == 400:
+                    # Geçersiz örnek: kuyruğa alınmaz, tekrar göndermek de reddedilir
+                    err = await read_body(resp, seq)
+                    if callable(on_message): on_message({"_type": MsgType.TELEMETRY_ERROR, "status": 400, "error": err, "seq": seq})
+                elif resp.status == 401:
+                    _enqueue_telemetry(payload)
+                    request_relogin("telemetri_gonder 401")
+                    if time.time() - last_warn > 5:
+                        logger.warning("401: Kimliksiz erişim. Yeniden giriş gerekli.")
+                        last_warn = time.time()
+                    if callable(on_message): on_message({"_type": MsgType.SERVER_AUTH_REQUIRED})
+                else:
+                    _enqueue_telemetry(payload)
+                    if callable(on_message): on_message({"_type": MsgType.TELEMETRY_ERROR, "status": resp.status, "seq": seq})
+            _TELEM_LATENCY.add((time.monotonic() - t0) * 1000.0)
+        except asyncio.CancelledError: raise
+        except Exception as e:
+            _TELEM_METRICS["errors"] += 1
+            _enqueue_telemetry(payload)
+            if time.time() - last_warn > 5:
+                logger.debug(f"Telemetri gönderim hatası (#{seq}): {e}")
+                last_warn = time.time()
+        finally:
+            _TELEM_METRICS["inflight"] -= 1
+            inflight.release()
+
     try:
-        logger.info(f"Telemetri gönderici başladı: {1.0/interval:.1f} Hz")
-        async with aiohttp.ClientSession(timeout=timeout) as session:
+        logger.info(f"Telemetri gönderici başladı: {1.0/interval:.1f} Hz, en fazla {max_inflight} eşzamanlı istek")
+        try:
             while True:
+                await sched.wait_slot(lambda: _TELEM_STATE.version)
+                # Tüm istekler yoldaysa biri bitene kadar bekle; anlık görüntü sonra alınır
+                await inflight.acquire()
+                started = False
                 base = (_SERVER_STATE.get("base_url") or "").rstrip("/")
                 try:
                     team = _SERVER_STATE.get("team_number")
                     if not team:
-                        await asyncio.sleep(interval)
                         continue
-                    
-                    required_data = (_TELEM_STATE["lat"], _TELEM_STATE["lon"], _TELEM_STATE["alt"], 
-                                     _TELEM_STATE["pitch"], _TELEM_STATE["roll"], _TELEM_STATE["yaw"], 
-                                     _TELEM_STATE["speed"], _TELEM_STATE["battery"])
+
+                    st = _TELEM_STATE.snapshot()
+                    required_data = (st.lat, st.lon, st.alt, st.pitch, st.roll, st.yaw, st.speed, st.battery)
                     if any(v is None for v in required_data):
-                        await asyncio.sleep(interval)
                         continue
+                    if not _TELEM_STATE.is_fresh(POSITION_FIELDS + ATTITUDE_FIELDS, _TELEM_MAX_AGE):
+                        sched.stale_skipped += 1
+                        if time.time() - last_warn > 5:
+                            logger.warning(f"Konum/duruş verisi {_TELEM_MAX_AGE:.1f} sn'den eski; telemetri gönderilmiyor.")
+                            last_warn = time.time()
+                        continue
+                    sched.mark_sent(st.version)
 
-                    def to_gps_time(ms: int):
-                        try:
-                            sec, msec = divmod(int(ms), 1000)
-                            tm = time.gmtime(sec)
-                            return {"saat": tm.tm_hour, "dakika": tm.tm_min, "saniye": tm.tm_sec, "milisaniye": msec}
-                        except Exception:
-                            now = time.localtime()
-                            return {"saat": now.tm_hour, "dakika": now.tm_min, "saniye": now.tm_sec, "milisaniye": int((time.time()*1000)%1000)}
-
-                    gps_ms = _TELEM_STATE["gps_time_ms"]
+                    gps_ms = st.gps_time_ms
                     gps_time = to_gps_time(gps_ms if gps_ms is not None else int(time.time()*1000))
+                    if gps_ms is not None:
+                        _TELEM_METRICS["gps_vs_server_ms"] = server_clock.error_of(int(gps_ms) % 86_400_000)
 
                     payload = {
                         "takim_numarasi": team,
-                        "iha_enlem": float(_TELEM_STATE["lat"]),
-                        "iha_boylam": float(_TELEM_STATE["lon"]),
-                        "iha_irtifa": float(_TELEM_STATE["alt"]),
-                        "iha_dikilme": float(_TELEM_STATE["pitch"]),
-                        "iha_yonelme": float(_TELEM_STATE["yaw"]),
-                        "iha_yatis": float(_TELEM_STATE["roll"]),
-                        "iha_hiz": float(_TELEM_STATE["speed"]),
-                        "iha_batarya": int(max(0, min(100, int(_TELEM_STATE["battery"])))),
-                        "iha_otonom": 1 if _TELEM_STATE.get("autonomous", 0) else 0,
-                        "iha_kilitlenme": 1 if _TELEM_STATE.get("lock", 0) else 0,
+                        "iha_enlem": float(st.lat),
+                        "iha_boylam": float(st.lon),
+                        "iha_irtifa": float(st.alt),
+                        "iha_dikilme": float(st.pitch),
+                        "iha_yonelme": float(st.yaw),
+                        "iha_yatis": float(st.roll),
+                        "iha_hiz": float(st.speed),
+                        "iha_batarya": int(max(0, min(100, int(st.battery)))),
+                        "iha_otonom": 1 if st.autonomous else 0,
+                        "iha_kilitlenme": 1 if st.lock else 0,
                         "gps_saati": gps_time
                     }
                     if payload["iha_kilitlenme"] == 1:
-                        payload.update(_TELEM_STATE.get("target", {}))
-
-                    async with session.post(f"{base}/api/telemetri_gonder", json=payload, headers=build_headers()) as resp:
-                        if resp.status == 200:
-                            ack = await resp.json(content_type=None)
-                            # KonumBilgileri ve sunucu saati çıkar
-                            konum_list = ack.get("konumBilgileri", [])
-                            if konum_list and callable(on_message):
-                                on_message({"_type": MsgType.TEAMS_UPDATE, "payload": konum_list})
-                            sunucusaati = ack.get("sunucusaati")
-                            if sunucusaati and callable(on_message):
-                                on_message({"_type": MsgType.SERVER_TIME, "payload": sunucusaati})
-                            if callable(on_message): on_message({"_type": MsgType.TELEMETRY_ACK, "status": 200})
-                            now_ts = time.time()
-                            _TELEM_METRICS["last_send"] = now_ts
-                            _TELEM_METRICS["count"] += 1
-                            if (now_ts - _TELEM_METRICS["window_start"]) > 5.0:
-                                _TELEM_METRICS["window_start"] = now_ts
-                                _TELEM_METRICS["count"] = 0
-                        elif resp.status == 400:
-                            err = await resp.json(content_type=None)
-                            if callable(on_message): on_message({"_type": MsgType.TELEMETRY_ERROR, "status": 400, "error": err})
-                        elif resp.status == 401:
-                            request_relogin("telemetri_gonder 401")
-                            if time.time() - last_warn > 5:
-                                logger.warning("401: Kimliksiz erişim. Yeniden giriş gerekli.")
-                                last_warn = time.time()
-                            if callable(on_message): on_message({"_type": MsgType.SERVER_AUTH_REQUIRED})
-                        else:
-                            if callable(on_message): on_message({"_type": MsgType.TELEMETRY_ERROR, "status": resp.status})
+                        payload.update(st.target or {})
+
+                    _TELEM_METRICS["seq"] += 1
+                    task = asyncio.ensure_future(post_one(base, payload, _TELEM_METRICS["seq"]))
+                    started = True
+                    pending.add(task)
+                    task.add_done_callback(pending.discard)
                 except asyncio.CancelledError: raise
                 except Exception as e:
                     if time.time() - last_warn > 5:
-                        logger.debug(f"Telemetri gönderim hatası: {e}")
+                        logger.debug(f"Telemetri hazırlama hatası: {e}")
                         last_warn = time.time()
-                await asyncio.sleep(interval)
+                finally:
+                    # İstek başlatılmadıysa yuva hemen geri verilir (başlatıldıysa post_one bırakır)
+                    if not started:
+                        inflight.release()
+        finally:
+            for task in list(pending):
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
     except asyncio.CancelledError:
         logging.getLogger("TEL").info("Telemetri gönderici iptal edildi")
         raise
 
-async def poll_server_data(endpoint: str, msg_type: str, on_message=None, interval: float = 2.0, require_login: bool = False):
-    """ Genel bir sunucu veri çekme (poller) fonksiyonu """
-    if aiohttp is None:
-        logging.getLogger("HTTP").info(f"aiohttp yok; {msg_type} poller pasif.")
+def _enqueue_telemetry(payload: dict):
+    """Gönderilemeyen örneği (kuyruk etkinse) diske yazar ve bağlantıyı kopuk işaretler."""
+    _TELEM_METRICS["link_up"] = False
+    if _TELEM_QUEUE is None:
         return
-    logger = logging.getLogger("HTTP")
-    timeout = aiohttp.ClientTimeout(total=10)
-    last_warn = 0
     try:
-        async with aiohttp.ClientSession(timeout=timeout) as session:
-            while True:
-                base = (_SERVER_STATE.get("base_url") or "").rstrip("/")
-                if require_login and not _SERVER_STATE.get("team_number"):
-                    await asyncio.sleep(interval) # Giriş yapılana kadar bekle
-                    continue
-                try:
-                    async with session.get(f"{base}{endpoint}", headers=build_headers()) as resp:
-                        if resp.status == 200:
-                            data = await resp.json(content_type=None)
-                            if callable(on_message):
-                                on_message({"_type": msg_type, "payload": data, "_endpoint": endpoint})
-                        elif resp.status == 401 and require_login:
-                            if callable(on_message): on_message({"_type": MsgType.SERVER_AUTH_REQUIRED})
-                            request_relogin(f"{endpoint} 401")
-                            if time.time() - last_warn > 5:
-                                logger.warning(f"{msg_type} 401: Giriş gerekli")
-                                last_warn = time.time()
+        _TELEM_QUEUE.put(payload)
+    except Exception as e:
+        logging.getLogger("TELQ").debug(f"Kuyruğa yazma hatası: {e}")
+
+async def telemetry_flusher(queue, rate: float = None, batch: int = 20):
+    """
+    Sakla-ilet kuyruğunu boşaltır: canlı telemetri tekrar başarılı olunca
+    örnekler en yeniden başlayarak `batch`'lik gruplar halinde, en fazla
+    `rate` istek/sn ile gönderilir (IHA_TELEM_FLUSH_RATE, varsayılan 10).
+    """
+    logger = logging.getLogger("TELQ")
+    if rate is None:
+        rate = float(os.getenv("IHA_TELEM_FLUSH_RATE", "10"))
+    period = 1.0 / max(0.1, rate)
+    try:
+        while True:
+            await asyncio.sleep(0.5)
+            if not queue.depth() or not _TELEM_METRICS["link_up"] or not _SERVER_STATE.get("team_number"):
+                continue
+            base = (_SERVER_STATE.get("base_url") or "").rstrip("/")
+            done = []
+            try:
+                for row_id, payload in queue.take_newest(batch):
+                    async with http_client.post(f"{base}/api/telemetri_gonder", json=payload, headers=build_headers()) as resp:
+                        # 400: örnek geçersiz, tekrar denemek anlamsız; kuyruktan çıkar
+                        if resp.status in (200, 400):
+                            done.append(row_id)
                         else:
-                            if time.time() - last_warn > 5:
-                                logger.debug(f"{msg_type} HTTP {resp.status}")
-                                last_warn = time.time()
-                except asyncio.CancelledError: raise
-                except Exception as e:
-                    if time.time() - last_warn > 5:
-                        logger.debug(f"{msg_type} hata: {e}")
-                        last_warn = time.time()
-                await asyncio.sleep(interval)
+                            _TELEM_METRICS["link_up"] = False
+                            break
+                    await asyncio.sleep(period)
+            except asyncio.CancelledError: raise
+            except Exception as e:
+                _TELEM_METRICS["link_up"] = False
+                logger.debug(f"Kuyruk boşaltma hatası: {e}")
+            finally:
+                queue.ack(done)
+            if done:
+                logger.info(f"Kuyruktan {len(done)} telemetri örneği gönderildi (kalan {queue.depth()})")
     except asyncio.CancelledError:
-        logging.getLogger("HTTP").info(f"{msg_type} poller iptal edildi")
+        logger.info("Telemetri kuyruğu boşaltıcı iptal edildi")
         raise
 
+# Her yanıtta değişen, içerik değişikliği sayılmayan alanlar (ör. HSS yanıtındaki sunucu saati)
+_POLL_VOLATILE_KEYS = frozenset({"sunucusaati"})
+
+def _payload_digest(payload) -> bytes:
+    """Yanıt içeriğinin özeti: oynak alanlar hariç, anahtar sırasından bağımsız."""
+    if isinstance(payload, dict):
+        payload = {k: v for k, v in payload.items() if k not in _POLL_VOLATILE_KEYS}
+    data = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+async def poll_fetch(ep, on_message=None):
+    """
+    PollScheduler için tek bir sunucu çekimi. Değişmeyen yanıtlar iletilmez:
+    sunucu ETag/Last-Modified veriyorsa koşullu istek (304), vermiyorsa önce
+    ham gövde özeti karşılaştırılır; gövde farklıysa ve oynak alan
+    (sunucusaati) içeriyorsa bu alanlar çıkarılmış içerik özeti kullanılır.
+    Dönüş: True (değişti), False (değişmedi), None (hata).
+    """
+    logger = logging.getLogger("HTTP")
+    base = (_SERVER_STATE.get("base_url") or "").rstrip("/")
+    headers = build_headers()
+    if ep.etag:
+        headers["If-None-Match"] = ep.etag
+    if ep.last_modified:
+        headers["If-Modified-Since"] = ep.last_modified
+    t_send = time.time()
+    try:
+        async with http_client.get(f"{base}{ep.path}", headers=headers) as resp:
+            t_recv = time.time()
+            ep.fetched += 1
+            if resp.status == 304:
+                ep.not_modified += 1
+                return False
+            if resp.status == 200:
+                ep.etag = resp.headers.get("ETag")
+                ep.last_modified = resp.headers.get("Last-Modified")
+                body = await resp.read()
+                payload = None
+                if ep.msg_type == MsgType.SERVER_TIME:
+                    payload = json.loads(body)
+                    server_clock.add_sample(t_send, t_recv, payload)
+                # Hızlı yol: aynı gövde ayrıştırılmadan elenir
+                raw = hashlib.blake2b(body, digest_size=16).digest()
+                if raw == ep.raw_digest:
+                    ep.duplicates += 1
+                    return False
+                ep.raw_digest = raw
+                if payload is None:
+                    payload = json.loads(body)
+                if isinstance(payload, dict) and not _POLL_VOLATILE_KEYS.isdisjoint(payload):
+                    digest = _payload_digest(payload)
+                else:
+                    digest = raw
+                if digest == ep.digest:
+                    ep.duplicates += 1
+                    return False
+                ep.digest = digest
+                ep.changed += 1
+                msg = {"_type": ep.msg_type, "payload": payload, "_endpoint": ep.path}
+                ep.last = msg
+                if callable(on_message):
+                    on_message(msg)
+                return True
+            if resp.status == 401 and ep.require_login:
+                if callable(on_message): on_message({"_type": MsgType.SERVER_AUTH_REQUIRED})
+                request_relogin(f"{ep.path} 401")
+                if ep.failures == 0:
+                    logger.warning(f"{ep.msg_type} 401: Giriş gerekli")
+            elif ep.failures == 0:
+                logger.debug(f"{ep.msg_type} HTTP {resp.status}")
+            return None
+    except asyncio.CancelledError: raise
+    except Exception as e:
+        if ep.failures == 0:
+            logger.debug(f"{ep.msg_type} hata: {e}")
+        return None
+
 # --- Admin API Çağrıları (UI tarafından tetiklenir) ---
 async def _admin_api_call(endpoint: str, method: str, payload: dict, on_message=None, ok_msg_type: str = "ADMIN_OK"):
     logger = logging.getLogger("ADMIN")
@@ -378,16 +602,15 @@ async def _admin_api_call(endpoint: str, method: str, payload: dict, on_message=
         return
     
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.request(method, f"{base}{endpoint}", json=payload, headers=build_headers(admin=True)) as resp:
-                if resp.status == 200:
-                    data = await resp.json(content_type=None)
-                    if callable(on_message): on_message({"_type": ok_msg_type, "payload": data})
-                else:
-                    try: err = await resp.json(content_type=None)
-                    except Exception: err = {"status": resp.status}
-                    if resp.status == 403: logger.warning("Admin yetkisiz (403).")
-                    if callable(on_message): on_message({"_type": MsgType.ADMIN_ERROR, "error": err, "action": endpoint})
+        async with http_client.request(method, f"{base}{endpoint}", json=payload, headers=build_headers(admin=True)) as resp:
+            if resp.status == 200:
+                data = await resp.json(content_type=None)
+                if callable(on_message): on_message({"_type": ok_msg_type, "payload": data})
+            else:
+                try: err = await resp.json(content_type=None)
+                except Exception: err = {"status": resp.status}
+                if resp.status == 403: logger.warning("Admin yetkisiz (403).")
+                if callable(on_message): on_message({"_type": MsgType.ADMIN_ERROR, "error": err, "action": endpoint})
     except asyncio.CancelledError: raise
     except Exception as e:
         logger.debug(f"Admin çağrı hatası ({endpoint}): {e}")
@@ -423,54 +646,41 @@ class AdminAPI:
         ))
 
 # --- MAVLink Dinleyici ---
-async def mavlink_listener(uri: str = 'udp:127.0.0.1:14555', on_message=None):
+async def mavlink_listener(uri: str = 'udp:127.0.0.1:14555', on_message=None, ingest_filter=None, reader=None):
+    """
+    Ortak MAVLink hub'ını çalıştırır (reader verilirse, ör. ReplayReader, canlı bağlantı yerine onu kullanır).
+    - Telemetri durumu ilgili tipleri tam hızda, çözücü tablosu üzerinden alır.
+    - on_message (GUI + WS) yalnızca ingest_filter'dan geçen mesajları, dict olarak alır.
+    """
     logger = logging.getLogger("MAVLink")
-    if mavutil is None:
-        logger.info("pymavlink yok; MAVLink dinleyici pasif. (pip install pymavlink)")
-        return
-    loop = asyncio.get_event_loop()
-    logger.info(f"MAVLink bağlantısı deneniyor: {uri}")
+
+    def _to_dict(msg):
+        try: data = msg.to_dict()
+        except Exception: data = {}
+        data["_type"] = msg.get_type()
+        data["_sysid"] = msg.get_srcSystem()    # WS tık birleştirmesi tip+sistem başına
+        return data
+
+    def _update_state(msg):
+        try:
+            if decode_into(msg, _TELEM_STATE) and _TELEM_SCHEDULER is not None:
+                _TELEM_SCHEDULER.notify()
+        except Exception as e: logging.getLogger("TEL").debug(f"Telemetri state güncelle hatası: {e}")
+
+    tokens = [mavlink_hub.subscribe(_update_state, types=tuple(DECODERS), name="telem_state")]
+    if callable(on_message):
+        def _forward(msg):
+            try: on_message(_to_dict(msg))
+            except Exception as e: logger.error(f"UI handler hatası: {e}")
+        tokens.append(mavlink_hub.subscribe(_forward, ingest_filter=ingest_filter, name="gui_ws"))
     try:
-        conn = mavutil.mavlink_connection(uri, source_system=255)
-        logger.info("Bağlantı açıldı, ilk mesaj (heartbeat) bekleniyor...")
-        get_msg = functools.partial(conn.recv_match, blocking=True, timeout=1.0)
-        last_stat = time.time()
-        stat_count = 0
-        while True:
-            msg = await loop.run_in_executor(None, get_msg)
-            now = time.time()
-            if not msg or msg.get_type() == 'BAD_DATA':
-                if (now - last_stat) > 5 and stat_count == 0:
-                    logger.warning(f"MAVLink verisi gelmiyor. {uri} adresini kontrol edin.")
-                    last_stat = now
-                continue
-            
-            if stat_count == 0:
-                logger.info("İlk MAVLink mesajı alındı!")
-            stat_count += 1
-            
-            msg_type = msg.get_type()
-            try: data = msg.to_dict()
-            except Exception: data = {}
-            data["_type"] = msg_type
-
-            if callable(on_message):
-                try: on_message(data)
-                except Exception as e: logger.error(f"UI handler hatası: {e}")
-            
-            if (now - last_stat) > 5:
-                logger.debug(f"Son 5 sn'de {stat_count} MAVLink mesajı alındı.")
-                last_stat = now
-                stat_count = 0
-    except asyncio.CancelledError:
-        logger.info("MAVLink dinleyici iptal edildi")
-        raise
-    except Exception as e:
-        logger.error(f"MAVLink bağlantı hatası: {e}")
+        if reader is not None:
+            await mavlink_hub.run_reader(reader)
+        else:
+            await mavlink_hub.run(uri)
     finally:
-        try: conn.close()
-        except Exception: pass
-        logger.info("MAVLink bağlantısı kapatıldı")
+        for token in tokens:
+            mavlink_hub.unsubscribe(token)
 
 # --- Periyodik Durum Yayıncıları ---
 async def status_publisher(on_message=None, interval: float = 1.0):
@@ -486,11 +696,32 @@ async def status_publisher(on_message=None, interval: float = 1.0):
                 payload = {
                     "server_url": _SERVER_STATE.get("base_url"),
                     "team_number": _SERVER_STATE.get("team_number"),
-                    "ws_clients": len(_WS_CLIENTS),
+                    "ws_clients": len(ws_broadcaster),
                     "telemetry_hz": round(hz, 2),
                     "telemetry_last": time.strftime("%H:%M:%S", time.localtime(last_ts)) if last_ts else None,
+                    "telemetry_state_version": _TELEM_STATE.version,
                     "connected": bool(_SERVER_STATE.get("team_number"))
                 }
+                if _TELEM_SCHEDULER is not None:
+                    uplink = _TELEM_SCHEDULER.stats()
+                    uplink.update({k: _TELEM_METRICS[k] for k in ("seq", "applied_seq", "stale_acks", "inflight", "errors", "bad_bodies")})
+                    uplink["latency"] = _TELEM_LATENCY.stats()
+                    payload["telemetry_uplink"] = uplink
+                payload["mavlink"] = mavlink_hub.stats()
+                payload["http"] = http_client.stats()
+                payload["loop_lag"] = _LOOP_LAG.stats()
+                payload["ws"] = ws_broadcaster.stats()
+                payload["bus"] = message_bus.stats()
+                clock = server_clock.stats()
+                g = _TELEM_METRICS.get("gps_vs_server_ms")
+                clock["gps_vs_server_ms"] = round(g, 1) if g is not None else None
+                payload["server_clock"] = clock
+                if _POLL_SCHEDULER is not None:
+                    payload["polling"] = _POLL_SCHEDULER.stats()
+                if _TELEM_QUEUE is not None:
+                    payload["telemetry_queue"] = _TELEM_QUEUE.stats()
+                if _RECORDER is not None:
+                    payload["recorder"] = _RECORDER.stats()
                 if callable(on_message):
                     on_message({"_type": MsgType.STATUS_UPDATE, "payload": payload})
             except asyncio.CancelledError: raise
@@ -503,17 +734,24 @@ async def status_publisher(on_message=None, interval: float = 1.0):
 async def self_pose_publisher(on_message=None, interval: float = 1.0):
     """ Periyodik kendi İHA pozunu yayınlar (harita katmanına uygun) """
     logger = logging.getLogger("POSE")
+    last_version = -1
     try:
         while True:
             try:
+                st = _TELEM_STATE.snapshot()
+                if st.version == last_version:
+                    # Yeni MAVLink verisi yok; yeniden yayınlamaya gerek yok
+                    await asyncio.sleep(interval)
+                    continue
+                last_version = st.version
                 data = {
-                    "lat": _TELEM_STATE.get("lat"), "lon": _TELEM_STATE.get("lon"),
-                    "alt": _TELEM_STATE.get("alt"), "yaw": _TELEM_STATE.get("yaw"),
-                    "pitch": _TELEM_STATE.get("pitch"), "roll": _TELEM_STATE.get("roll"),
-                    "speed": _TELEM_STATE.get("speed"), "battery": _TELEM_STATE.get("battery"),
-                    "autonomous": _TELEM_STATE.get("autonomous"),
-                    "lock": _TELEM_STATE.get("lock"),
-                    "gps_time_ms": _TELEM_STATE.get("gps_time_ms")
+                    "lat": st.lat, "lon": st.lon,
+                    "alt": st.alt, "yaw": st.yaw,
+                    "pitch": st.pitch, "roll": st.roll,
+                    "speed": st.speed, "battery": st.battery,
+                    "autonomous": st.autonomous,
+                    "lock": st.lock,
+                    "gps_time_ms": st.gps_time_ms
                 }
                 if not any(v is None for v in [data["lat"], data["lon"], data["alt"], data["yaw"]]):
                     msg = {"_type": MsgType.SELF_POSE, "payload": data}
@@ -559,48 +797,12 @@ def main():
         asyncio.set_event_loop(loop)
         
         main_window = None  # Başta yok
-        # --- Ana Mesaj İşleyici (_on_msg) ---
-        def _on_msg(msg_dict):
-            # MAVLink verilerini al, işle ve _TELEM_STATE'i güncelle
-            try:
-                t = msg_dict.get("_type")
-                if t == "GLOBAL_POSITION_INT":
-                    if msg_dict.get("lat") is not None: _TELEM_STATE["lat"] = float(msg_dict.get("lat")) / 1e7
-                    if msg_dict.get("lon") is not None: _TELEM_STATE["lon"] = float(msg_dict.get("lon")) / 1e7
-                    if msg_dict.get("relative_alt") is not None: _TELEM_STATE["alt"] = float(msg_dict.get("relative_alt")) / 1000.0
-                    vx = msg_dict.get("vx"); vy = msg_dict.get("vy")
-                    if vx is not None and vy is not None: _TELEM_STATE["speed"] = max(0.0, math.sqrt(float(vx)**2 + float(vy)**2) / 100.0)
-                elif t == "ATTITUDE":
-                    if msg_dict.get("roll") is not None: _TELEM_STATE["roll"] = math.degrees(float(msg_dict.get("roll")))
-                    if msg_dict.get("pitch") is not None: _TELEM_STATE["pitch"] = math.degrees(float(msg_dict.get("pitch")))
-                    if msg_dict.get("yaw") is not None: _TELEM_STATE["yaw"] = (math.degrees(float(msg_dict.get("yaw"))) + 360.0) % 360.0
-                elif t == "SYS_STATUS":
-                    if msg_dict.get("battery_remaining") is not None: _TELEM_STATE["battery"] = int(msg_dict.get("battery_remaining"))
-                elif t == "HEARTBEAT":
-                    if msg_dict.get("base_mode") is not None: _TELEM_STATE["autonomous"] = 1 if (int(msg_dict.get("base_mode")) & (1 << 4)) else 0
-                elif t == "SYSTEM_TIME":
-                    if msg_dict.get("time_unix_usec") is not None: _TELEM_STATE["gps_time_ms"] = int(int(msg_dict.get("time_unix_usec")) / 1000)
-                elif t == "GPS_RAW_INT":
-                    if msg_dict.get("time_usec") is not None: _TELEM_STATE["gps_time_ms"] = int(int(msg_dict.get("time_usec")) / 1000)
-                    if msg_dict.get("vel") is not None: _TELEM_STATE["speed"] = max(0.0, float(msg_dict.get("vel")) / 100.0)
-                    if msg_dict.get("cog") is not None: _TELEM_STATE["yaw"] = (float(msg_dict.get("cog")) / 100.0) % 360.0
-                elif t == "VFR_HUD":
-                    if msg_dict.get("groundspeed") is not None: _TELEM_STATE["speed"] = max(0.0, float(msg_dict.get("groundspeed")))
-                    if msg_dict.get("alt") is not None: _TELEM_STATE["alt"] = float(msg_dict.get("alt"))
-                    if msg_dict.get("heading") is not None: _TELEM_STATE["yaw"] = float(msg_dict.get("heading")) % 360.0
-            except Exception as e:
-                logging.getLogger("TEL").debug(f"Telemetri state güncelle hatası: {e}")
-
-            # 1. Mesajı Arayüze İlet (sadece main_window hazırsa)
-            if main_window is not None:
-                try:
-                    main_window.handle_backend_message(msg_dict)
-                except Exception as e:
-                    logger.error(f"GUI handler (handle_backend_message) hatası: {e}")
-            
-            # 2. Mesajı WebSocket istemcilerine yayınla
-            if websockets is not None:
-                asyncio.get_event_loop().create_task(broadcast_ws(msg_dict))
+        # --- Ana Mesaj Yolu (message_bus) ---
+        # Sıra önceliğe göre: uçuş kaydı (100) → dashboard (1) → arayüz (0) → WebSocket (-100).
+        # Arayüz aboneleri MainWindow oluşturulunca kaydolur; öncesindeki mesajlar yalnızca kayda ve WS'e gider.
+        on_msg = message_bus.publish
+        if websockets is not None:
+            message_bus.subscribe(broadcast_ws, priority=-100, name="ws")
 
         # Login sonrası ana pencereyi oluşturan fonksiyon
         def _create_main_window():
@@ -610,50 +812,93 @@ def main():
             main_window = MainWindow(loop)
             main_window.show()
             logger.info("Arayüz (gui.py) login sonrası yüklendi.")
-            main_window.admin_api = AdminAPI(loop, on_message=lambda m: _on_msg(m))
+            main_window.admin_api = AdminAPI(loop, on_message=on_msg)
             logger.info("Admin API proxy eklendi.")
+            # Poller'lar yalnızca değişiklikleri iletir: pencere açılmadan gelen son veriyi göster
+            for ep in (_POLL_SCHEDULER.endpoints.values() if _POLL_SCHEDULER is not None else ()):
+                if ep.last is not None:
+                    main_window.handle_backend_message(ep.last)
+
+        # Kayıttan oynatma (IHA_REPLAY): canlı MAVLink ve sunucu trafiği yerine kayıt kullanılır
+        replay_reader = reader_from_env(loop, on_server=on_msg)
+        if replay_reader is not None:
+            logger.info(f"REPLAY modu: {replay_reader.source} (sunucu bağlantısı ve kayıt kapalı)")
+
+        # Uçuş kaydı (IHA_RECORD=0 ile kapatılabilir)
+        global _RECORDER
+        if replay_reader is None and os.getenv("IHA_RECORD", "1").lower() not in ("0", "false", "off"):
+            try:
+                _RECORDER = FlightRecorder(os.getenv("IHA_RECORD_DIR", "recordings"))
+                _RECORDER.start()
+                message_bus.subscribe(_RECORDER.record_server, types=_RECORDED_SERVER_TYPES, priority=100, name="recorder")
+                mavlink_hub.set_tap(_RECORDER.record_mavlink_msg)
+                app.aboutToQuit.connect(_RECORDER.close)
+            except Exception as e:
+                logger.error(f"Uçuş kaydı başlatılamadı: {e}")
+                _RECORDER = None
 
         # Login penceresini aç
         login_window = LoginWindow(on_success=_create_main_window)
         login_window.show()
         logger.info("Login ekranı gösterildi. Giriş bekleniyor...")
 
-        # Global işleyici kaydı
-        global _GLOBAL_ON_MESSAGE_HANDLER
-        _GLOBAL_ON_MESSAGE_HANDLER = _on_msg
-
         # Sunucu otomatik giriş (.env) login öncesi başlayabilir
         server_url = os.getenv("IHA_SERVER_URL")
         server_user = os.getenv("IHA_SERVER_USER")
         server_pass = os.getenv("IHA_SERVER_PASS")
-        if server_user and server_pass and server_url:
-            login_task = loop.create_task(server_login(server_url, server_user, server_pass, on_message=_on_msg))
+        if replay_reader is not None:
+            logger.info("REPLAY modu: sunucu girişi atlandı.")
+        elif server_user and server_pass and server_url:
+            login_task = loop.create_task(server_login(server_url, server_user, server_pass, on_message=on_msg))
             app.aboutToQuit.connect(login_task.cancel)
         else:
             logger.error("Sunucu girişi atlandı: .env IHA_SERVER_URL/USER/PASS eksik.")
-            _on_msg({"_type": MsgType.SERVER_LOGIN_ERROR, "error": ".env eksik veya hatalı."})
+            on_msg({"_type": MsgType.SERVER_LOGIN_ERROR, "error": ".env eksik veya hatalı."})
 
         # Arka plan görevleri (MainWindow henüz yoksa GUI iletimi atlanır)
-        mav_task = loop.create_task(mavlink_listener('udp:127.0.0.1:14555', on_message=_on_msg))
+        mav_task = loop.create_task(mavlink_listener('udp:127.0.0.1:14555', on_message=on_msg, ingest_filter=IngestFilter.from_env(), reader=replay_reader))
         app.aboutToQuit.connect(mav_task.cancel)
-        tel_task = loop.create_task(telemetry_sender(on_message=_on_msg, interval=0.5))
-        app.aboutToQuit.connect(tel_task.cancel)
-        status_task = loop.create_task(status_publisher(on_message=_on_msg, interval=1.0))
-        pose_task = loop.create_task(self_pose_publisher(on_message=_on_msg, interval=1.0))
+        status_task = loop.create_task(status_publisher(on_message=on_msg, interval=1.0))
+        lag_task = loop.create_task(_LOOP_LAG.run())
+        app.aboutToQuit.connect(lag_task.cancel)
+        pose_task = loop.create_task(self_pose_publisher(on_message=on_msg, interval=1.0))
         app.aboutToQuit.connect(status_task.cancel)
         app.aboutToQuit.connect(pose_task.cancel)
-        time_task = loop.create_task(poll_server_data("/api/sunucusaati", MsgType.SERVER_TIME, _on_msg, interval=2.0, require_login=False))
-        hss_task = loop.create_task(poll_server_data("/api/hss_koordinatlari", MsgType.SERVER_HSS, _on_msg, interval=3.0, require_login=True))
-        qr_task = loop.create_task(poll_server_data("/api/qr_koordinati", MsgType.SERVER_QR, _on_msg, interval=5.0, require_login=True))
-        app.aboutToQuit.connect(time_task.cancel)
-        app.aboutToQuit.connect(hss_task.cancel)
-        app.aboutToQuit.connect(qr_task.cancel)
         global _AUTH_RELOGIN_EVENT
         _AUTH_RELOGIN_EVENT = asyncio.Event()
-        auth_task = loop.create_task(auth_watcher(on_message=_on_msg))
-        app.aboutToQuit.connect(auth_task.cancel)
+        # Sunucu görevleri (replay modunda sunucu yanıtları kayıttan gelir)
+        if replay_reader is None:
+            tel_task = loop.create_task(telemetry_sender(on_message=on_msg, interval=0.5))
+            app.aboutToQuit.connect(tel_task.cancel)
+            # Sakla-ilet kuyruğu (IHA_TELEM_QUEUE=1 veya dosya yolu ile açılır)
+            global _TELEM_QUEUE
+            try:
+                _TELEM_QUEUE = TelemetryQueue.from_env()
+            except Exception as e:
+                logger.error(f"Telemetri kuyruğu açılamadı: {e}")
+                _TELEM_QUEUE = None
+            if _TELEM_QUEUE is not None:
+                flush_task = loop.create_task(telemetry_flusher(_TELEM_QUEUE))
+                app.aboutToQuit.connect(flush_task.cancel)
+                app.aboutToQuit.connect(_TELEM_QUEUE.close)
+            # Periyodik sunucu çekimleri: tek zamanlayıcı, genel istek bütçesi (IHA_POLL_BUDGET istek/sn)
+            global _POLL_SCHEDULER
+            _POLL_SCHEDULER = PollScheduler(lambda ep: poll_fetch(ep, on_msg),
+                                            budget=float(os.getenv("IHA_POLL_BUDGET", "3")))
+            logged_in = lambda: bool(_SERVER_STATE.get("team_number"))
+            # Sunucu saati telemetri yanıtlarından izlenir; yalnızca senkron değilken sorgulanır
+            _POLL_SCHEDULER.register("/api/sunucusaati", MsgType.SERVER_TIME, 2.0, when=lambda: not server_clock.synced)
+            _POLL_SCHEDULER.register("/api/hss_koordinatlari", MsgType.SERVER_HSS, 3.0, min_interval=1.0, max_interval=10.0,
+                                     when=logged_in, require_login=True)
+            _POLL_SCHEDULER.register("/api/qr_koordinati", MsgType.SERVER_QR, 5.0, min_interval=2.0, max_interval=15.0,
+                                     when=logged_in, require_login=True)
+            poll_task = loop.create_task(_POLL_SCHEDULER.run())
+            app.aboutToQuit.connect(poll_task.cancel)
+            auth_task = loop.create_task(auth_watcher(on_message=on_msg))
+            app.aboutToQuit.connect(auth_task.cancel)
         loop.create_task(start_ws_server("localhost", 8766))
         app.aboutToQuit.connect(lambda: asyncio.get_event_loop().create_task(shutdown_ws_server()))
+        app.aboutToQuit.connect(lambda: asyncio.get_event_loop().create_task(http_client.close()))
         # --- Ana Döngüyü Başlat ---
         logger.info("Tüm servisler başlatıldı. Ana event loop çalışıyor...")
         with loop:
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+MAVLink Alım Filtresi
+=====================
+Mesajlar `to_dict()` ile sözlüğe çevrilmeden önce tip bazında düşürülür
+veya seyreltilir (decimation). Her hub abonesi kendi filtresini taşıyabilir;
+böylece örn. ATTITUDE GUI'ye 10 Hz ile, telemetri durumuna tam hızda gider.
+
+Ortam değişkenleri (opsiyonel, GUI/WS yolu için):
+    IHA_MAV_DROP="RAW_IMU,SERVO_OUTPUT_RAW"
+    IHA_MAV_RATES="ATTITUDE=10,GLOBAL_POSITION_INT=10"
+"""
+
+import os
+import time
+
+# GUI'nin zaten göstermediği (MainWindow.suppress_unknown) yüksek hızlı tipler
+DEFAULT_GUI_DROP = frozenset({
+    "SCALED_PRESSURE", "SCALED_PRESSURE2", "WIND", "TERRAIN_REPORT", "EKF_STATUS_REPORT", "VIBRATION",
+    "BATTERY_STATUS", "RADIO_STATUS", "AHRS", "AHRS2", "POWER_STATUS", "MEMINFO", "MISSION_CURRENT",
+    "SERVO_OUTPUT_RAW", "RC_CHANNELS", "RC_CHANNELS_RAW", "RAW_IMU", "SCALED_IMU2", "SCALED_IMU3",
+    "NAV_CONTROLLER_OUTPUT", "LOCAL_POSITION_NED", "HWSTATUS", "SIMSTATE", "TIMESYNC",
+})
+
+# GUI/WS için azami mesaj hızları (Hz)
+DEFAULT_GUI_RATES = {
+    "ATTITUDE": 10.0,
+    "GLOBAL_POSITION_INT": 10.0,
+    "VFR_HUD": 5.0,
+    "GPS_RAW_INT": 5.0,
+    "SYS_STATUS": 2.0,
+    "SYSTEM_TIME": 1.0,
+}
+
+
+class IngestFilter:
+    """
+    Tip bazlı düşürme + hız sınırlama.
+    - drop: hiç iletilmeyecek mesaj tipleri
+    - max_rates: {tip: Hz}; listede olmayan tipler tam hızda geçer
+    """
+    def __init__(self, drop=(), max_rates=None):
+        self.drop = frozenset(drop)
+        self._min_dt = {t: 1.0 / hz for t, hz in (max_rates or {}).items() if hz and hz > 0}
+        self._last_pass = {}
+        self._counters = {}     # {tip: [geçen, düşürülen, seyreltilen]}
+
+    @classmethod
+    def from_env(cls, drop=DEFAULT_GUI_DROP, max_rates=None):
+        """Varsayılanları IHA_MAV_DROP / IHA_MAV_RATES ile genişletir."""
+        drop = set(drop)
+        rates = dict(DEFAULT_GUI_RATES if max_rates is None else max_rates)
+        for name in (os.getenv("IHA_MAV_DROP") or "").split(","):
+            if name.strip():
+                drop.add(name.strip().upper())
+        for item in (os.getenv("IHA_MAV_RATES") or "").split(","):
+            if "=" not in item:
+                continue
+            name, hz = item.split("=", 1)
+            try:
+                rates[name.strip().upper()] = float(hz)
+            except ValueError:
+                continue
+        return cls(drop, rates)
+
+    def accept(self, msg_type: str, now: float = None) -> bool:
+        """Mesaj iletilecekse True döner; sayaçları günceller."""
+        c = self._counters.get(msg_type)
+        if c is None:
+            c = self._counters[msg_type] = [0, 0, 0]
+        if msg_type in self.drop:
+            c[1] += 1
+            return False
+        min_dt = self._min_dt.get(msg_type)
+        if min_dt is not None:
+            if now is None:
+                now = time.time()
+            last = self._last_pass.get(msg_type)
+            if last is not None and (now - last) < min_dt:
+                c[2] += 1
+                return False
+            self._last_pass[msg_type] = now
+        c[0] += 1
+        return True
+
+    def stats(self) -> dict:
+        """Tip başına sayaçlar ve toplam kaçınılan iş (dict dönüşümü + dağıtım)."""
+        per_type = {t: {"passed": c[0], "dropped": c[1], "decimated": c[2]} for t, c in self._counters.items()}
+        passed = sum(c[0] for c in self._counters.values())
+        avoided = sum(c[1] + c[2] for c in self._counters.values())
+        return {"passed": passed, "avoided": avoided, "types": per_type}
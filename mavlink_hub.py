@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+"""
+MAVLink Bağlantı Merkezi (Hub)
+==============================
+Uygulamadaki tek MAVLink bağlantısını sahiplenir. Her paket yalnızca bir
+kez çözülür ve abonelere (telemetri durumu, GUI, harita, WS) dağıtılır.
+
+Abonelik:
+    token = mavlink_hub.subscribe(callback, types=("GLOBAL_POSITION_INT",))
+    token = mavlink_hub.subscribe(callback, ingest_filter=IngestFilter(...), name="gui")
+    mavlink_hub.unsubscribe(token)
+
+Filtre verilen aboneler için mesaj, callback'e ulaşmadan (dolayısıyla
+`to_dict()` dönüşümünden önce) düşürülebilir veya seyreltilebilir.
+
+Callback'ler event loop thread'inde (qasync ile Qt ana thread'i) çağrılır
+ve pymavlink mesaj nesnesini alır.
+"""
+
+import asyncio
+import logging
+import time
+
+from mavlink_reader import MavlinkReader
+
+try:
+    from pymavlink import mavutil
+except Exception:
+    mavutil = None
+
+
+class MavlinkHub:
+    def __init__(self):
+        self._by_type = {}      # {mesaj_tipi: ((callback, filtre), ...)}
+        self._wildcard = ()     # Tüm mesajları isteyen aboneler
+        self._next_token = 1
+        self._tokens = {}       # {token: (abone, types, isim)}
+        self._reader = None
+        self._tap = None
+        self._uri = None
+        self._dispatched = 0
+        self._handler_errors = 0
+
+    # --- Abonelik ---
+    def subscribe(self, callback, types=None, ingest_filter=None, name: str = None) -> int:
+        """
+        callback(msg) kaydeder. types verilmezse tüm mesajları alır.
+        ingest_filter (IngestFilter) verilirse mesaj önce filtreden geçer.
+        """
+        token = self._next_token
+        self._next_token += 1
+        types = tuple(types) if types else None
+        sub = (callback, ingest_filter)
+        self._tokens[token] = (sub, types, name or getattr(callback, "__name__", f"abone_{token}"))
+        if types is None:
+            self._wildcard = self._wildcard + (sub,)
+        else:
+            for t in types:
+                self._by_type[t] = self._by_type.get(t, ()) + (sub,)
+        return token
+
+    def unsubscribe(self, token: int):
+        entry = self._tokens.pop(token, None)
+        if entry is None:
+            return
+        sub, types, _ = entry
+        if types is None:
+            self._wildcard = tuple(s for s in self._wildcard if s is not sub)
+        else:
+            for t in types:
+                rest = tuple(s for s in self._by_type.get(t, ()) if s is not sub)
+                if rest:
+                    self._by_type[t] = rest
+                else:
+                    self._by_type.pop(t, None)
+
+    def set_tap(self, tap):
+        """Ham mesajları okuyucu thread'inde alacak fonksiyon (ör. FlightRecorder.record_mavlink_msg)."""
+        self._tap = tap
+        if self._reader is not None:
+            self._reader.tap = tap
+
+    # --- Dağıtım ---
+    def dispatch(self, msg):
+        """Tek bir çözülmüş mesajı ilgili abonelere iletir."""
+        t = msg.get_type()
+        self._dispatched += 1
+        # Filtreler mesajın alış zamanını kullanır (replay'de kayıttaki zaman → deterministik)
+        now = getattr(msg, "_timestamp", None) or time.time()
+        for cb, filt in self._by_type.get(t, ()):
+            if filt is None or filt.accept(t, now):
+                self._call(cb, msg)
+        for cb, filt in self._wildcard:
+            if filt is None or filt.accept(t, now):
+                self._call(cb, msg)
+
+    def _call(self, cb, msg):
+        try:
+            cb(msg)
+        except Exception as e:
+            self._handler_errors += 1
+            logging.getLogger("MAVLink").error(f"Abone hatası ({getattr(cb, '__name__', cb)}): {e}")
+
+    async def run(self, uri: str = 'udp:127.0.0.1:14555'):
+        """Bağlantıyı açar, okuyucu thread'i başlatır ve mesajları dağıtır."""
+        logger = logging.getLogger("MAVLink")
+        if mavutil is None:
+            logger.info("pymavlink yok; MAVLink hub pasif. (pip install pymavlink)")
+            return
+        loop = asyncio.get_event_loop()
+        self._uri = uri
+        logger.info(f"MAVLink bağlantısı deneniyor: {uri}")
+        conn = None
+        try:
+            conn = mavutil.mavlink_connection(uri, source_system=255)
+            logger.info("Bağlantı açıldı, ilk mesaj (heartbeat) bekleniyor...")
+            await self.run_reader(MavlinkReader(conn, loop, tap=self._tap))
+        except asyncio.CancelledError:
+            logger.info("MAVLink hub iptal edildi")
+            raise
+        except Exception as e:
+            logger.error(f"MAVLink bağlantı hatası: {e}")
+        finally:
+            try: conn.close()
+            except Exception: pass
+            logger.info("MAVLink bağlantısı kapatıldı")
+
+    async def run_reader(self, reader):
+        """
+        Verilen okuyucuyu (MavlinkReader veya replay.ReplayReader) başlatır
+        ve tamponunu abonelere dağıtır.
+        """
+        logger = logging.getLogger("MAVLink")
+        self._reader = reader
+        if self._uri is None:
+            self._uri = getattr(reader, "source", None)
+        reader.start()
+        try:
+            last_stat = time.time()
+            stat_count = 0
+            while True:
+                batch = await reader.get_batch(timeout=1.0)
+                now = time.time()
+                if not batch:
+                    if getattr(reader, "finished", False):
+                        logger.info("MAVLink kaynağı tükendi.")
+                        return
+                    if (now - last_stat) > 5 and stat_count == 0:
+                        logger.warning(f"MAVLink verisi gelmiyor. {self._uri} adresini kontrol edin.")
+                        last_stat = now
+                    continue
+
+                if stat_count == 0:
+                    logger.info("İlk MAVLink mesajı alındı!")
+                stat_count += len(batch)
+
+                for _, msg in batch:
+                    self.dispatch(msg)
+
+                if (now - last_stat) > 5:
+                    logger.debug(f"Son 5 sn'de {stat_count} MAVLink mesajı alındı.")
+                    last_stat = now
+                    stat_count = 0
+        finally:
+            reader.stop()
+
+    def stats(self) -> dict:
+        """STATUS_UPDATE için özet (okuyucu tamponu + dağıtım sayaçları)."""
+        data = self._reader.stats() if self._reader is not None else {}
+        data["uri"] = self._uri
+        data["subscribers"] = len(self._tokens)
+        data["dispatched"] = self._dispatched
+        data["handler_errors"] = self._handler_errors
+        filters = {name: sub[1].stats() for sub, _, name in self._tokens.values() if sub[1] is not None}
+        if filters:
+            data["filters"] = filters
+        return data
+
+
+mavlink_hub = MavlinkHub()
@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+"""
+MAVLink Okuyucu Thread'i
+========================
+Her mesaj için ayrı bir `run_in_executor` çağrısı yerine tek bir kalıcı
+thread bağlantıyı okur ve çözülen mesajları sınırlı bir halka tampona
+(ring buffer) yazar. asyncio tarafı tamponu toplu (batch) halde boşaltır;
+bir burst için event loop yalnızca bir kez uyandırılır.
+"""
+
+import asyncio
+import collections
+import logging
+import threading
+import time
+
+
+class MavlinkReader(threading.Thread):
+    """
+    Kalıcı MAVLink okuyucu.
+    - conn: pymavlink bağlantısı (recv_match destekli)
+    - loop: mesajların teslim edileceği asyncio event loop
+    - maxlen: halka tampon kapasitesi (dolunca en eski mesaj düşürülür)
+    - burst: tek uyanmada bloklamadan okunacak azami ek mesaj sayısı
+    - tap: (opsiyonel) her mesaj için okuyucu thread'inde çağrılır (ör. uçuş kaydı)
+    """
+    def __init__(self, conn, loop, maxlen: int = 4096, burst: int = 256, tap=None):
+        super().__init__(name="MavlinkReader", daemon=True)
+        self._conn = conn
+        self._loop = loop
+        self._buf = collections.deque(maxlen=maxlen)
+        self._burst = burst
+        self.tap = tap
+        self._lock = threading.Lock()
+        self._running = True
+        self._wakeup_pending = False
+        self._event = asyncio.Event()
+        # İstatistikler
+        self._received = 0
+        self._dropped = 0
+        self._high_water = 0
+        self._batches = 0
+        self._last_batch = 0
+        self._lat_last = 0.0
+        self._lat_max = 0.0
+        self._lat_sum = 0.0
+
+    # --- Okuyucu thread tarafı ---
+    def run(self):
+        logger = logging.getLogger("MAVLink")
+        while self._running:
+            try:
+                msg = self._conn.recv_match(blocking=True, timeout=0.5)
+            except Exception as e:
+                logger.debug(f"MAVLink okuma hatası: {e}")
+                time.sleep(0.1)
+                continue
+            if msg is None:
+                continue
+            burst = [msg]
+            # Soketteki hazır mesajları bloklamadan topla
+            for _ in range(self._burst):
+                try:
+                    m = self._conn.recv_match(blocking=False)
+                except Exception:
+                    break
+                if m is None:
+                    break
+                burst.append(m)
+            self._push(burst)
+
+    def _push(self, msgs):
+        tap = self.tap
+        if tap is not None:
+            for m in msgs:
+                try: tap(m)
+                except Exception: pass
+        now = time.monotonic()
+        notify = False
+        with self._lock:
+            for m in msgs:
+                if m.get_type() == 'BAD_DATA':
+                    continue
+                if len(self._buf) == self._buf.maxlen:
+                    self._dropped += 1
+                self._buf.append((now, m))
+                self._received += 1
+            depth = len(self._buf)
+            if depth > self._high_water:
+                self._high_water = depth
+            if depth and not self._wakeup_pending:
+                self._wakeup_pending = True
+                notify = True
+        if notify:
+            try:
+                self._loop.call_soon_threadsafe(self._event.set)
+            except RuntimeError:
+                # Loop kapanmış
+                self._running = False
+
+    def stop(self, timeout: float = 1.5):
+        self._running = False
+        if self.is_alive():
+            self.join(timeout)
+
+    # --- asyncio tarafı ---
+    def drain(self):
+        """Tampondaki tüm mesajları (alış_zamanı, mesaj) listesi olarak döndürür."""
+        with self._lock:
+            items = list(self._buf)
+            self._buf.clear()
+            self._wakeup_pending = False
+        self._record_batch(items)
+        return items
+
+    def _record_batch(self, items):
+        if items:
+            lat = time.monotonic() - items[0][0]
+            self._batches += 1
+            self._last_batch = len(items)
+            self._lat_last = lat
+            self._lat_sum += lat
+            if lat > self._lat_max:
+                self._lat_max = lat
+
+    async def get_batch(self, timeout: float = None):
+        """Yeni mesaj gelene kadar bekler ve birikmiş burst'ü döndürür (zaman aşımında [])."""
+        if not self._buf:
+            self._event.clear()
+            try:
+                await asyncio.wait_for(self._event.wait(), timeout)
+            except asyncio.TimeoutError:
+                return []
+        return self.drain()
+
+    def stats(self) -> dict:
+        """STATUS_UPDATE için özet."""
+        with self._lock:
+            depth = len(self._buf)
+        batches = self._batches
+        return {
+            "queue_depth": depth,
+            "queue_max": self._buf.maxlen,
+            "queue_high_water": self._high_water,
+            "received": self._received,
+            "dropped": self._dropped,
+            "batches": batches,
+            "last_batch_size": self._last_batch,
+            "batch_latency_ms": round(self._lat_last * 1000.0, 2),
+            "batch_latency_avg_ms": round((self._lat_sum / batches) * 1000.0, 2) if batches else 0.0,
+            "batch_latency_max_ms": round(self._lat_max * 1000.0, 2),
+        }
@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+"""
+Mesaj Veri Yolu (Bus)
+=====================
+Arka plandan (login, telemetri, poller'lar, MAVLink, durum) gelen sözlük
+mesajlarını `_type` alanına göre abonelere dağıtır. Her tip için abone
+listesi önceden hesaplanır (öncelik sırasına göre); yayın, abone sayısı
+dışında sabit maliyetlidir (O(1) arama).
+
+Abonelik:
+    token = message_bus.subscribe(cb, types=(MsgType.SELF_POSE,), name="gui.pose")
+    token = message_bus.subscribe(cb, priority=-100, name="ws")      # tüm tipler, en son
+    token = message_bus.subscribe(cb, types=(...), mode="qt")        # Qt thread'inde, ertelenmiş
+    message_bus.unsubscribe(token)
+    message_bus.publish({"_type": ..., ...})
+
+Yüksek öncelikli aboneler önce çağrılır (eşitse kayıt sırası). mode="sync"
+aboneler publish() içinde çağrılır; mode="qt" aboneler kuyruğa alınır ve
+Qt olay döngüsünde (başka thread'den yayınlansa da) toplu olarak çağrılır.
+Her abone için çağrı sayısı, süre histogramı ve hata sayısı tutulur; hata
+yayını durdurmaz, ilk hata iz kaydıyla loglanır.
+"""
+
+import asyncio
+import collections
+import logging
+import threading
+import time
+
+from metrics import LatencyHistogram
+
+try:
+    from PyQt5.QtCore import QObject, Qt, pyqtSignal
+except Exception:
+    QObject = None
+
+MODES = ("sync", "qt")
+_CALL_BOUNDS_MS = (0.01, 0.05, 0.1, 0.5, 1, 5, 10, 50)
+
+
+class _Subscriber:
+    __slots__ = ("token", "callback", "types", "priority", "mode", "name",
+                 "calls", "errors", "last_error", "total", "hist")
+
+    def __init__(self, token, callback, types, priority, mode, name):
+        self.token = token
+        self.callback = callback
+        self.types = types
+        self.priority = priority
+        self.mode = mode
+        self.name = name
+        self.calls = 0
+        self.errors = 0
+        self.last_error = None
+        self.total = 0.0
+        self.hist = LatencyHistogram(window=60.0, bounds=_CALL_BOUNDS_MS)
+
+    def stats(self) -> dict:
+        h = self.hist.stats(buckets=False)
+        return {
+            "name": self.name,
+            "types": list(self.types) if self.types is not None else None,
+            "priority": self.priority,
+            "mode": self.mode,
+            "calls": self.calls,
+            "errors": self.errors,
+            "last_error": self.last_error,
+            "total_ms": round(self.total * 1000.0, 1),
+            "p50_ms": h["p50_ms"],
+            "p99_ms": h["p99_ms"],
+            "max_ms": h["max_ms"],
+        }
+
+
+if QObject is not None:
+    class _QtWaker(QObject):
+        """Başka thread'den de güvenle tetiklenen, Qt thread'inde çalışan boşaltıcı."""
+        wake = pyqtSignal()
+
+        def __init__(self, drain):
+            super().__init__()
+            self.wake.connect(drain, Qt.QueuedConnection)
+
+
+class MessageBus:
+    def __init__(self, max_deferred: int = 10000):
+        self._subs = {}         # {token: _Subscriber}
+        self._routes = {}       # {tip: (_Subscriber, ...)} önbellek; abonelik değişince temizlenir
+        self._next_token = 1
+        self._deferred = collections.deque()     # (_Subscriber, mesaj)
+        self._max_deferred = max_deferred
+        self._drain_pending = False
+        self._lock = threading.Lock()
+        self._waker = None
+        self.published = 0
+        self.unrouted = 0           # hiçbir abonesi olmayan mesajlar
+        self.deferred_dropped = 0
+
+    # --- Abonelik ---
+    def subscribe(self, callback, types=None, priority: int = 0, mode: str = "sync", name: str = None) -> int:
+        """callback(msg) kaydeder. types verilmezse tüm tipleri alır."""
+        if mode not in MODES:
+            raise ValueError(f"Bilinmeyen abone modu: {mode} (seçenekler: {', '.join(MODES)})")
+        token = self._next_token
+        self._next_token += 1
+        types = frozenset(types) if types else None
+        self._subs[token] = _Subscriber(token, callback, types, priority, mode,
+                                        name or getattr(callback, "__qualname__", f"abone_{token}"))
+        self._routes.clear()
+        return token
+
+    def unsubscribe(self, token: int):
+        if self._subs.pop(token, None) is not None:
+            self._routes.clear()
+
+    def _route(self, msg_type):
+        subs = [s for s in self._subs.values() if s.types is None or msg_type in s.types]
+        subs.sort(key=lambda s: (-s.priority, s.token))
+        route = self._routes[msg_type] = tuple(subs)
+        return route
+
+    # --- Yayın ---
+    def publish(self, msg: dict):
+        """Mesajı `_type` abonelerine öncelik sırasıyla iletir."""
+        self.published += 1
+        t = msg.get("_type")
+        route = self._routes.get(t)
+        if route is None:
+            route = self._route(t)
+        if not route:
+            self.unrouted += 1
+            return
+        self._deliver(route, msg)
+
+    def deliver(self, msg: dict, tokens):
+        """Mesajı yalnızca verilen aboneliklere iletir (ör. yeni açılan pencereye son veriler)."""
+        t = msg.get("_type")
+        tokens = set(tokens)
+        route = self._routes.get(t)
+        if route is None:
+            route = self._route(t)
+        self._deliver([s for s in route if s.token in tokens], msg)
+
+    def _deliver(self, route, msg):
+        for sub in route:
+            if sub.mode == "sync":
+                self._call(sub, msg)
+            else:
+                self._defer(sub, msg)
+
+    def _call(self, sub: _Subscriber, msg: dict):
+        t0 = time.perf_counter()
+        try:
+            sub.callback(msg)
+        except Exception as e:
+            sub.errors += 1
+            sub.last_error = f"{msg.get('_type')}: {e}"
+            logger = logging.getLogger("BUS")
+            if sub.errors == 1:
+                logger.error(f"Abone hatası ({sub.name}, {msg.get('_type')}): {e}", exc_info=True)
+            else:
+                logger.debug(f"Abone hatası ({sub.name}, {msg.get('_type')}): {e}")
+        dt = time.perf_counter() - t0
+        sub.calls += 1
+        sub.total += dt
+        sub.hist.add(dt * 1000.0)
+
+    def _defer(self, sub: _Subscriber, msg: dict):
+        with self._lock:
+            if len(self._deferred) >= self._max_deferred:
+                self._deferred.popleft()
+                self.deferred_dropped += 1
+            self._deferred.append((sub, msg))
+            if self._drain_pending:
+                return
+            self._drain_pending = True
+        self._schedule_drain()
+
+    def _schedule_drain(self):
+        if QObject is not None:
+            if self._waker is None:
+                self._waker = _QtWaker(self._drain)
+            self._waker.wake.emit()
+        else:
+            asyncio.get_event_loop().call_soon_threadsafe(self._drain)
+
+    def _drain(self):
+        with self._lock:
+            items, self._deferred = self._deferred, collections.deque()
+            self._drain_pending = False
+        for sub, msg in items:
+            if sub.token in self._subs:     # arada abonelikten çıkmış olabilir
+                self._call(sub, msg)
+
+    def stats(self) -> dict:
+        return {
+            "published": self.published,
+            "unrouted": self.unrouted,
+            "routes": len(self._routes),
+            "deferred_depth": len(self._deferred),
+            "deferred_dropped": self.deferred_dropped,
+            "subscribers": [s.stats() for s in sorted(self._subs.values(), key=lambda s: (-s.priority, s.token))],
+        }
+
+
+# Uygulama genelinde tek veri yolu (main yayınlar, gui/dashboard abone olur)
+message_bus = MessageBus()
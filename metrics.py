@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""
+Ölçüm Yardımcıları
+==================
+LatencyHistogram: sabit kovalı (bucket) toplam sayaçlar + kayan pencere
+üzerinde yüzdelikler (p50/p90/p99) ve maksimum.
+
+    h = LatencyHistogram()
+    h.add(12.5)          # ms
+    h.stats()            # {"count", "p50_ms", "p90_ms", "p99_ms", "max_ms", "buckets"}
+
+LoopLagMonitor: olay döngüsünün gecikmesini (uyku taşması) ölçer; HTTP
+yavaşlığının sunucudan/ağdan mı yoksa kendi döngümüzden mi geldiğini ayırmak
+için kullanılır.
+"""
+
+import asyncio
+import bisect
+import collections
+import time
+
+DEFAULT_BOUNDS_MS = (5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+SIZE_BOUNDS_BYTES = (256, 1024, 4096, 16384, 65536, 262144)
+
+
+def percentile(sorted_values, p: float):
+    """Sıralı listeden yüzdelik (en yakın sıra yöntemi)."""
+    if not sorted_values:
+        return None
+    k = max(0, min(len(sorted_values) - 1, int(round(p / 100.0 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[k]
+
+
+class LatencyHistogram:
+    def __init__(self, window: float = 60.0, maxlen: int = 4096, bounds=DEFAULT_BOUNDS_MS, unit: str = "ms"):
+        self.window = window
+        self.bounds = tuple(bounds)
+        self.unit = unit
+        self._counts = [0] * (len(self.bounds) + 1)
+        self._samples = collections.deque(maxlen=maxlen)   # (zaman, değer)
+        self.total = 0
+
+    def add(self, value: float, now: float = None):
+        if now is None:
+            now = time.monotonic()
+        self._counts[bisect.bisect_left(self.bounds, value)] += 1
+        self._samples.append((now, value))
+        self.total += 1
+
+    def _window_values(self, now: float = None):
+        if now is None:
+            now = time.monotonic()
+        limit = now - self.window
+        samples = self._samples
+        while samples and samples[0][0] < limit:
+            samples.popleft()
+        return sorted(v for _, v in samples)
+
+    def percentile(self, p: float):
+        return percentile(self._window_values(), p)
+
+    def stats(self, buckets: bool = True) -> dict:
+        vals = self._window_values()
+        u = self.unit
+
+        def r(v):
+            return round(v, 2) if v is not None else None
+        out = {
+            "count": self.total,
+            "window_count": len(vals),
+            f"p50_{u}": r(percentile(vals, 50)),
+            f"p90_{u}": r(percentile(vals, 90)),
+            f"p99_{u}": r(percentile(vals, 99)),
+            f"max_{u}": r(vals[-1] if vals else None),
+        }
+        if buckets:
+            out["buckets"] = {
+                (f"<={self.bounds[i]}" if i < len(self.bounds) else f">{self.bounds[-1]}"): c
+                for i, c in enumerate(self._counts)
+            }
+        return out
+
+
+class LoopLagMonitor:
+    """`interval` sn uyuyup uyanma gecikmesini (ms) histograma yazar."""
+    def __init__(self, interval: float = 0.1, window: float = 60.0):
+        self.interval = interval
+        self.hist = LatencyHistogram(window=window, bounds=(1, 2, 5, 10, 20, 50, 100, 200, 500))
+
+    async def run(self):
+        interval = self.interval
+        while True:
+            t0 = time.monotonic()
+            await asyncio.sleep(interval)
+            self.hist.add(max(0.0, (time.monotonic() - t0 - interval) * 1000.0))
+
+    def stats(self) -> dict:
+        return self.hist.stats(buckets=False)
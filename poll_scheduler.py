@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+"""
+Uyarlanır Sunucu Sorgulama Zamanlayıcısı
+========================================
+Tüm periyodik sunucu çekimlerini (HSS, QR, sunucu saati...) tek bir görev
+yürütür; uç nokta başına ayrı uyku döngüleri yerine:
+
+- uyarlanır aralık: değişiklik gelince `min_interval`'a iner, veri
+  değişmedikçe `grow` katsayısıyla `max_interval`'a kadar uzar
+- hatada üstel geri çekilme (backoff)
+- ±`jitter` oranında rastgele sapma (sorgular aynı anda yığılmasın)
+- genel istek bütçesi (token bucket, istek/sn): sorgular seri yürür ve
+  bütçeyi aşamaz; telemetri POST'u için bağlantı ve bant bırakır
+
+Uç noktalar bildirimsel olarak kaydedilir; çekme işlemi (`fetch`) dışarıdan
+verilir ve True (değişti), False (değişmedi) ya da None (hata) döndürür:
+
+    sched = PollScheduler(fetch, budget=3.0)
+    sched.register("/api/hss_koordinatlari", MsgType.SERVER_HSS, 3.0, max_interval=10.0,
+                   when=lambda: logged_in(), require_login=True)
+    await sched.run()
+"""
+
+import asyncio
+import random
+import time
+
+
+class PollEndpoint:
+    """
+    Kayıtlı uç nokta: zamanlama durumu, doğrulayıcılar (ETag vb.) ve sayaçlar.
+    `require_login` True ise 401 yanıtı yeniden girişi tetikler.
+    """
+    def __init__(self, path: str, msg_type: str, interval: float, min_interval: float = None,
+                 max_interval: float = None, when=None, require_login: bool = False):
+        self.path = path
+        self.msg_type = msg_type
+        self.require_login = require_login
+        self.min_interval = min_interval if min_interval is not None else interval
+        self.max_interval = max(max_interval if max_interval is not None else interval, self.min_interval)
+        self.when = when
+        self.interval = interval
+        self.next_due = 0.0
+        self.failures = 0
+        # Değişiklik algılama (fetch tarafından doldurulur)
+        self.etag = None
+        self.last_modified = None
+        self.raw_digest = None      # ham gövde özeti (hızlı yol)
+        self.digest = None          # oynak alanlar hariç içerik özeti
+        self.last = None
+        # Sayaçlar
+        self.fetched = 0
+        self.changed = 0
+        self.not_modified = 0
+        self.duplicates = 0
+        self.errors = 0
+        self.skipped = 0
+
+    def stats(self) -> dict:
+        return {
+            "interval_s": round(self.interval, 2),
+            "fetched": self.fetched,
+            "changed": self.changed,
+            "not_modified": self.not_modified,
+            "duplicates": self.duplicates,
+            "errors": self.errors,
+            "failures": self.failures,
+            "skipped": self.skipped,
+        }
+
+
+class PollScheduler:
+    def __init__(self, fetch, budget: float = 3.0, burst: float = 2.0, grow: float = 1.5,
+                 jitter: float = 0.1, backoff_max: float = 60.0):
+        self._fetch = fetch
+        self.budget = max(0.1, budget)
+        self.burst = max(1.0, burst)
+        self.grow = grow
+        self.jitter = jitter
+        self.backoff_max = backoff_max
+        self.endpoints = {}
+        self._tokens = self.burst
+        self._tokens_at = time.monotonic()
+        self._wake = asyncio.Event()
+        self.budget_waits = 0
+
+    def register(self, path: str, msg_type: str, interval: float, min_interval: float = None,
+                 max_interval: float = None, when=None, require_login: bool = False) -> PollEndpoint:
+        """Uç nokta ekler; `when` verilirse yalnızca True döndürdüğünde sorgulanır."""
+        ep = PollEndpoint(path, msg_type, interval, min_interval, max_interval, when, require_login)
+        ep.next_due = time.monotonic() + random.uniform(0, self.jitter * interval)
+        self.endpoints[path] = ep
+        self._wake.set()
+        return ep
+
+    def poke(self, path: str):
+        """Uç noktayı hemen sorgulanacak şekilde öne alır (ör. giriş sonrası)."""
+        ep = self.endpoints.get(path)
+        if ep is not None:
+            ep.next_due = time.monotonic()
+            self._wake.set()
+
+    def _jittered(self, delay: float) -> float:
+        return delay * (1.0 + random.uniform(-self.jitter, self.jitter))
+
+    def _reschedule(self, ep: PollEndpoint, result, now: float):
+        if result is None:
+            ep.failures += 1
+            ep.errors += 1
+            delay = min(self.backoff_max, ep.min_interval * (2 ** ep.failures))
+        else:
+            ep.failures = 0
+            if result:
+                ep.interval = ep.min_interval
+            else:
+                ep.interval = min(ep.max_interval, ep.interval * self.grow)
+            delay = ep.interval
+        ep.next_due = now + self._jittered(delay)
+
+    async def _take_token(self):
+        while True:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._tokens_at) * self.budget)
+            self._tokens_at = now
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return
+            self.budget_waits += 1
+            await asyncio.sleep((1.0 - self._tokens) / self.budget)
+
+    async def run(self):
+        while True:
+            if not self.endpoints:
+                self._wake.clear()
+                await self._wake.wait()
+                continue
+            ep = min(self.endpoints.values(), key=lambda e: e.next_due)
+            delay = ep.next_due - time.monotonic()
+            if delay > 0:
+                # Yeni kayıt veya poke() beklemeyi kısaltabilir
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            if ep.when is not None and not ep.when():
+                ep.skipped += 1
+                ep.next_due = time.monotonic() + ep.min_interval
+                continue
+            await self._take_token()
+            try:
+                result = await self._fetch(ep)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                result = None
+            self._reschedule(ep, result, time.monotonic())
+
+    def stats(self) -> dict:
+        return {
+            "budget_rps": self.budget,
+            "budget_waits": self.budget_waits,
+            "endpoints": {path: ep.stats() for path, ep in self.endpoints.items()},
+        }
@@ -0,0 +1,323 @@
+# -*- coding: utf-8 -*-
+"""
+Kayıttan Oynatma (Replay)
+=========================
+Bir uçuş kaydını (flight_recorder oturumu veya tek .tlog) canlı
+bağlantının yerine MAVLink hub'ına besler; sunucu kayıtları aynı zaman
+sırasıyla on_message'a (message_bus.publish) iletilir. Böylece uygulamanın tamamı
+uçak/SITL olmadan çalıştırılabilir.
+
+Hız:
+    speed=1.0   gerçek zaman
+    speed=10.0  10 kat hızlı
+    speed=0     olabildiğince hızlı (işlem hattı throughput ölçümü)
+max_gap verilirse kayıttaki max_gap saniyeden uzun boşluklar max_gap'e
+sıkıştırılır; verilmezse orijinal zamanlama korunur.
+
+Canlı okuyucunun aksine tampon dolunca en eski mesaj düşürülmez; okuyucu
+thread'i yer açılana kadar bekler (oynatma eksiksiz ve deterministiktir).
+Sunucu kayıtları da aynı tampondan geçer: önlerindeki MAVLink mesajları
+dağıtılmadan on_server'a iletilmezler.
+
+Uygulama içinde (main.py):
+    IHA_REPLAY=recordings/20261017_141500 IHA_REPLAY_SPEED=10 python main.py
+
+Başsız throughput ölçümü (decode → durum → GUI/WS sözlük yolu → JSON):
+    python replay.py recordings/20261017_141500 --speed 0 [--gui]
+"""
+
+import argparse
+import asyncio
+import heapq
+import json
+import logging
+import os
+import sys
+import threading
+import time
+
+from flight_recorder import FlightRecording
+from mavlink_reader import MavlinkReader
+
+try:
+    from pymavlink import mavutil
+except Exception:
+    mavutil = None
+
+
+class ReplayReader(MavlinkReader):
+    """
+    MavlinkReader ile aynı arayüz (get_batch/stop/stats); bağlantı yerine
+    kayıttan okur ve mesajları kayıttaki zamanlamaya göre tampona yazar.
+    - on_server: sunucu kayıtları için callback (event loop thread'inde,
+      kayıt sırasına göre önceki MAVLink mesajları dağıtıldıktan sonra çağrılır)
+    """
+    def __init__(self, path: str, loop, speed: float = 1.0, max_gap: float = None,
+                 start: float = 0.0, on_server=None, maxlen: int = 65536):
+        super().__init__(None, loop, maxlen=maxlen)
+        self.name = "ReplayReader"
+        self.source = f"replay:{path}"
+        self.finished = False
+        self._path = path
+        self._speed = float(speed or 0.0)
+        self._max_gap = max_gap
+        self._start = start
+        self._on_server = on_server
+        self._space = threading.Condition(self._lock)     # tamponda yer açıldı
+        self._replayed = 0
+        self._server_replayed = 0
+        self._dispatched = 0
+        self._server_dispatched = 0
+        self._t_first = None
+        self._t_last = None
+        self._wall_start = None
+        self._wall_end = None
+
+    def _records(self, rec):
+        """MAVLink ve sunucu kayıtlarını zaman sırasıyla birleştirir: (µs, tür, veri)."""
+        mav = ((ts, 0, raw) for ts, raw in rec.iter_mavlink(self._start))
+        srv = ((r.get("t", 0), 1, r) for r in rec.iter_server(self._start))
+        return heapq.merge(mav, srv, key=lambda x: (x[0], x[1]))
+
+    def run(self):
+        logger = logging.getLogger("REPLAY")
+        if mavutil is None:
+            logger.error("pymavlink yok; replay çalışamaz.")
+            self._finish()
+            return
+        rec = FlightRecording(self._path)
+        parser = mavutil.mavlink.MAVLink(None)
+        parser.robust_parsing = True
+        burst = []
+        skipped = 0.0          # sıkıştırılan boşlukların toplamı (sn)
+        prev_ts = None
+        self._wall_start = time.monotonic()
+        try:
+            for ts_us, kind, data in self._records(rec):
+                if not self._running:
+                    break
+                ts = ts_us / 1e6
+                if self._t_first is None:
+                    self._t_first = ts
+                if prev_ts is not None and self._max_gap is not None and (ts - prev_ts) > self._max_gap:
+                    skipped += (ts - prev_ts) - self._max_gap
+                prev_ts = ts
+                self._t_last = ts
+
+                if self._speed > 0:
+                    target = self._wall_start + (ts - self._t_first - skipped) / self._speed
+                    delay = target - time.monotonic()
+                    if delay > 0.002:
+                        if burst:
+                            self._push(burst)
+                            burst = []
+                        time.sleep(delay)
+
+                if kind == 0:
+                    try:
+                        msgs = parser.parse_buffer(bytes(data)) or []
+                    except Exception:
+                        msgs = []
+                    for m in msgs:
+                        m._timestamp = ts
+                        burst.append(m)
+                        self._replayed += 1
+                    if len(burst) >= self._burst:
+                        self._push(burst)
+                        burst = []
+                elif self._on_server is not None:
+                    # Sunucu kaydı MAVLink mesajlarıyla aynı tampondan, sırası korunarak geçer
+                    burst.append({"_type": data.get("type"), "payload": data.get("payload"), "_replay": True})
+                    self._server_replayed += 1
+            if burst:
+                self._push(burst)
+        except RuntimeError:
+            # Event loop kapanmış
+            pass
+        except Exception as e:
+            logger.error(f"Replay hatası: {e}")
+        finally:
+            rec.close()
+            self._finish()
+            logger.info(f"Replay okuması bitti: {self._replayed} MAVLink, {self._server_replayed} sunucu kaydı")
+
+    def _push(self, msgs):
+        """Tampon doluysa düşürmek yerine tüketici yer açana kadar bekler."""
+        now = time.monotonic()
+        buf = self._buf
+        with self._space:
+            for m in msgs:
+                if not isinstance(m, dict) and m.get_type() == 'BAD_DATA':
+                    continue
+                while len(buf) >= buf.maxlen:
+                    if not self._running:
+                        return
+                    self._wake_locked()
+                    self._space.wait(0.1)
+                buf.append((now, m))
+                self._received += 1
+            if len(buf) > self._high_water:
+                self._high_water = len(buf)
+            if buf:
+                self._wake_locked()
+
+    def _wake_locked(self):
+        if self._wakeup_pending:
+            return
+        self._wakeup_pending = True
+        try:
+            self._loop.call_soon_threadsafe(self._event.set)
+        except RuntimeError:
+            # Loop kapanmış
+            self._running = False
+
+    def drain(self):
+        """
+        Baştaki sunucu kayıtlarını on_server'a iletir ve bir sonraki sunucu
+        kaydına kadarki MAVLink mesajlarını döndürür. Hub bu mesajları
+        dağıttıktan sonra tekrar çağırdığı için kayıt sırası korunur.
+        """
+        server = []
+        items = []
+        with self._space:
+            buf = self._buf
+            while buf and isinstance(buf[0][1], dict):
+                server.append(buf.popleft()[1])
+            while buf and not isinstance(buf[0][1], dict):
+                items.append(buf.popleft())
+            if not buf:
+                self._wakeup_pending = False
+            self._space.notify_all()
+        for msg in server:
+            self._server_dispatched += 1
+            try:
+                self._on_server(msg)
+            except Exception as e:
+                logging.getLogger("REPLAY").error(f"Sunucu kaydı işlenemedi: {e}")
+        self._dispatched += len(items)
+        self._record_batch(items)
+        return items
+
+    async def get_batch(self, timeout: float = None):
+        if self.finished and not self._buf:
+            return []
+        return await super().get_batch(timeout)
+
+    def stop(self, timeout: float = 1.5):
+        self._running = False
+        with self._space:
+            self._space.notify_all()
+        super().stop(timeout)
+
+    def _finish(self):
+        self._wall_end = time.monotonic()
+        self.finished = True
+        try:
+            self._loop.call_soon_threadsafe(self._event.set)
+        except RuntimeError:
+            pass
+
+    def _replay_rate(self) -> float:
+        if self._wall_start is None:
+            return 0.0
+        wall = (self._wall_end or time.monotonic()) - self._wall_start
+        return self._dispatched / wall if wall > 0 else 0.0
+
+    def stats(self) -> dict:
+        data = super().stats()
+        data.update({
+            "replay_source": self._path,
+            "replay_speed": self._speed if self._speed > 0 else "max",
+            "replay_position_s": round((self._t_last or 0) - (self._t_first or 0), 1),
+            "replayed": self._replayed,
+            "server_replayed": self._server_replayed,
+            "dispatched": self._dispatched,
+            "server_dispatched": self._server_dispatched,
+            "replay_rate": round(self._replay_rate(), 1),
+            "finished": self.finished,
+        })
+        return data
+
+
+def reader_from_env(loop, on_server=None):
+    """IHA_REPLAY ayarlıysa bir ReplayReader döndürür, değilse None."""
+    path = os.getenv("IHA_REPLAY")
+    if not path:
+        return None
+    gap = os.getenv("IHA_REPLAY_MAX_GAP")
+    return ReplayReader(
+        path, loop,
+        speed=float(os.getenv("IHA_REPLAY_SPEED", "1.0")),
+        max_gap=float(gap) if gap else None,
+        start=float(os.getenv("IHA_REPLAY_START", "0")),
+        on_server=on_server,
+    )
+
+
+# --- Başsız throughput ölçümü ---
+async def _bench(args):
+    from mavlink_hub import MavlinkHub
+    from mavlink_filter import IngestFilter
+    from telemetry_state import TelemetryState
+    from telemetry_decoder import DECODERS, decode_into
+
+    loop = asyncio.get_running_loop()
+    hub = MavlinkHub()
+    state = TelemetryState()
+    counters = {"gui_ws": 0, "ws_bytes": 0}
+    window = None
+    if args.gui:
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        from PyQt5.QtWidgets import QApplication
+        app = QApplication.instance() or QApplication(sys.argv)
+        from gui import MainWindow
+        window = MainWindow(loop)
+
+    def on_gui_ws(msg_dict):
+        counters["gui_ws"] += 1
+        if window is not None:
+            window.handle_backend_message(msg_dict)
+        counters["ws_bytes"] += len(json.dumps(msg_dict, default=str))
+
+    def to_dict(msg):
+        try: d = msg.to_dict()
+        except Exception: d = {}
+        d["_type"] = msg.get_type()
+        on_gui_ws(d)
+
+    hub.subscribe(lambda m: decode_into(m, state), types=tuple(DECODERS), name="telem_state")
+    hub.subscribe(to_dict, ingest_filter=IngestFilter.from_env() if args.filter else None, name="gui_ws")
+    reader = ReplayReader(args.path, loop, speed=args.speed, max_gap=args.max_gap,
+                          start=args.start, on_server=on_gui_ws)
+    cpu0 = time.process_time()
+    t0 = time.perf_counter()
+    await hub.run_reader(reader)
+    wall = time.perf_counter() - t0
+    cpu = time.process_time() - cpu0
+    st = reader.stats()
+    print(f"Kaynak            : {args.path}")
+    print(f"MAVLink mesajı    : {st['dispatched']}/{st['replayed']} dağıtıldı  "
+          f"(sunucu kaydı: {st['server_dispatched']}/{st['server_replayed']}, düşürülen: {st['dropped']})")
+    print(f"Süre              : {wall:.2f} sn  (CPU {cpu:.2f} sn)")
+    print(f"Throughput        : {st['dispatched'] / wall:,.0f} msg/s (dağıtılan)")
+    print(f"GUI/WS yolu       : {counters['gui_ws']} mesaj, {counters['ws_bytes']} bayt JSON")
+    print(f"Durum sürümü      : {state.version}")
+    if window is not None:
+        window.close()
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Uçuş kaydını oynat ve işlem hattı throughput'unu ölç")
+    ap.add_argument("path", help="Oturum klasörü veya .tlog dosyası")
+    ap.add_argument("--speed", type=float, default=0.0, help="Oynatma hızı (0 = olabildiğince hızlı)")
+    ap.add_argument("--max-gap", type=float, default=None, help="Bu süreden uzun boşlukları sıkıştır (sn)")
+    ap.add_argument("--start", type=float, default=0.0, help="Başlangıç ofseti (sn)")
+    ap.add_argument("--gui", action="store_true", help="MainWindow.handle_backend_message'i de çalıştır (offscreen)")
+    ap.add_argument("--no-filter", dest="filter", action="store_false", help="GUI/WS alım filtresini kapat")
+    args = ap.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s | %(levelname)s | %(name)s | %(message)s", datefmt="%H:%M:%S")
+    asyncio.run(_bench(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""
+Sunucu Saati Tahmincisi
+=======================
+Her telemetri yanıtı `sunucusaati` taşır; ayrıca /api/sunucusaati sorgulamak
+gerekmez. NTP'deki gibi isteğin gönderim (t0) ve yanıtın alınış (t1)
+zamanları kullanılır:
+
+    ofset   = sunucu_saati - (t0 + t1) / 2
+    belirsizlik ≈ RTT / 2
+
+Son `window` örnek içinden en düşük RTT'li örnek ofset tahmini olarak
+seçilir (kuyruk gecikmesi en az olan); kayma (drift) örneklerin ofset/zaman
+doğrusal regresyonundan hesaplanır. Sunucu yalnızca günün saatini verdiği
+için ofset gün uzunluğuna göre sarılır (saat dilimi farkı da ofsete girer).
+
+    server_clock.add_sample(t0, t1, ack["sunucusaati"])
+    server_clock.server_time()   # {"saat", "dakika", "saniye", "milisaniye"}
+    server_clock.stats()
+"""
+
+import collections
+import time
+
+_DAY = 86400.0
+_MAX_DRIFT = 500e-6
+
+
+def _wrap(offset: float) -> float:
+    """Ofseti [-12 sa, +12 sa) aralığına sarar."""
+    return (offset + _DAY / 2) % _DAY - _DAY / 2
+
+
+def payload_seconds(payload: dict):
+    """sunucusaati sözlüğünü gün içi saniyeye çevirir (geçersizse None)."""
+    try:
+        return (int(payload.get("saat", 0)) * 3600 + int(payload.get("dakika", 0)) * 60
+                + int(payload.get("saniye", 0)) + int(payload.get("milisaniye", 0)) / 1000.0)
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+class ServerClock:
+    def __init__(self, window: int = 64, min_samples: int = 3, max_uncertainty: float = 0.25):
+        self.min_samples = min_samples
+        self.max_uncertainty = max_uncertainty      # sn; senkron sayılmak için üst sınır
+        self._samples = collections.deque(maxlen=window)   # (t_orta, ofset, rtt)
+        self._offset = None
+        self._ref = 0.0
+        self._rtt = None
+        self.drift = 0.0        # sn/sn
+        self.total = 0
+        self.rejected = 0
+
+    def add_sample(self, t_send: float, t_recv: float, server) -> bool:
+        """t_send/t_recv: time.time(); server: sunucusaati sözlüğü veya gün içi saniye."""
+        sec = payload_seconds(server) if isinstance(server, dict) else server
+        if sec is None or t_recv < t_send:
+            self.rejected += 1
+            return False
+        mid = (t_send + t_recv) / 2.0
+        rtt = t_recv - t_send
+        offset = _wrap(sec - (mid % _DAY))
+        if self._offset is not None:
+            # Gün dönümünde sarılmayı önlemek için tahmine en yakın temsil
+            expected = self._predict(mid)
+            offset = expected + _wrap(offset - expected)
+        self._samples.append((mid, offset, rtt))
+        self.total += 1
+        self._update()
+        return True
+
+    def _predict(self, t: float) -> float:
+        return self._offset + self.drift * (t - self._ref)
+
+    def _update(self):
+        samples = self._samples
+        best = min(samples, key=lambda s: s[2])
+        self._ref, self._offset, self._rtt = best
+        if len(samples) >= 8 and samples[-1][0] - samples[0][0] >= 20.0:
+            n = len(samples)
+            mt = sum(s[0] for s in samples) / n
+            mo = sum(s[1] for s in samples) / n
+            var = sum((s[0] - mt) ** 2 for s in samples)
+            if var > 0:
+                slope = sum((s[0] - mt) * (s[1] - mo) for s in samples) / var
+                # Gerçek saat kayması ±500 ppm'i geçmez; fazlası RTT gürültüsüdür
+                self.drift = max(-_MAX_DRIFT, min(_MAX_DRIFT, slope))
+
+    @property
+    def offset(self):
+        """Şu anki ofset tahmini (sn) veya None."""
+        return self._predict(time.time()) if self._offset is not None else None
+
+    @property
+    def uncertainty(self):
+        """Ofset belirsizliği (sn): en iyi örneğin RTT/2'si + kayma payı + ms çözünürlüğü."""
+        if self._rtt is None:
+            return None
+        return self._rtt / 2.0 + abs(self.drift) * max(0.0, time.time() - self._ref) + 0.0005
+
+    @property
+    def synced(self) -> bool:
+        u = self.uncertainty
+        return len(self._samples) >= self.min_samples and u is not None and u <= self.max_uncertainty
+
+    def now(self, t: float = None):
+        """Sunucu saatine göre gün içi saniye (tahmin yoksa None)."""
+        if self._offset is None:
+            return None
+        if t is None:
+            t = time.time()
+        return (t % _DAY + self._predict(t)) % _DAY
+
+    def server_time(self, t: float = None):
+        sec = self.now(t)
+        if sec is None:
+            return None
+        ms = int(round(sec * 1000.0)) % int(_DAY * 1000)
+        s, msec = divmod(ms, 1000)
+        return {"saat": s // 3600, "dakika": (s // 60) % 60, "saniye": s % 60, "milisaniye": msec}
+
+    def error_of(self, local_tod_ms: int, t: float = None):
+        """Yerel gün içi zaman damgasının (ms) tahmini sunucu saatinden farkı (ms)."""
+        sec = self.now(t)
+        if sec is None:
+            return None
+        return _wrap(local_tod_ms / 1000.0 - sec) * 1000.0
+
+    def stats(self) -> dict:
+        off = self.offset
+        u = self.uncertainty
+        return {
+            "synced": self.synced,
+            "offset_ms": round(off * 1000.0, 2) if off is not None else None,
+            "uncertainty_ms": round(u * 1000.0, 2) if u is not None else None,
+            "drift_ppm": round(self.drift * 1e6, 2),
+            "rtt_min_ms": round(self._rtt * 1000.0, 2) if self._rtt is not None else None,
+            "samples": len(self._samples),
+            "total": self.total,
+            "rejected": self.rejected,
+        }
+
+
+# Uygulama genelinde tek tahminci (main besler, gui okur)
+server_clock = ServerClock()
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+MAVLink → Telemetri Durumu Çözücüsü
+===================================
+Mesaj tipine göre anahtarlanmış çözücü tablosu. Her giriş, başlangıçta
+derlenen bir dönüştürücüdür: alanları doğrudan pymavlink mesaj nesnesinden
+okur (to_dict() yok), dönüştürür ve TelemetryState'e yazar. Değişen
+alanlar state.commit() ile işaretlenir (sürüm + alan zaman damgası).
+
+Kullanım:
+    changed = decode_into(msg, state)
+"""
+
+import math
+from operator import attrgetter
+
+from telemetry_state import field_indices
+
+
+def _speed_from_vxvy(vx, vy):
+    return max(0.0, math.sqrt(float(vx) ** 2 + float(vy) ** 2) / 100.0)
+
+
+def compile_decoder(spec):
+    """
+    spec: [(mesaj_alanı, durum_alanı, dönüştürücü), ...]
+    mesaj_alanı bir demet (tuple) ise dönüştürücü tüm değerleri sırayla alır.
+    Döndürülen fonksiyon: decode(msg, state) -> [değişen_alanlar]
+    """
+    single = []
+    multi = []
+    for attr, key, conv in spec:
+        if isinstance(attr, tuple):
+            multi.append((attrgetter(*attr), key, conv))
+        else:
+            single.append((attr, key, conv))
+    single = tuple(single)
+    multi = tuple(multi)
+
+    def decode(msg, state):
+        changed = []
+        for attr, key, conv in single:
+            raw = getattr(msg, attr, None)
+            if raw is None:
+                continue
+            value = conv(raw)
+            if getattr(state, key) != value:
+                setattr(state, key, value)
+                changed.append(key)
+        for getter, key, conv in multi:
+            try:
+                raw = getter(msg)
+            except AttributeError:
+                continue
+            if None in raw:
+                continue
+            value = conv(*raw)
+            if getattr(state, key) != value:
+                setattr(state, key, value)
+                changed.append(key)
+        return changed
+    # Mesajın taşıdığı alanlar: değer değişmese de tazelik damgası yenilenir
+    decode.fields = field_indices(key for _, key, _ in spec)
+    return decode
+
+
+DECODERS = {
+    "GLOBAL_POSITION_INT": compile_decoder([
+        ("lat", "lat", lambda v: v / 1e7),
+        ("lon", "lon", lambda v: v / 1e7),
+        ("relative_alt", "alt", lambda v: v / 1000.0),
+        (("vx", "vy"), "speed", _speed_from_vxvy),
+    ]),
+    "ATTITUDE": compile_decoder([
+        ("roll", "roll", math.degrees),
+        ("pitch", "pitch", math.degrees),
+        ("yaw", "yaw", lambda v: (math.degrees(v) + 360.0) % 360.0),
+    ]),
+    "SYS_STATUS": compile_decoder([
+        ("battery_remaining", "battery", int),
+    ]),
+    "HEARTBEAT": compile_decoder([
+        ("base_mode", "autonomous", lambda v: 1 if (int(v) & (1 << 4)) else 0),
+    ]),
+    "SYSTEM_TIME": compile_decoder([
+        ("time_unix_usec", "gps_time_ms", lambda v: int(v) // 1000),
+    ]),
+    "GPS_RAW_INT": compile_decoder([
+        ("time_usec", "gps_time_ms", lambda v: int(v) // 1000),
+        ("vel", "speed", lambda v: max(0.0, v / 100.0)),
+        ("cog", "yaw", lambda v: (v / 100.0) % 360.0),
+    ]),
+    "VFR_HUD": compile_decoder([
+        ("groundspeed", "speed", lambda v: max(0.0, float(v))),
+        ("alt", "alt", float),
+        ("heading", "yaw", lambda v: float(v) % 360.0),
+    ]),
+}
+
+
+def decode_into(msg, state, ts: float = None):
+    """Mesajı ilgili çözücüyle state'e yazar, commit eder; değişen alan adlarını döndürür."""
+    decoder = DECODERS.get(msg.get_type())
+    if decoder is None:
+        return []
+    changed = decoder(msg, state)
+    # Sabit duran bir İHA'nın konumu da "taze" sayılmalı
+    ts = state.touch(decoder.fields, ts)
+    if changed:
+        state.commit(changed, ts)
+    return changed
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""
+Telemetri Sakla-İlet Kuyruğu
+============================
+Sunucu bağlantısı veya yetki (401) koptuğunda gönderilemeyen telemetri
+örneklerini yerel bir SQLite dosyasında saklar. Bağlantı geri geldiğinde
+örnekler en yeniden eskiye, toplu ve hız sınırlı olarak yeniden gönderilir.
+
+Kuyruk boyutu `max_rows` ile sınırlıdır; dolunca en eski örnekler silinir.
+Bellekte yalnızca sayaçlar tutulur.
+
+    q = TelemetryQueue("telemetry_queue.db")
+    q.put(payload)
+    for row_id, payload in q.take_newest(20): ...
+    q.ack([row_id, ...])
+
+Ortam değişkenleri:
+    IHA_TELEM_QUEUE=1 (veya dosya yolu)   kuyruğu etkinleştirir
+    IHA_TELEM_QUEUE_MAX=20000             azami örnek sayısı
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import time
+
+DEFAULT_PATH = "telemetry_queue.db"
+
+
+class TelemetryQueue:
+    def __init__(self, path: str = DEFAULT_PATH, max_rows: int = 20000):
+        self.path = path
+        self.max_rows = max(1, int(max_rows))
+        self._db = sqlite3.connect(path, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS q (id INTEGER PRIMARY KEY AUTOINCREMENT, ts REAL, payload TEXT)")
+        self._depth = self._db.execute("SELECT COUNT(*) FROM q").fetchone()[0]
+        self.enqueued = 0
+        self.flushed = 0
+        self.evicted = 0
+        if self._depth:
+            logging.getLogger("TELQ").info(f"Telemetri kuyruğunda {self._depth} gönderilmemiş örnek var: {path}")
+
+    @classmethod
+    def from_env(cls):
+        """IHA_TELEM_QUEUE tanımlıysa kuyruk oluşturur, değilse None döner."""
+        spec = (os.getenv("IHA_TELEM_QUEUE") or "").strip()
+        if not spec or spec.lower() in ("0", "false", "off"):
+            return None
+        path = DEFAULT_PATH if spec.lower() in ("1", "true", "on") else spec
+        return cls(path, int(os.getenv("IHA_TELEM_QUEUE_MAX", "20000")))
+
+    def depth(self) -> int:
+        return self._depth
+
+    def put(self, payload: dict, ts: float = None):
+        self._db.execute("INSERT INTO q (ts, payload) VALUES (?, ?)",
+                         (ts if ts is not None else time.time(), json.dumps(payload, separators=(",", ":"))))
+        self._depth += 1
+        self.enqueued += 1
+        if self._depth > self.max_rows:
+            self._trim()
+
+    def _trim(self):
+        # Sınırın %10 altına in: her eklemede silme yapılmasın
+        keep = max(1, self.max_rows - self.max_rows // 10)
+        cur = self._db.execute(
+            "DELETE FROM q WHERE id <= (SELECT id FROM q ORDER BY id DESC LIMIT 1 OFFSET ?)", (keep,))
+        self.evicted += cur.rowcount
+        self._depth -= cur.rowcount
+
+    def take_newest(self, n: int):
+        """En yeni `n` örneği [(id, payload), ...] olarak döndürür (silmez)."""
+        rows = self._db.execute("SELECT id, payload FROM q ORDER BY id DESC LIMIT ?", (n,)).fetchall()
+        return [(row_id, json.loads(text)) for row_id, text in rows]
+
+    def ack(self, ids):
+        """Gönderilen örnekleri tek işlemde siler."""
+        ids = list(ids)
+        if not ids:
+            return
+        self._db.execute("BEGIN")
+        cur = self._db.executemany("DELETE FROM q WHERE id = ?", [(i,) for i in ids])
+        self._db.execute("COMMIT")
+        self._depth = max(0, self._depth - cur.rowcount)
+        self.flushed += cur.rowcount
+
+    def close(self):
+        try:
+            self._db.close()
+        except Exception:
+            pass
+
+    def stats(self) -> dict:
+        return {
+            "path": self.path,
+            "depth": self._depth,
+            "max_rows": self.max_rows,
+            "enqueued": self.enqueued,
+            "flushed": self.flushed,
+            "evicted": self.evicted,
+        }
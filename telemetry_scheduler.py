@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""
+Telemetri Gönderim Zamanlayıcısı
+================================
+Sabit `sleep(interval)` döngüsü yerine monotonik saatte kaymasız slotlar:
+slot k, başlangıç + k * periyot anında açılır (RTT periyodu kaydırmaz).
+Slot açıldığında telemetri durumunda yeni bir sürüm yoksa zamanlayıcı
+slot sonuna kadar yeni sürümü bekler (notify() ile uyanır); hiç gelmezse
+aynı veri tekrar gönderilmez. Ancak son gönderimden bu yana `max_silence`
+sn geçtiyse (ör. yerde sabit duran İHA) aynı veri yine gönderilir; sunucu
+bağlantıyı kopmuş saymasın.
+
+    sched = UplinkScheduler(0.5)
+    while True:
+        await sched.wait_slot(lambda: state.version)
+        ...
+        sched.mark_sent(snapshot.version)
+"""
+
+import asyncio
+import collections
+import time
+
+
+class UplinkScheduler:
+    def __init__(self, period: float, window: float = 5.0, max_silence: float = 1.0):
+        self.period = period
+        self.max_silence = max_silence
+        self.window = window
+        self._next = None
+        self._event = asyncio.Event()
+        self._last_version = -1
+        self._sent = collections.deque()        # monotonik gönderim zamanları (pencere içi)
+        self._jitter = collections.deque()      # (zaman, |aralık - periyot|)
+        self._last_sent_at = None
+        self.stale_skipped = 0
+        self.unchanged_skipped = 0
+        self.missed_slots = 0
+        self.keepalives = 0
+
+    def notify(self):
+        """Telemetri durumunda yeni sürüm oluştuğunda çağrılır."""
+        self._event.set()
+
+    async def wait_slot(self, version_fn):
+        """Yeni veri bulunan bir sonraki slota kadar bekler."""
+        period = self.period
+        while True:
+            now = time.monotonic()
+            if self._next is None:
+                self._next = now
+            elif now - self._next > period:
+                # Bir slottan fazla geride (ör. uzun RTT): ızgarayı koruyarak ileri sar
+                k = int((now - self._next) // period)
+                self.missed_slots += k
+                self._next += k * period
+            if now < self._next:
+                await asyncio.sleep(self._next - now)
+            slot_end = self._next + period
+            self._next = slot_end
+
+            while version_fn() == self._last_version:
+                remaining = slot_end - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._event.clear()
+                try:
+                    await asyncio.wait_for(self._event.wait(), remaining)
+                except asyncio.TimeoutError:
+                    break
+            if version_fn() != self._last_version:
+                return
+            if self._last_sent_at is not None and time.monotonic() - self._last_sent_at >= self.max_silence:
+                self.keepalives += 1
+                return
+            self.unchanged_skipped += 1
+
+    def mark_sent(self, version: int):
+        now = time.monotonic()
+        self._last_version = version
+        if self._last_sent_at is not None:
+            self._jitter.append((now, abs((now - self._last_sent_at) - self.period)))
+        self._last_sent_at = now
+        self._sent.append(now)
+        self._trim(now)
+
+    def _trim(self, now: float):
+        limit = now - self.window
+        while self._sent and self._sent[0] < limit:
+            self._sent.popleft()
+        while self._jitter and self._jitter[0][0] < limit:
+            self._jitter.popleft()
+
+    def stats(self) -> dict:
+        self._trim(time.monotonic())
+        jit = [j for _, j in self._jitter]
+        return {
+            "target_hz": round(1.0 / self.period, 2),
+            "send_hz": round(len(self._sent) / self.window, 2),
+            "jitter_ms_avg": round(1000.0 * sum(jit) / len(jit), 2) if jit else 0.0,
+            "jitter_ms_max": round(1000.0 * max(jit), 2) if jit else 0.0,
+            "stale_skipped": self.stale_skipped,
+            "unchanged_skipped": self.unchanged_skipped,
+            "missed_slots": self.missed_slots,
+            "keepalives": self.keepalives,
+        }
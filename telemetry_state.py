@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""
+Telemetri Durumu
+================
+MAVLink'ten derlenen ve sunucu şemasına gönderilen İHA durumu.
+Sabit alanlı (__slots__) bir nesnedir; çözücüler (telemetry_decoder)
+alanlara doğrudan yazar ve değişen alanları commit() ile bildirir.
+
+- version: her commit'te artan sürüm numarası
+- alan başına alış zamanı (time.monotonic)
+- kirli (dirty) bayrakları: son clear_dirty()'den beri değişen alanlar
+- snapshot(): değişmez kopya; sürüm değişmedikçe aynı nesne döner
+"""
+
+import collections
+import time
+import types
+
+TELEM_FIELDS = (
+    "lat", "lon", "alt",
+    "pitch", "roll", "yaw",
+    "speed", "battery", "autonomous", "lock",
+    "target", "gps_time_ms",
+)
+_FIELD_INDEX = {name: i for i, name in enumerate(TELEM_FIELDS)}
+
+# Sunucuya gönderimde tazelik kontrolü yapılan alan grupları
+POSITION_FIELDS = ("lat", "lon", "alt")
+ATTITUDE_FIELDS = ("roll", "pitch", "yaw")
+
+TelemetrySnapshot = collections.namedtuple("TelemetrySnapshot", ("version",) + TELEM_FIELDS + ("stamps",))
+
+
+def field_indices(names) -> tuple:
+    """Alan adlarını TelemetryState.touch() için indekslere çevirir."""
+    return tuple(_FIELD_INDEX[n] for n in names)
+
+
+class TelemetryState:
+    __slots__ = TELEM_FIELDS + ("version", "_stamps", "_dirty", "_snap")
+
+    def __init__(self):
+        self.lat = None
+        self.lon = None
+        self.alt = None
+        self.pitch = None
+        self.roll = None
+        self.yaw = None
+        self.speed = None
+        self.battery = None
+        self.autonomous = 0
+        self.lock = 0
+        self.target = {"hedef_merkez_X": 0, "hedef_merkez_Y": 0, "hedef_genislik": 0, "hedef_yukseklik": 0}
+        self.gps_time_ms = None
+        self.version = 0
+        self._stamps = [None] * len(TELEM_FIELDS)
+        self._dirty = 0
+        self._snap = None
+
+    def commit(self, changed, ts: float = None):
+        """Değişen alanları işaretler, zaman damgalarını yazar ve sürümü artırır."""
+        if not changed:
+            return self.version
+        if ts is None:
+            ts = time.monotonic()
+        stamps = self._stamps
+        dirty = self._dirty
+        for name in changed:
+            i = _FIELD_INDEX[name]
+            stamps[i] = ts
+            dirty |= 1 << i
+        self._dirty = dirty
+        self.version += 1
+        return self.version
+
+    def touch(self, indices, ts: float = None) -> float:
+        """
+        Alanların (field_indices() ile) alış zamanını yeniler, değer aynı
+        kalsa da; sürüm artmaz. Kullanılan zaman damgasını döndürür.
+        """
+        if ts is None:
+            ts = time.monotonic()
+        stamps = self._stamps
+        for i in indices:
+            stamps[i] = ts
+        return ts
+
+    def set(self, **fields):
+        """Alanları (ör. lock/target) elle günceller; değişenleri commit eder."""
+        changed = [k for k, v in fields.items() if getattr(self, k) != v]
+        for k in changed:
+            setattr(self, k, fields[k])
+        ts = self.touch(field_indices(fields))
+        return self.commit(changed, ts)
+
+    # --- Tazelik ---
+    def stamp(self, name: str):
+        return self._stamps[_FIELD_INDEX[name]]
+
+    def age(self, name: str, now: float = None):
+        """Alanın son alınışından bu yana geçen süre (sn); hiç alınmadıysa None."""
+        ts = self._stamps[_FIELD_INDEX[name]]
+        if ts is None:
+            return None
+        return (time.monotonic() if now is None else now) - ts
+
+    def is_fresh(self, names, max_age: float, now: float = None) -> bool:
+        if now is None:
+            now = time.monotonic()
+        for name in names:
+            ts = self._stamps[_FIELD_INDEX[name]]
+            if ts is None or (now - ts) > max_age:
+                return False
+        return True
+
+    # --- Kirli bayraklar ---
+    def dirty_fields(self):
+        d = self._dirty
+        return tuple(name for i, name in enumerate(TELEM_FIELDS) if d & (1 << i))
+
+    def clear_dirty(self):
+        self._dirty = 0
+
+    # --- Anlık görüntü ---
+    def snapshot(self) -> TelemetrySnapshot:
+        snap = self._snap
+        if snap is None or snap.version != self.version:
+            values = [getattr(self, k) for k in TELEM_FIELDS]
+            values[_FIELD_INDEX["target"]] = types.MappingProxyType(dict(self.target or {}))
+            snap = TelemetrySnapshot(self.version, *values, tuple(self._stamps))
+            self._snap = snap
+        return snap
+
+    def as_dict(self) -> dict:
+        return {k: getattr(self, k) for k in TELEM_FIELDS}
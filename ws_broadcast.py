@@ -0,0 +1,593 @@
+# -*- coding: utf-8 -*-
+"""
+WebSocket Yayıncısı
+===================
+Her mesaj bir kez serileştirilir ve her istemcinin sınırlı kuyruğuna
+eklenir; her istemcinin kendi yazıcı görevi vardır. Yavaş bir istemci
+diğerlerini bekletmez, mesaj başına yeni görev açılmaz.
+
+Kuyruk dolduğunda uygulanacak politika:
+    drop_oldest   en eski bekleyen çerçeve atılır (varsayılan)
+    coalesce      yeni mesaj durum tipindeyse (STATE_TYPES) aynı tip+sistem
+                  için bekleyen çerçeve en yenisiyle değiştirilir (yeri
+                  korunur); olay tipleri ya da eşi olmayanlar için en eski atılır
+    disconnect    istemci bağlantısı kapatılır (1013: tekrar deneyin)
+
+Ortam değişkenleri:
+    IHA_WS_POLICY=drop_oldest|coalesce|disconnect
+    IHA_WS_QUEUE=256
+
+Konu abonelikleri: istemci hiçbir şey göndermezse tüm mesajları alır.
+Abone olan istemci yalnızca seçtiği `_type`'ları alır; hız (Hz) verilen
+konular sunucu tarafında seyreltilir ve bekleyen en son değer iletilir:
+
+    {"op": "subscribe", "topics": {"SELF_POSE": 5, "TEAMS_UPDATE": null}}
+    {"op": "subscribe", "topics": ["TEAMS_UPDATE"]}     # hız sınırı yok
+    {"op": "unsubscribe", "topics": ["SELF_POSE"]}
+    {"op": "reset"}                                      # tekrar her şey
+    "*" konusu listede olmayan tüm tipler için geçerlidir.
+
+İkili/delta protokolü (bkz. ws_codec) bağlanırken `iha.bin.v1` alt protokolü
+veya `?codec=bin1` ile, sonradan {"op": "codec", "codec": "bin1"|"json"} ile
+seçilir. Bu istemcilerin kuyruğunda mesaj sözlüğü tutulur; kodlama, delta
+bu istemciye gerçekten gönderilen son çerçeveye göre olsun diye yazıcı
+görevde yapılır.
+
+Çıkış adımı (IHA_WS_TICK_MS, varsayılan 20; 0 = kapalı): yayınlanan
+mesajlar bir tık boyunca toplanır. Durum niteliğindeki tipler (STATE_TYPES,
+IHA_WS_STATE_TYPES ile genişletilebilir) tip+sistem başına en son değere
+indirgenir; olay niteliğindekiler sırasıyla geçer. Toplu çerçeve isteyen
+istemciler (`?batch=1` veya {"op": "batch", "enabled": true}) her tıkta tek
+bir WS_BATCH çerçevesi alır:
+
+    {"_type": "WS_BATCH", "messages": [{...}, {...}]}
+
+Sıra numaraları: dağıtılan her mesaj artan bir `_seq` taşır ve son
+IHA_WS_REPLAY (varsayılan 1024) mesaj tekrar tamponunda tutulur (istemci
+yokken de). Yeni istemci önce tek bir WS_SNAPSHOT alır (son SELF_POSE,
+TEAMS_UPDATE, HSS, QR ve STATUS_UPDATE). Yeniden bağlanan istemci
+`?resume=<son_seq>&epoch=<epoch>` (veya {"op": "resume", "seq": n, "epoch": e})
+ile kaçırdıklarını alır; tampon yetmezse ya da sunucu yeniden başlamışsa
+(epoch farklı) yine anlık görüntü gönderilir:
+
+    {"_type": "WS_SNAPSHOT", "epoch": "...", "seq": 812, "state": {"SELF_POSE": {...}, ...}}
+    {"_type": "WS_RESUME", "epoch": "...", "from_seq": 790, "seq": 812, "replayed": 22}
+
+    ws_broadcaster.add(websocket)
+    ws_broadcaster.publish({"_type": ..., ...})
+    ws_broadcaster.remove(websocket)
+"""
+
+import asyncio
+import collections
+import json
+import logging
+import os
+import time
+
+from constants import MsgType
+from metrics import LatencyHistogram
+from ws_codec import CODEC_NAME, Encoder, hello, pack_batch
+
+POLICIES = ("drop_oldest", "coalesce", "disconnect")
+WILDCARD = "*"
+
+# Tık içinde yalnızca en son değeri önemli olan (durum) tipler; diğerleri olaydır
+STATE_TYPES = frozenset({
+    MsgType.SELF_POSE, MsgType.TEAMS_UPDATE, MsgType.SERVER_TIME, MsgType.SERVER_HSS, MsgType.SERVER_QR,
+    MsgType.STATUS_UPDATE, MsgType.WS_CLIENTS,
+    "HEARTBEAT", "SYS_STATUS", "SYSTEM_TIME", "GPS_RAW_INT", "GPS2_RAW", "ATTITUDE", "ATTITUDE_QUATERNION",
+    "GLOBAL_POSITION_INT", "LOCAL_POSITION_NED", "VFR_HUD", "NAV_CONTROLLER_OUTPUT", "RC_CHANNELS",
+    "RC_CHANNELS_RAW", "SERVO_OUTPUT_RAW", "BATTERY_STATUS", "EKF_STATUS_REPORT", "VIBRATION", "HOME_POSITION",
+    "EXTENDED_SYS_STATE", "RAW_IMU", "SCALED_IMU2", "SCALED_IMU3", "SCALED_PRESSURE", "SCALED_PRESSURE2",
+    "POWER_STATUS", "MEMINFO", "HWSTATUS", "AHRS", "AHRS2", "WIND", "TERRAIN_REPORT", "SIMSTATE",
+    "MISSION_CURRENT", "ESTIMATOR_STATUS", "ALTITUDE", "RADIO_STATUS", "TIMESYNC",
+})
+
+# Anlık görüntüde (snapshot) son değeri gönderilen tipler
+SNAPSHOT_TYPES = (MsgType.SELF_POSE, MsgType.TEAMS_UPDATE, MsgType.SERVER_HSS, MsgType.SERVER_QR,
+                  MsgType.STATUS_UPDATE)
+
+# 3.11+: zaman aşımı gönderim başına yeni görev açmadan uygulanır
+_timeout = getattr(asyncio, "timeout", None)
+
+
+def parse_topics(topics) -> dict:
+    """Abonelik isteğindeki konuları {tip: en_kısa_aralık_sn} sözlüğüne çevirir (0 = sınırsız)."""
+    if isinstance(topics, str):
+        topics = [topics]
+    if isinstance(topics, (list, tuple)):
+        topics = {t: None for t in topics}
+    if not isinstance(topics, dict):
+        raise ValueError("topics bir liste veya {tip: Hz} sözlüğü olmalı")
+    out = {}
+    for name, hz in topics.items():
+        if not isinstance(name, str) or not name:
+            raise ValueError(f"Geçersiz konu: {name!r}")
+        if hz is None or hz == 0:
+            out[name] = 0.0
+        elif isinstance(hz, (int, float)) and not isinstance(hz, bool) and hz > 0:
+            out[name] = 1.0 / float(hz)
+        else:
+            raise ValueError(f"Geçersiz hız ({name}): {hz!r}")
+    return out
+
+
+class WsClient:
+    """Tek istemci: sınırlı kuyruk + yazıcı görev + gecikme/düşürme sayaçları."""
+    def __init__(self, ws, maxlen: int, policy: str, send_timeout: float, on_close=None, codec: str = None):
+        self.ws = ws
+        self.maxlen = maxlen
+        self.policy = policy
+        self.send_timeout = send_timeout
+        self._on_close = on_close
+        # deque[(zaman, çerçeve, birleştirme_anahtarı)]; anahtar yalnızca durum tipleri için (tip, sysid)
+        self._queue = collections.deque()
+        self._event = asyncio.Event()
+        self.sent = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.high_water = 0
+        self.bytes_sent = 0
+        self.encoder = None
+        self.set_codec(codec)
+        self.filtered = 0       # abone olunmadığı için gönderilmeyen
+        self.downsampled = 0    # hız sınırı nedeniyle yerini yenisine bırakan
+        self.topics = None      # None: her şey; aksi halde {tip: en_kısa_aralık_sn}
+        self._due = {}          # {tip: bir sonraki gönderim zamanı}
+        self._held = {}         # {tip: (zaman, çerçeve, birleştirme_anahtarı)} hız sınırında bekleyen en son değer
+        self._timers = {}       # {tip: asyncio.TimerHandle}
+        self.batching = False   # True: her tıkın mesajları tek WS_BATCH çerçevesinde
+        self._staged = None     # tık boyunca toplanan öğeler (yalnızca batching)
+        self._staged_ts = None
+        self.lag = LatencyHistogram(window=30.0, bounds=(1, 5, 10, 50, 100, 500, 1000, 5000))
+        self.closed = False
+        try:
+            self.address = "%s:%s" % tuple(ws.remote_address[:2])
+        except Exception:
+            self.address = "?"
+        self.task = asyncio.ensure_future(self._writer())
+
+    def set_codec(self, codec):
+        if codec not in (None, "json", CODEC_NAME):
+            raise ValueError(f"Bilinmeyen kodek: {codec!r} (seçenekler: json, {CODEC_NAME})")
+        self.encoder = Encoder() if codec == CODEC_NAME else None
+
+    @property
+    def codec(self) -> str:
+        return CODEC_NAME if self.encoder is not None else "json"
+
+    def interval_of(self, key):
+        """Konu için en kısa aralık (sn); abone değilse None."""
+        topics = self.topics
+        if topics is None:
+            return 0.0
+        interval = topics.get(key)
+        if interval is None:
+            return topics.get(WILDCARD)
+        return None if interval < 0 else interval
+
+    def subscribe(self, topics: dict):
+        if self.topics is None:
+            self.topics = {}
+        self.topics.update(topics)
+
+    def unsubscribe(self, names):
+        if self.topics is None:
+            # "her şey" aboneliğinden çıkarmak: kalan her şey sınırsız
+            self.topics = {WILDCARD: 0.0}
+        for name in names:
+            if WILDCARD in self.topics and name != WILDCARD:
+                self.topics[name] = -1.0    # "*" kapsamından hariç tut
+            else:
+                self.topics.pop(name, None)
+            self._drop_held(name)
+
+    def reset(self):
+        self.topics = None
+        for name in list(self._timers):
+            self._drop_held(name)
+        self._due.clear()
+
+    def _drop_held(self, key):
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        self._held.pop(key, None)
+
+    def offer(self, frame, key=None, ts: float = None, ckey=None):
+        """
+        Abonelik ve hız sınırını uygulayıp çerçeveyi kuyruğa ekler. `key` konu
+        (tip), `ckey` kuyruk dolunca birleştirme anahtarıdır (yalnızca durum tipleri).
+        """
+        if self.closed:
+            return
+        interval = self.interval_of(key)
+        if interval is None:
+            self.filtered += 1
+            return
+        if interval > 0:
+            ts = time.monotonic() if ts is None else ts
+            due = self._due.get(key, 0.0)
+            if ts < due:
+                if key in self._held:
+                    self.downsampled += 1
+                self._held[key] = (ts, frame, ckey)
+                if key not in self._timers:
+                    loop = asyncio.get_event_loop()
+                    self._timers[key] = loop.call_later(due - ts, self._release, key)
+                return
+            self._due[key] = ts + interval
+        if self._staged is not None:
+            self._staged.append(frame)
+            if self._staged_ts is None:
+                self._staged_ts = ts
+            return
+        self.enqueue(frame, ckey, ts)
+
+    def sync(self, head: dict, items):
+        """Anlık görüntü / tekrar: başlık + abone olunan öğeler tek kuyruk öğesi olarak eklenir."""
+        items = [m for m in items if self.interval_of(m.get("_type")) is not None]
+        self.enqueue([head] + items)
+
+    def begin_tick(self):
+        if self.batching and not self.closed:
+            self._staged = []
+            self._staged_ts = None
+
+    def end_tick(self):
+        staged, self._staged = self._staged, None
+        if staged:
+            self.enqueue(staged, None, self._staged_ts)
+
+    def _release(self, key):
+        self._timers.pop(key, None)
+        item = self._held.pop(key, None)
+        interval = self.interval_of(key)
+        if item is None or self.closed or interval is None:
+            return
+        now = time.monotonic()
+        self._due[key] = now + interval
+        self.enqueue(item[1], item[2], now)
+
+    def enqueue(self, frame, ckey=None, ts: float = None):
+        """Çerçeveyi kuyruğa ekler; politika yalnızca kuyruk doluyken uygulanır."""
+        if self.closed:
+            return
+        ts = time.monotonic() if ts is None else ts
+        q = self._queue
+        if len(q) >= self.maxlen:
+            if self.policy == "disconnect":
+                self.dropped += len(q)
+                q.clear()
+                self.close(1013, "istemci yetişemiyor")
+                return
+            if self.policy == "coalesce" and ckey is not None and self._replace(ckey, ts, frame):
+                self.coalesced += 1
+                return
+            q.popleft()
+            self.dropped += 1
+        q.append((ts, frame, ckey))
+        if len(q) > self.high_water:
+            self.high_water = len(q)
+        self._event.set()
+
+    def _replace(self, ckey, ts, frame) -> bool:
+        """Aynı anahtarla bekleyen en yeni çerçeveyi yerini koruyarak değiştirir."""
+        q = self._queue
+        for i in range(len(q) - 1, -1, -1):
+            if q[i][2] == ckey:
+                q[i] = (ts, frame, ckey)
+                return True
+        return False
+
+    async def _writer(self):
+        try:
+            while True:
+                while not self._queue:
+                    self._event.clear()
+                    await self._event.wait()
+                ts, item, _ = self._queue.popleft()
+                if not isinstance(item, list):
+                    frames = (self._encode(item),)
+                elif self.batching:
+                    frames = (self._encode_batch(item),)
+                else:
+                    frames = [self._encode(x) for x in item]
+                for frame in frames:
+                    if _timeout is not None:
+                        async with _timeout(self.send_timeout):
+                            await self.ws.send(frame)
+                    else:
+                        await asyncio.wait_for(self.ws.send(frame), self.send_timeout)
+                    self.sent += 1
+                    self.bytes_sent += len(frame)
+                self.lag.add((time.monotonic() - ts) * 1000.0)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logging.getLogger("WS").debug(f"WS yazıcı sonlandı ({self.address}): {e}")
+            self.close(1011, "gönderim hatası")
+
+    def _encode(self, item):
+        if isinstance(item, dict):
+            return self.encoder.encode(item) if self.encoder is not None else json.dumps(item, default=str)
+        return item
+
+    def _encode_batch(self, items):
+        frames = [self._encode(item) for item in items]
+        if self.encoder is not None:
+            return pack_batch(frames)
+        # JSON metinleri zaten serileştirilmiş; yalnızca birleştirilir
+        return '{"_type": "%s", "messages": [%s]}' % (MsgType.WS_BATCH, ", ".join(frames))
+
+    def close(self, code: int = 1000, reason: str = ""):
+        if self.closed:
+            return
+        self.closed = True
+        self._queue.clear()
+        self.reset()
+        if self.task is not asyncio.current_task():
+            self.task.cancel()
+        try:
+            asyncio.ensure_future(self.ws.close(code, reason))
+        except Exception:
+            pass
+        if self._on_close is not None:
+            self._on_close(self)
+
+    def stats(self) -> dict:
+        lag = self.lag.stats(buckets=False)
+        return {
+            "address": self.address,
+            "codec": self.codec,
+            "batching": self.batching,
+            "bytes": self.bytes_sent,
+            "depth": len(self._queue),
+            "high_water": self.high_water,
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "filtered": self.filtered,
+            "downsampled": self.downsampled,
+            "topics": None if self.topics is None else {
+                k: (round(1.0 / v, 2) if v else None) for k, v in self.topics.items() if v >= 0},
+            "lag_p50_ms": lag["p50_ms"],
+            "lag_p99_ms": lag["p99_ms"],
+            "lag_max_ms": lag["max_ms"],
+        }
+
+
+class WsBroadcaster:
+    def __init__(self, maxlen: int = 256, policy: str = "drop_oldest", send_timeout: float = 5.0,
+                 tick: float = 0.02, state_types=STATE_TYPES, replay: int = 1024):
+        if policy not in POLICIES:
+            raise ValueError(f"Bilinmeyen WS politikası: {policy} (seçenekler: {', '.join(POLICIES)})")
+        self.maxlen = maxlen
+        self.policy = policy
+        self.send_timeout = send_timeout
+        self.tick = tick        # sn; 0: mesajlar beklemeden kuyruklara gider
+        self.state_types = frozenset(state_types)
+        self._clients = {}      # {websocket: WsClient}
+        self._pending = collections.OrderedDict()   # {(tip, sistem) | ("_ev", n): (zaman, mesaj)}
+        self._event_seq = 0
+        self._flush_handle = None
+        self.published = 0
+        self.disconnected = 0
+        self.ticks = 0
+        self.tick_coalesced = 0     # tık içinde yerini yenisine bırakan durum mesajları
+        self.epoch = "%x" % int(time.time() * 1000)    # yeniden başlatmayı ayırt etmek için
+        self.seq = 0
+        self._replay = collections.deque(maxlen=replay)     # _seq taşıyan mesajlar
+        self._snapshot = {}     # {tip: son mesaj}
+        self.snapshots = 0
+        self.resumes = 0
+        self.resyncs = 0        # tekrar isteği karşılanamayıp anlık görüntüye dönülen
+
+    @classmethod
+    def from_env(cls):
+        policy = (os.getenv("IHA_WS_POLICY") or "drop_oldest").strip().lower()
+        if policy not in POLICIES:
+            logging.getLogger("WS").warning(f"Geçersiz IHA_WS_POLICY={policy}; drop_oldest kullanılıyor")
+            policy = "drop_oldest"
+        state_types = set(STATE_TYPES)
+        for name in (os.getenv("IHA_WS_STATE_TYPES") or "").split(","):
+            if name.strip():
+                state_types.add(name.strip())
+        return cls(int(os.getenv("IHA_WS_QUEUE", "256")), policy,
+                   tick=max(0.0, float(os.getenv("IHA_WS_TICK_MS", "20")) / 1000.0), state_types=state_types,
+                   replay=int(os.getenv("IHA_WS_REPLAY", "1024")))
+
+    def __len__(self):
+        return len(self._clients)
+
+    def add(self, ws, codec: str = None, batch: bool = False, resume: int = None, epoch: str = None) -> WsClient:
+        client = WsClient(ws, self.maxlen, self.policy, self.send_timeout, on_close=self._closed, codec=codec)
+        client.batching = bool(batch)
+        self._clients[ws] = client
+        if client.encoder is not None:
+            client.enqueue(self.encode(hello()))
+        self.sync_client(client, resume, epoch)
+        return client
+
+    def sync_client(self, client: WsClient, resume: int = None, epoch: str = None):
+        """`resume` sonrası mesajları tampondan tekrar eder; olmuyorsa anlık görüntü gönderir."""
+        if resume is not None:
+            replay = self._replay
+            oldest = replay[0]["_seq"] if replay else self.seq + 1
+            if epoch == self.epoch and oldest - 1 <= resume <= self.seq:
+                items = [m for m in replay if m["_seq"] > resume]
+                self.resumes += 1
+                client.sync({"_type": MsgType.WS_RESUME, "epoch": self.epoch, "from_seq": resume,
+                             "seq": self.seq, "replayed": len(items)}, items)
+                return
+            self.resyncs += 1
+        self.snapshots += 1
+        client.sync(self.snapshot(), ())
+
+    def snapshot(self) -> dict:
+        """Son durum mesajlarını tek mesajda birleştirir."""
+        return {"_type": MsgType.WS_SNAPSHOT, "epoch": self.epoch, "seq": self.seq,
+                "state": {t: self._snapshot[t] for t in SNAPSHOT_TYPES if t in self._snapshot}}
+
+    def remove(self, ws):
+        client = self._clients.pop(ws, None)
+        if client is not None and not client.closed:
+            client.closed = True
+            client.reset()
+            client.task.cancel()
+
+    def handle_control(self, ws, text) -> dict:
+        """İstemciden gelen abonelik mesajını uygular; istemciye gönderilecek yanıtı döndürür."""
+        client = self._clients.get(ws)
+        if client is None:
+            return None
+        try:
+            req = json.loads(text)
+            if not isinstance(req, dict):
+                raise ValueError("mesaj bir JSON nesnesi olmalı")
+            op = req.get("op")
+            if op == "subscribe":
+                client.subscribe(parse_topics(req.get("topics")))
+            elif op == "unsubscribe":
+                client.unsubscribe(parse_topics(req.get("topics")))
+            elif op == "reset":
+                client.reset()
+            elif op == "codec":
+                client.set_codec(req.get("codec"))
+                if client.encoder is not None:
+                    return hello()
+            elif op == "batch":
+                client.batching = bool(req.get("enabled", True))
+            elif op in ("resume", "snapshot"):
+                seq = req.get("seq") if op == "resume" else None
+                if seq is not None and (not isinstance(seq, int) or isinstance(seq, bool)):
+                    raise ValueError(f"Geçersiz seq: {seq!r}")
+                self.sync_client(client, seq, req.get("epoch"))
+                return None
+            else:
+                raise ValueError(f"Bilinmeyen op: {op!r}")
+        except ValueError as e:     # json.JSONDecodeError da ValueError
+            return {"_type": MsgType.WS_ERROR, "error": str(e)}
+        return {"_type": MsgType.WS_SUBSCRIBED, "topics": client.stats()["topics"], "batch": client.batching}
+
+    def reply(self, ws, msg: dict):
+        """Tek istemciye (kuyruğu üzerinden) yanıt gönderir."""
+        client = self._clients.get(ws)
+        if client is not None:
+            client.enqueue(self.encode(msg))
+
+    def _closed(self, client: WsClient):
+        if self._clients.pop(client.ws, None) is not None:
+            self.disconnected += 1
+
+    @staticmethod
+    def encode(msg: dict) -> str:
+        return json.dumps(msg, default=str)
+
+    def wants(self, key) -> bool:
+        """Bu tipi isteyen en az bir istemci var mı (yoksa serileştirme atlanır)."""
+        return any(c.interval_of(key) is not None for c in self._clients.values())
+
+    def publish(self, msg: dict, arrival: float = None):
+        """
+        Mesajı yayınlar (bloklamaz). Tık açıksa bir sonraki tıkta, değilse
+        hemen abone istemci kuyruklarına eklenir. `arrival` (time.time())
+        verilirse istemci gecikmesi yayından değil paketin alışından ölçülür.
+        """
+        key = msg.get("_type")
+        self.published += 1
+        ts = time.monotonic()
+        if arrival is not None:
+            ts -= max(0.0, time.time() - arrival)
+        if self.tick <= 0:
+            self._dispatch(msg, key, ts)
+            return
+        pending = self._pending
+        if key in self.state_types:
+            pkey = (key, msg.get("_sysid"))
+            if pkey in pending:
+                self.tick_coalesced += 1
+                pending.move_to_end(pkey)
+                ts = pending[pkey][0]   # gecikme ilk bekleyen mesajdan ölçülür
+        else:
+            self._event_seq += 1
+            pkey = ("_ev", self._event_seq)
+        pending[pkey] = (ts, msg)
+        if self._flush_handle is None:
+            self._flush_handle = asyncio.get_event_loop().call_later(self.tick, self.flush)
+
+    def flush(self):
+        """Tıkta biriken mesajları istemcilere dağıtır; toplu istemciler tek çerçeve alır."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        pending, self._pending = self._pending, collections.OrderedDict()
+        if not pending:
+            return
+        self.ticks += 1
+        clients = list(self._clients.values())
+        for client in clients:
+            client.begin_tick()
+        for ts, msg in pending.values():
+            self._dispatch(msg, msg.get("_type"), ts)
+        for client in clients:
+            client.end_tick()
+
+    def _dispatch(self, msg: dict, key, ts: float):
+        """
+        Sıra numarası verir, tekrar tamponuna/anlık görüntüye yazar; JSON
+        istemcileri için bir kez serileştirir, ikili istemciler sözlüğü alır.
+        """
+        self.seq += 1
+        msg = dict(msg)     # çağıranın sözlüğü (GUI, kayıt) değişmesin
+        msg["_seq"] = self.seq
+        self._replay.append(msg)
+        if key in SNAPSHOT_TYPES:
+            self._snapshot[key] = msg
+        if not self.wants(key):
+            return
+        # Yalnızca durum mesajları birleştirilebilir; olaylar (ADMIN_*, ACK) asla
+        ckey = (key, msg.get("_sysid")) if key in self.state_types else None
+        text = None
+        for client in list(self._clients.values()):
+            if client.encoder is not None:
+                client.offer(msg, key, ts, ckey)
+            else:
+                if text is None:
+                    text = self.encode(msg)
+                client.offer(text, key, ts, ckey)
+
+    def publish_frame(self, frame, key=None, ckey=None):
+        """
+        Hazır (serileştirilmiş) çerçeveyi yayınlar; `key` konu, `ckey` kuyruk
+        dolunca kullanılacak birleştirme anahtarıdır (ör. (tip, sysid)).
+        """
+        self.published += 1
+        ts = time.monotonic()
+        for client in list(self._clients.values()):
+            client.offer(frame, key, ts, ckey)
+
+    def stats(self) -> dict:
+        return {
+            "policy": self.policy,
+            "queue_max": self.maxlen,
+            "clients": len(self._clients),
+            "published": self.published,
+            "disconnected": self.disconnected,
+            "tick_ms": round(self.tick * 1000.0, 1),
+            "ticks": self.ticks,
+            "tick_coalesced": self.tick_coalesced,
+            "epoch": self.epoch,
+            "seq": self.seq,
+            "replay_depth": len(self._replay),
+            "replay_max": self._replay.maxlen,
+            "snapshots": self.snapshots,
+            "resumes": self.resumes,
+            "resyncs": self.resyncs,
+            "per_client": [c.stats() for c in self._clients.values()],
+        }
+
+
+# Uygulama genelinde tek yayıncı
+ws_broadcaster = WsBroadcaster.from_env()
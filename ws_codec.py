@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+"""
+WebSocket İkili / Delta Protokolü
+=================================
+Varsayılan WS protokolü JSON metindir. Bağlanırken `iha.bin.v1` alt
+protokolü (Sec-WebSocket-Protocol) ya da `?codec=bin1` sorgusu istenirse
+istemciye ikili çerçeveler gönderilir:
+
+    [0x01, düzen, sysid] + varint seq + struct
+                                    anahtar çerçeve (tüm alanlar)
+    [0x02, düzen, sysid] + varint seq farkı + varint maske + zigzag varint farklar
+                                    delta: yalnızca değişen alanlar, bu
+                                    istemciye aynı düzen+sysid için gönderilen
+                                    son çerçeveye göre
+    [0x03] + MessagePack            düzeni olmayan diğer mesajlar
+                                    (msgpack yoksa normal JSON metin çerçevesi)
+    [0x04] + (varint uzunluk + alt çerçeve)*
+                                    tık başına toplu çerçeve (bkz. ws_broadcast);
+                                    '{' ile başlayan alt çerçeve UTF-8 JSON'dur
+
+`seq`, mesajın `_seq` değeridir (bkz. ws_broadcast); deltada aynı düzen+sysid
+akışının önceki çerçevesine göre farkı yazılır. `sysid` mesajın `_sysid`
+değeridir (yoksa 0); birden çok araç birbirinin deltasını bozmaz ve çözücü
+`_sysid` alanını geri koyar. Düzenlerdeki alanlar tamsayıya ölçeklenir (ör. lat*1e7, açı*100); boş
+(None) değer için alan tipine göre ayrılmış bir işaret değeri kullanılır.
+Her `keyframe_every` çerçevede bir ve ilk çerçevede anahtar çerçeve
+gönderilir. Bağlantı açıldığında istemciye düzenleri anlatan bir
+WS_CODEC (JSON) mesajı gider; `Decoder` başvuru çözücüsüdür.
+
+    enc = Encoder()
+    frame = enc.encode({"_type": "SELF_POSE", "payload": {...}})
+    Decoder().decode(frame)
+"""
+
+import json
+import struct
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+from constants import MsgType
+
+SUBPROTOCOL = "iha.bin.v1"
+CODEC_NAME = "bin1"
+
+KEYFRAME = 0x01
+DELTA = 0x02
+PACKED = 0x03
+BATCH = 0x04
+
+# Alan tipi -> boş (None) değer işareti
+_NONE = {"i": -2 ** 31, "b": -128, "B": 255, "I": 2 ** 32 - 1, "q": -2 ** 63, "h": -2 ** 15, "H": 2 ** 16 - 1}
+
+
+def _write_varint(out: bytearray, v: int):
+    while v >= 0x80:
+        out.append((v & 0x7F) | 0x80)
+        v >>= 7
+    out.append(v)
+
+
+def _read_varint(buf, pos: int):
+    shift = result = 0
+    while True:
+        b = buf[pos]
+        pos += 1
+        result |= (b & 0x7F) << shift
+        if b < 0x80:
+            return result, pos
+        shift += 7
+
+
+def _zigzag(v: int) -> int:
+    return v * 2 if v >= 0 else -v * 2 - 1
+
+
+def _unzigzag(v: int) -> int:
+    return v >> 1 if not v & 1 else -((v + 1) >> 1)
+
+
+class Layout:
+    """
+    Sabit düzen: `fields` = ((ad, struct_tipi, ölçek), ...). `payload` True ise
+    alanlar msg["payload"] içindedir (SELF_POSE), değilse mesajın kendisinde.
+    `mavlink` True ise çözülen mesaja JSON yolundaki gibi `mavpackettype` eklenir.
+    """
+    def __init__(self, lid: int, msg_type: str, fields, payload: bool = False, mavlink: bool = False):
+        self.lid = lid
+        self.msg_type = msg_type
+        self.fields = tuple(fields)
+        self.payload = payload
+        self.mavlink = mavlink
+        self.struct = struct.Struct("<" + "".join(f[1] for f in self.fields))
+        self.none = tuple(_NONE[f[1]] for f in self.fields)
+
+    def quantize(self, msg: dict) -> tuple:
+        src = msg.get("payload") if self.payload else msg
+        out = []
+        for (name, _, scale), none in zip(self.fields, self.none):
+            v = src.get(name)
+            out.append(none if v is None else int(round(float(v) * scale)))
+        return tuple(out)
+
+    def build(self, values, seq: int = None, sysid: int = 0) -> dict:
+        data = {"mavpackettype": self.msg_type} if self.mavlink else {}
+        for (name, _, scale), none, v in zip(self.fields, self.none, values):
+            data[name] = None if v == none else (v if scale == 1 else v / scale)
+        if self.payload:
+            msg = {"_type": self.msg_type, "payload": data}
+        else:
+            msg = data
+            data["_type"] = self.msg_type
+        if sysid:
+            msg["_sysid"] = sysid
+        if seq:
+            msg["_seq"] = seq
+        return msg
+
+    def describe(self) -> dict:
+        return {"id": self.lid, "payload": self.payload,
+                "fields": [[n, t, s] for n, t, s in self.fields]}
+
+
+LAYOUTS = {
+    MsgType.SELF_POSE: Layout(1, MsgType.SELF_POSE, (
+        ("lat", "i", 10 ** 7), ("lon", "i", 10 ** 7),
+        ("alt", "i", 1000),                     # mm
+        ("yaw", "H", 100), ("pitch", "h", 100), ("roll", "h", 100),   # 0.01°
+        ("speed", "i", 100),                    # cm/s
+        ("battery", "b", 1), ("autonomous", "B", 1), ("lock", "B", 1),
+        ("gps_time_ms", "q", 1),
+    ), payload=True),
+    "ATTITUDE": Layout(2, "ATTITUDE", (
+        ("time_boot_ms", "I", 1),
+        ("roll", "i", 10 ** 5), ("pitch", "i", 10 ** 5), ("yaw", "i", 10 ** 5),     # 1e-5 rad
+        ("rollspeed", "i", 10 ** 5), ("pitchspeed", "i", 10 ** 5), ("yawspeed", "i", 10 ** 5),
+    ), mavlink=True),
+}
+_BY_ID = {lay.lid: lay for lay in LAYOUTS.values()}
+
+
+def hello() -> dict:
+    """İkili protokolü seçen istemciye ilk gönderilen açıklama mesajı."""
+    return {"_type": MsgType.WS_CODEC, "codec": CODEC_NAME, "msgpack": msgpack is not None,
+            "layouts": {t: lay.describe() for t, lay in LAYOUTS.items()}}
+
+
+class Encoder:
+    """İstemci başına kodlayıcı: düzen başına son gönderilen değerleri tutar."""
+    def __init__(self, keyframe_every: int = 50):
+        self.keyframe_every = keyframe_every
+        self._last = {}         # {(düzen_id, sysid): (değerler, anahtar çerçeveden beri sayaç, seq)}
+        self.keyframes = 0
+        self.deltas = 0
+
+    def encode(self, msg: dict):
+        layout = LAYOUTS.get(msg.get("_type"))
+        if layout is not None:
+            try:
+                values = layout.quantize(msg)
+                sysid = int(msg.get("_sysid") or 0)
+                if not 0 <= sysid <= 255:
+                    raise ValueError(sysid)
+                return self._encode_layout(layout, values, int(msg.get("_seq") or 0), sysid)
+            except (AttributeError, TypeError, ValueError, OverflowError, struct.error):
+                pass    # beklenmeyen içerik: genel yoldan gönder
+        if msgpack is not None:
+            return bytes((PACKED,)) + msgpack.packb(msg, default=str)
+        return json.dumps(msg, default=str)
+
+    def _encode_layout(self, layout: Layout, values: tuple, seq: int, sysid: int = 0) -> bytes:
+        key = (layout.lid, sysid)
+        prev = self._last.get(key)
+        if prev is None or prev[1] + 1 >= self.keyframe_every or seq < prev[2]:
+            out = bytearray((KEYFRAME, layout.lid, sysid))
+            _write_varint(out, seq)
+            out += layout.struct.pack(*values)
+            self._last[key] = (values, 0, seq)
+            self.keyframes += 1
+            return bytes(out)
+        last, since, last_seq = prev
+        mask = 0
+        out = bytearray((DELTA, layout.lid, sysid))
+        _write_varint(out, seq - last_seq)
+        body = bytearray()
+        for i, (v, p) in enumerate(zip(values, last)):
+            if v != p:
+                mask |= 1 << i
+                _write_varint(body, _zigzag(v - p))
+        _write_varint(out, mask)
+        out += body
+        self._last[key] = (values, since + 1, seq)
+        self.deltas += 1
+        return bytes(out)
+
+    def reset(self):
+        """Sonraki çerçevelerin anahtar çerçeve olmasını sağlar."""
+        self._last.clear()
+
+
+def pack_batch(frames) -> bytes:
+    """Alt çerçeveleri (bytes veya JSON metni) tek BATCH çerçevesinde birleştirir."""
+    out = bytearray((BATCH,))
+    for f in frames:
+        if isinstance(f, str):
+            f = f.encode("utf-8")
+        _write_varint(out, len(f))
+        out += f
+    return bytes(out)
+
+
+class Decoder:
+    """Başvuru çözücüsü (istemci tarafı; benchmark ve testler için)."""
+    def __init__(self):
+        self._last = {}         # {(düzen_id, sysid): (değerler, seq)}
+
+    def decode(self, frame) -> dict:
+        if isinstance(frame, str):
+            return json.loads(frame)
+        kind = frame[0]
+        if kind == ord("{"):
+            return json.loads(frame.decode("utf-8"))
+        if kind == BATCH:
+            messages, pos = [], 1
+            while pos < len(frame):
+                n, pos = _read_varint(frame, pos)
+                messages.append(self.decode(frame[pos:pos + n]))
+                pos += n
+            return {"_type": MsgType.WS_BATCH, "messages": messages}
+        if kind == PACKED:
+            if msgpack is None:
+                raise ValueError("msgpack kurulu değil")
+            return msgpack.unpackb(frame[1:])
+        layout = _BY_ID[frame[1]]
+        sysid = frame[2]
+        key = (layout.lid, sysid)
+        if kind == KEYFRAME:
+            seq, pos = _read_varint(frame, 3)
+            values = layout.struct.unpack_from(frame, pos)
+        elif kind == DELTA:
+            prev = self._last.get(key)
+            if prev is None:
+                raise ValueError(f"Anahtar çerçeve olmadan delta (düzen {layout.lid}, sysid {sysid})")
+            last, last_seq = prev
+            dseq, pos = _read_varint(frame, 3)
+            seq = last_seq + dseq
+            mask, pos = _read_varint(frame, pos)
+            values = list(last)
+            for i in range(len(values)):
+                if mask & (1 << i):
+                    d, pos = _read_varint(frame, pos)
+                    values[i] += _unzigzag(d)
+            values = tuple(values)
+        else:
+            raise ValueError(f"Bilinmeyen çerçeve tipi: {kind}")
+        self._last[key] = (values, seq)
+        return layout.build(values, seq, sysid)